@@ -0,0 +1,156 @@
+"""
+Audio Fixtures
+Deterministic WAV fixtures for the offline benchmarks. Each fixture is
+leading silence, a speech-like burst sized to its transcript, and trailing
+silence, with a little background noise throughout.
+
+Generated on first use into benchmarks/fixtures/ (not committed). The
+endpointing set adds pauses between words and louder background noise.
+"""
+
+import math
+import random
+import struct
+import wave
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+SAMPLE_RATE = 16000
+SECONDS_PER_WORD = 0.32
+
+# (fixture name, transcript the stand-in recognizer returns)
+CORPUS = [
+    ("open_notepad", "open notepad"),
+    ("open_vscode", "open visual studio code"),
+    ("search_python", "search for python tutorials"),
+    ("youtube_linkin_park", "play linkin park on youtube"),
+    ("music_lofi", "play lofi on youtube music"),
+    ("system_stats", "show me system stats"),
+    ("cpu_usage", "what's my cpu usage"),
+    ("take_note", "take a note buy groceries tomorrow"),
+    ("create_folder", "create a folder called projects"),
+    ("how_are_you", "how are you"),
+    ("what_can_you_do", "what can you do"),
+    ("joke", "tell me a joke about saiyans"),
+    ("capital", "what's the capital of australia"),
+    ("open_github", "go to github.com"),
+]
+
+
+# Endpointing fixtures: background noise levels and pauses between words
+ENDPOINT_NOISE = (60, 300, 900)
+WORD_PAUSES = (0.0, 0.0, 0.15, 0.3, 0.45)  # seconds, drawn per word gap
+
+
+def speech_spans(words, lead=0.4, pauses=()):
+    """
+    Where speech is in a fixture
+
+    Returns:
+        list: (start, end) seconds of each stretch of speech, words with no
+              pause between them merged
+    """
+    spans = []
+    start = lead
+    for word in range(words):
+        end = start + SECONDS_PER_WORD
+        if spans and spans[-1][1] >= start:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+        start = end + (pauses[word] if word < len(pauses) else 0.0)
+    return spans
+
+
+def _samples(words, seed, lead=0.4, tail=1.2, noise=60, level=9000, pauses=()):
+    rng = random.Random(seed)
+    spans = [(int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)) for start, end in speech_spans(words, lead, pauses)]
+    total = int(spans[-1][1] + tail * SAMPLE_RATE)
+    first = spans[0][0]
+    pitch = 110 + rng.random() * 60
+
+    span = 0
+    for i in range(total):
+        value = rng.gauss(0, noise)
+        while span < len(spans) - 1 and i >= spans[span][1]:
+            span += 1
+        if spans[span][0] <= i < spans[span][1]:
+            t = (i - first) / SAMPLE_RATE
+            # Syllable-rate envelope over a few voiced harmonics
+            envelope = 0.55 + 0.45 * math.sin(2 * math.pi * 4.0 * t)
+            voiced = sum(math.sin(2 * math.pi * pitch * k * t) / k for k in (1, 2, 3))
+            value += level * envelope * voiced / 1.8
+        yield max(-32768, min(32767, int(value)))
+
+
+def write_fixture(path, words, seed=0, **options):
+    """Write one 16 kHz mono 16-bit fixture"""
+    frames = b"".join(struct.pack("<h", sample) for sample in _samples(words, seed, **options))
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(frames)
+
+
+def write_noise(path, seconds, noise, seed=0):
+    """Write background noise only, in the fixtures' format"""
+    rng = random.Random(seed)
+    samples = (max(-32768, min(32767, int(rng.gauss(0, noise)))) for _ in range(int(seconds * SAMPLE_RATE)))
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(b"".join(struct.pack("<h", sample) for sample in samples))
+
+
+def ensure_fixtures(directory=FIXTURES_DIR):
+    """
+    Generate any missing fixtures
+
+    Returns:
+        list: (wav path, transcript) for every fixture in CORPUS
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    fixtures = []
+    for seed, (name, transcript) in enumerate(CORPUS):
+        path = directory / f"{name}.wav"
+        if not path.exists():
+            write_fixture(path, len(transcript.split()), seed=seed)
+        fixtures.append((path, transcript))
+    return fixtures
+
+
+def ensure_endpoint_fixtures(directory=FIXTURES_DIR / "endpoint", tail=1.5):
+    """
+    Generate any missing endpointing fixtures: every CORPUS phrase at each
+    ENDPOINT_NOISE level, with seeded pauses between some words
+
+    Returns:
+        list: dicts with path, noise, speech_end and longest_pause (seconds)
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    fixtures = []
+    for seed, (name, transcript) in enumerate(CORPUS):
+        words = len(transcript.split())
+        rng = random.Random(1000 + seed)
+        pauses = [rng.choice(WORD_PAUSES) for _ in range(words - 1)]
+        for noise in ENDPOINT_NOISE:
+            path = directory / f"{name}_noise{noise}.wav"
+            if not path.exists():
+                write_fixture(path, words, seed=seed, noise=noise, pauses=pauses, tail=tail)
+            fixtures.append({
+                "path": path,
+                "noise": noise,
+                "speech_end": speech_spans(words, pauses=pauses)[-1][1],
+                "longest_pause": max(pauses, default=0.0),
+            })
+    return fixtures
+
+
+
+if __name__ == "__main__":
+    for path, transcript in ensure_fixtures():
+        print(f"{path.name:<28} {transcript}")
@@ -0,0 +1,87 @@
+"""
+Acknowledgement Overlap Benchmark
+Compares end-of-utterance to action latency in Goku.process_command when the
+"Processing" announcement blocks versus when it overlaps the AI call
+
+Run: python benchmarks/bench_ack_overlap.py
+"""
+
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from main import Goku
+
+TTS_SECONDS = 0.6   # roughly how long pyttsx3 takes to say "Processing"
+AI_SECONDS = 0.8    # typical Gemini round trip
+
+
+class FakeVoiceOutput:
+    """Stands in for VoiceOutput, speaking takes TTS_SECONDS"""
+
+    def __init__(self, overlap):
+        self.overlap = overlap
+        self.lock = threading.Lock()
+
+    def _say(self):
+        with self.lock:
+            time.sleep(TTS_SECONDS)
+
+    def speak(self, text, priority=None):
+        thread = threading.Thread(target=self._say, daemon=True)
+        thread.start()
+        if not self.overlap:
+            # Old behaviour: the announcement finishes before anything else
+            thread.join()
+        return thread
+
+
+class FakeBrain:
+    def process_command(self, command):
+        time.sleep(AI_SECONDS)
+        return {"action": "CONVERSATION", "parameters": {}, "response": "Sure"}
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.executed_at = None
+
+    def execute(self, command_data):
+        self.executed_at = time.perf_counter()
+        return {"success": True, "message": command_data["response"]}
+
+
+def measure(overlap, runs=5):
+    goku = Goku.__new__(Goku)
+    goku.settings = SimpleNamespace(STREAM_RESPONSES=False)
+    goku.voice_output = FakeVoiceOutput(overlap)
+    goku.ai_brain = FakeBrain()
+    goku.executor = RecordingExecutor()
+    goku.intent_matcher = None
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        goku.process_command("tell me something")
+        samples.append(goku.executor.executed_at - start)
+    return statistics.mean(samples)
+
+
+def run():
+    blocking = measure(overlap=False)
+    overlapped = measure(overlap=True)
+    print(f"TTS {TTS_SECONDS:.1f}s, AI {AI_SECONDS:.1f}s")
+    print(f"Utterance -> action, blocking announcement:   {blocking * 1000:.0f} ms")
+    print(f"Utterance -> action, overlapped announcement: {overlapped * 1000:.0f} ms")
+    print(f"Saved per command: {(blocking - overlapped) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    run()
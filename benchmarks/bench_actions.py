@@ -0,0 +1,150 @@
+"""
+Action Registry Benchmark
+What plugin actions cost at startup and per command, and whether the
+prompt lists exactly the actions that can run
+
+A temporary plugin directory holds --plugins generated plugins, each
+importing a stand-in for a heavy dependency (--import-cost seconds).
+Reported:
+    startup   - building the registry when plugins are imported up front
+                versus only read, and the first call of a plugin action
+    dispatch  - overhead per executed action with the handler table
+                rebuilt on every call (as before) versus looked up once
+    prompt    - tokens of the generated action section per prompt style,
+                and actions it lists that have no handler
+
+Run: python benchmarks/bench_actions.py [--plugins 40] [--import-cost 0.02]
+         [--calls 200000]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from actions import ActionRegistry
+from ai_brain import AIBrain
+from command_executor import CommandExecutor
+from llm_backends import StubBackend
+from note_store import NoteStore
+from usage_tracker import estimate_tokens
+
+PLUGIN = '''
+import time
+time.sleep({cost})  # stand-in for importing an SDK
+
+ACTIONS = {{
+    "PLUGIN_{n}_A": {{"description": "First action of plugin {n}", "parameters": {{"query": "text"}},
+                     "handler": "run"}},
+    "PLUGIN_{n}_B": {{"description": "Second action of plugin {n}", "handler": "run"}},
+}}
+
+
+def run(executor, params):
+    return {{"success": True}}
+'''
+
+
+def write_plugins(directory, count, cost):
+    for n in range(count):
+        (directory / f"plugin_{n}.py").write_text(PLUGIN.format(n=n, cost=cost))
+
+
+def run_startup(args, directory):
+    print(f"Startup with {args.plugins} plugins ({args.plugins * 2} actions), "
+          f"{args.import_cost * 1000:.0f} ms to import each\n")
+    start = time.perf_counter()
+    registry = ActionRegistry(plugin_dirs=[directory])
+    lazy = time.perf_counter() - start
+    first = time.perf_counter()
+    registry.load("PLUGIN_0_A")
+    first = time.perf_counter() - first
+
+    start = time.perf_counter()
+    eager = ActionRegistry(plugin_dirs=[directory])
+    for name in eager.names():
+        if not eager.get(name).builtin:
+            eager.load(name)
+    eager_seconds = time.perf_counter() - start
+
+    print(f"{'import every plugin':<28}{eager_seconds * 1000:>9.1f} ms")
+    print(f"{'read manifests only':<28}{lazy * 1000:>9.1f} ms")
+    print(f"{'first call of an action':<28}{first * 1000:>9.1f} ms  (imports its plugin)")
+    return registry
+
+
+def run_dispatch(args, registry):
+    executor = CommandExecutor(None, notes=NoteStore(":memory:"), actions=registry)
+    names = ["CONVERSATION", "TAKE_NOTE", "PLAY_MUSIC", "PLUGIN_0_A"]
+
+    def rebuilt(action):
+        # What _execute_action did before: a fresh table of bound methods per call
+        handlers = {
+            "OPEN_BROWSER": executor._open_browser,
+            "SEARCH_WEB": executor._search_web,
+            "OPEN_APP": executor._open_app,
+            "OPEN_WEBSITE": executor._open_website,
+            "PLAY_YOUTUBE": executor._play_youtube,
+            "PLAY_MUSIC": executor._play_music,
+            "SYSTEM_STATS": executor._system_stats,
+            "SYSTEM_HISTORY": executor._system_history,
+            "CREATE_FOLDER": executor._create_folder,
+            "CREATE_FILE": executor._create_file,
+            "OPEN_FILE": executor._open_file,
+            "TAKE_NOTE": executor._take_note,
+            "READ_NOTES": executor._read_notes,
+            "SEARCH_NOTES": executor._search_notes,
+            "CONVERSATION": executor._conversation,
+        }
+        return handlers.get(action, executor._unknown)
+
+    def cached(action):
+        return executor.handlers.get(action) or executor._handler(action)
+
+    print(f"\nDispatch overhead per action ({args.calls} calls)\n")
+    for label, lookup in (("table rebuilt per call", rebuilt), ("registry, looked up once", cached)):
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for i in range(args.calls):
+                lookup(names[i % len(names)])
+            samples.append((time.perf_counter() - start) / args.calls)
+        print(f"{label:<28}{statistics.median(samples) * 1e9:>9.0f} ns")
+
+
+def run_prompt(registry):
+    print("\nAction section of the prompt\n")
+    for label, actions in (("built-in", ActionRegistry()), ("with plugins", registry)):
+        full = estimate_tokens(actions.prompt_section())
+        compact = estimate_tokens(actions.prompt_section(compact=True))
+        print(f"{label:<28}{full:>6} tok full{compact:>6} tok compact  ({len(actions)} actions)")
+
+    executor = CommandExecutor(None, notes=NoteStore(":memory:"), actions=registry)
+    brain = AIBrain(backend=StubBackend(), actions=registry)
+    listed = [name for name in registry.names() if f"- {name}:" in brain.system_context]
+    missing = [name for name in listed if name != "UNKNOWN" and executor._handler(name) == executor._unknown]
+    print(f"\n{len(listed)} actions in the prompt, without a handler: {', '.join(missing) or 'none'}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Plugin action startup, dispatch and prompt cost")
+    parser.add_argument("--plugins", type=int, default=40)
+    parser.add_argument("--import-cost", type=float, default=0.02, help="seconds per plugin import")
+    parser.add_argument("--calls", type=int, default=200000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_plugins(directory, args.plugins, args.import_cost)
+        registry = run_startup(args, directory)
+        run_dispatch(args, registry)
+        run_prompt(registry)
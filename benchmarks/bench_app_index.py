@@ -0,0 +1,157 @@
+"""
+App Index Benchmark
+How long the OPEN_APP index takes to build and load, and how fast names
+resolve against it
+
+A synthetic tree stands in for an installed system: --path-dirs directories
+of --executables executables each, plus --desktop-dirs directories of
+desktop entries (some in subdirectories), on top of the real PATH.
+Reported:
+    cold build      - scan everything, no cache file
+    warm load       - a fresh AppIndex from the cache, nothing changed
+    after install   - one directory changed since the cache was written
+    lookups         - per kind of spoken name (exact, alias, prefix,
+                      fuzzy, miss), mean and p99
+
+Run: python benchmarks/bench_app_index.py [--path-dirs 20] [--executables 300]
+         [--desktop-dirs 4] [--entries 150] [--lookups 20000]
+"""
+
+import argparse
+import os
+import stat
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from app_index import AppIndex, default_path_dirs
+from command_executor import APP_PATHS
+
+# Spoken name -> kind, all present in the synthetic tree
+NAMES = {
+    "firefox": "exact",
+    "visual studio code": "exact",
+    "tool 7 12": "exact",
+    "mozilla firefox": "alias",
+    "vs code": "alias",
+    "fire fox": "alias",
+    "thunder": "prefix",
+    "libreoffice wri": "prefix",
+    "firefx": "fuzzy",
+    "thunderbirt": "fuzzy",
+    "not installed anywhere": "miss",
+}
+
+
+def write_executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+
+
+def write_desktop_entry(path, name, command):
+    path.write_text(f"[Desktop Entry]\nType=Application\nName={name}\nExec={command} %U\n", encoding="utf-8")
+
+
+def build_tree(root, args):
+    """Directories of executables and desktop entries like a desktop install"""
+    path_dirs, desktop_dirs = [], []
+    for d in range(args.path_dirs):
+        directory = root / "bin" / f"dir{d}"
+        directory.mkdir(parents=True)
+        for e in range(args.executables):
+            write_executable(directory / f"tool-{d}-{e}")
+        path_dirs.append(str(directory))
+    for name in ("firefox", "code", "thunderbird", "libreoffice"):
+        write_executable(Path(path_dirs[0]) / name)
+
+    for d in range(args.desktop_dirs):
+        directory = root / "share" / f"apps{d}"
+        (directory / "vendor").mkdir(parents=True)
+        for e in range(args.entries):
+            target = directory / "vendor" if e % 3 == 0 else directory
+            write_desktop_entry(target / f"org.example.App{d}x{e}.desktop", f"Example App {d} {e}", f"app{d}x{e}")
+        desktop_dirs.append(str(directory))
+    share = Path(desktop_dirs[0])
+    write_desktop_entry(share / "firefox.desktop", "Firefox Web Browser", "firefox")
+    write_desktop_entry(share / "code.desktop", "Visual Studio Code", "code")
+    write_desktop_entry(share / "thunderbird.desktop", "Thunderbird Mail", "thunderbird")
+    write_desktop_entry(share / "libreoffice-writer.desktop", "LibreOffice Writer", "libreoffice --writer")
+    return path_dirs, desktop_dirs
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def measure_lookups(index, lookups):
+    """Mean and p99 microseconds per kind of name, and what each resolved to"""
+    per_kind, resolved = {}, {}
+    rounds = max(1, lookups // len(NAMES))
+    for name, kind in NAMES.items():
+        samples = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            app = index.resolve(name, refresh=False)
+            samples.append(time.perf_counter() - start)
+        per_kind.setdefault(kind, []).extend(samples)
+        resolved[name] = app["name"] if app else None
+    return per_kind, resolved
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as scratch:
+        root = Path(scratch)
+        path_dirs, desktop_dirs = build_tree(root, args)
+        path_dirs += default_path_dirs()
+        cache_file = root / "app_index.json"
+
+        def new_index():
+            return AppIndex(cache_file, builtins=APP_PATHS, path_dirs=path_dirs, desktop_dirs=desktop_dirs)
+
+        index, cold = timed(new_index)
+        cold_stats = index.stats
+        index, warm = timed(new_index)
+        warm_stats = index.stats
+        time.sleep(0.01)  # a new mtime even on coarse clocks
+        write_executable(Path(path_dirs[1]) / "newly-installed")
+        index, after = timed(new_index)
+        after_stats = index.stats
+
+        print(f"{len(index)} names from {len(path_dirs)} PATH and {warm_stats['reused'] - len(path_dirs)} "
+              f"desktop directories, cache {os.path.getsize(cache_file) / 1024:.0f} KB\n")
+        print(f"{'':<15}{'time':>10}{'scanned':>9}{'reused':>8}{'parsed':>8}")
+        for label, seconds, stats in (("cold build", cold, cold_stats), ("warm load", warm, warm_stats),
+                                      ("after install", after, after_stats)):
+            print(f"{label:<15}{seconds * 1000:>7.1f} ms{stats['scanned']:>9}{stats['reused']:>8}{stats['parsed']:>8}")
+        assert index.resolve("newly installed", refresh=False) is not None
+
+        per_kind, resolved = measure_lookups(index, args.lookups)
+        print(f"\n{'lookup':<10}{'mean':>10}{'p99':>10}")
+        for kind in ("exact", "alias", "prefix", "fuzzy", "miss"):
+            samples = sorted(per_kind[kind])
+            print(f"{kind:<10}{statistics.mean(samples) * 1e6:>7.1f} us"
+                  f"{samples[int(0.99 * (len(samples) - 1))] * 1e6:>7.1f} us")
+        print()
+        for name, kind in NAMES.items():
+            print(f"  {kind:<7}{name!r:<26}-> {resolved[name]}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="App index build time and lookup latency")
+    parser.add_argument("--path-dirs", type=int, default=20)
+    parser.add_argument("--executables", type=int, default=300, help="per PATH directory")
+    parser.add_argument("--desktop-dirs", type=int, default=4)
+    parser.add_argument("--entries", type=int, default=150, help="desktop entries per directory")
+    parser.add_argument("--lookups", type=int, default=20000)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,106 @@
+"""
+LLM Backend Benchmark
+Runs Goku.process_command end to end against offline backends and compares
+their latency profiles: stub profiles with different latency/jitter/error
+settings, and record/replay of the stub's traffic
+
+Run: python benchmarks/bench_backends.py
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from ai_brain import AIBrain
+from llm_backends import RecordReplayBackend, StubBackend
+from main import Goku
+
+COMMANDS = [
+    "how are you",
+    "open notepad",
+    "search for python tutorials",
+    "play linkin park on youtube",
+    "what can you do",
+    "take a note buy milk",
+    "tell me a joke",
+    "show me system stats",
+]
+
+PROFILES = {
+    "stub fast": dict(latency=0.1, chunk_delay=0.005),
+    "stub typical": dict(latency=0.5, jitter=0.3, chunk_delay=0.02),
+    "stub flaky": dict(latency=0.5, jitter=0.3, chunk_delay=0.02, error_rate=0.2),
+}
+
+
+class NullVoiceOutput:
+    def speak(self, text, priority=None):
+        return None
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.actions = []
+
+    def execute(self, command_data):
+        self.actions.append(command_data.get("action"))
+        return {"success": True, "message": command_data.get("response")}
+
+
+def make_goku(backend, stream):
+    goku = Goku.__new__(Goku)
+    goku.settings = SimpleNamespace(STREAM_RESPONSES=stream)
+    goku.voice_output = NullVoiceOutput()
+    goku.ai_brain = AIBrain(backend=backend)
+    goku.executor = RecordingExecutor()
+    # Every command goes to the backend, that's what is being measured
+    goku.intent_matcher = None
+    return goku
+
+
+def measure(goku, rounds=3):
+    samples = []
+    for _ in range(rounds):
+        for command in COMMANDS:
+            start = time.perf_counter()
+            goku.process_command(command)
+            samples.append(time.perf_counter() - start)
+    samples.sort()
+    failed = goku.executor.actions.count("UNKNOWN")
+    return {
+        "p50": samples[len(samples) // 2],
+        "p95": samples[int(len(samples) * 0.95)],
+        "mean": statistics.mean(samples),
+        "errors": failed / len(samples),
+    }
+
+
+def report(name, stats):
+    print(f"{name:>16}: mean {stats['mean'] * 1000:6.0f} ms, p50 {stats['p50'] * 1000:6.0f} ms, "
+          f"p95 {stats['p95'] * 1000:6.0f} ms, failed {stats['errors']:.0%}")
+
+
+def run():
+    for name, options in PROFILES.items():
+        report(name, measure(make_goku(StubBackend(**options), stream=False)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recordings = Path(tmp) / "recordings.jsonl"
+        recorder = RecordReplayBackend(recordings, mode="record", backend=StubBackend(**PROFILES["stub typical"]))
+        report("record", measure(make_goku(recorder, stream=False), rounds=1))
+
+        replay = RecordReplayBackend(recordings, mode="replay")
+        report("replay", measure(make_goku(replay, stream=False)))
+        replay_timed = RecordReplayBackend(recordings, mode="replay", replay_latency=True)
+        report("replay (timed)", measure(make_goku(replay_timed, stream=False)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,150 @@
+"""
+Audio Capture Benchmark
+Activation-to-capture latency and clipped speech when VoiceInput reopens the
+microphone on every listen() versus reading an always-on ring buffer with
+pre-roll
+
+A simulated microphone plays a WAV fixture in real time and takes
+--open-latency to open, like a real device. The user starts speaking
+--speech-delay after activation (negative: while still pressing the hotkey).
+
+Run: python benchmarks/bench_capture.py [--trials 5] [--open-latency 0.12]
+         [--speech-delay 0.05] [--preroll 0.3] [--buffer-seconds 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import speech_recognition as sr
+
+from audio_fixtures import SAMPLE_RATE, ensure_fixtures
+from voice_input import VoiceInput
+
+FIXTURE_LEAD = 0.4  # seconds of silence before speech in every fixture
+SPEECH_LEVEL = 1000  # samples louder than this count as speech
+
+
+class SimulatedMicrophone(sr.AudioSource):
+    """Plays a fixture in real time, starting at speech_at, silence otherwise"""
+
+    def __init__(self, fixture, open_latency, chunk=1024):
+        with sr.AudioFile(str(fixture)) as source:
+            self.clip = source.stream.read(source.FRAME_COUNT)
+        self.open_latency = open_latency
+        self.SAMPLE_RATE = SAMPLE_RATE
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+        self.stream = None
+        self.speech_at = None
+        self.opened_at = None
+
+    def __enter__(self):
+        time.sleep(self.open_latency)
+        self.opened_at = time.perf_counter()
+        self.frames = 0
+        self.stream = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+    def read(self, size):
+        count = size // self.SAMPLE_WIDTH
+        start = self.opened_at + self.frames / SAMPLE_RATE
+        self.frames += count
+        # Hand frames out no faster than they would be recorded
+        time.sleep(max(0.0, start + count / SAMPLE_RATE - time.perf_counter()))
+
+        chunk = bytearray(count * self.SAMPLE_WIDTH)
+        if self.speech_at is None:
+            return bytes(chunk)
+        offset = int((start - self.speech_at) * SAMPLE_RATE) * self.SAMPLE_WIDTH
+        begin, end = max(offset, 0), min(offset + len(chunk), len(self.clip))
+        if begin < end:
+            chunk[begin - offset:end - offset] = self.clip[begin:end]
+        return bytes(chunk)
+
+
+def speech_ms(frame_data):
+    samples = array("h", frame_data)
+    return sum(1 for sample in samples if abs(sample) > SPEECH_LEVEL) / SAMPLE_RATE * 1000
+
+
+def measure(args, fixture, capture):
+    microphone = SimulatedMicrophone(fixture, args.open_latency)
+    heard = []
+    voice_input = VoiceInput(
+        source=microphone,
+        recognize=lambda audio: heard.append(audio) or "ok",
+        calibrate=False,
+        capture_seconds=args.buffer_seconds if capture else 0,
+        preroll=args.preroll,
+    )
+    voice_input.recognizer.dynamic_energy_threshold = False
+    expected = speech_ms(microphone.clip)
+    time.sleep(args.preroll + 0.2)  # let the ring fill up
+
+    results = []
+    for _ in range(args.trials):
+        # Schedule the speech before the microphone records any of it
+        activation = time.perf_counter() + FIXTURE_LEAD + max(0.0, -args.speech_delay) + 0.1
+        microphone.speech_at = activation + args.speech_delay - FIXTURE_LEAD
+        time.sleep(activation - time.perf_counter())
+        tracemalloc.start()
+        voice_input.listen(timeout=5, phrase_time_limit=10)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        returned = time.perf_counter() - activation
+
+        if capture:
+            audio_from = -min(args.preroll, activation - microphone.opened_at)
+        else:
+            audio_from = microphone.opened_at - activation
+        results.append({
+            "audio_from": audio_from * 1000,
+            "clipped": max(0.0, expected - speech_ms(heard[-1].frame_data)),
+            "returned": returned * 1000,
+            "peak": peak / 1024,
+        })
+        time.sleep(0.3)
+
+    ring = voice_input.capture.memory_bytes() / 1024 if capture else 0
+    voice_input.close()
+    summary = {key: statistics.median(result[key] for result in results) for key in results[0]}
+    summary["ring"] = ring
+    return summary
+
+
+def run(args):
+    fixture = ensure_fixtures()[0][0]
+    print(f"Device open {args.open_latency * 1000:.0f} ms, speech starts {args.speech_delay * 1000:+.0f} ms "
+          f"after activation, pre-roll {args.preroll * 1000:.0f} ms, {args.trials} trials\n")
+    print(f"{'mode':<10}{'audio from':>12}{'clipped':>10}{'listen':>10}{'peak alloc':>12}{'ring':>10}")
+    for name, capture in (("reopen", False), ("ring", True)):
+        stats = measure(args, fixture, capture)
+        print(f"{name:<10}{stats['audio_from']:>+9.0f} ms{stats['clipped']:>7.0f} ms{stats['returned']:>7.0f} ms"
+              f"{stats['peak']:>8.0f} KiB{stats['ring']:>6.0f} KiB")
+    print("\naudio from: start of the audio the recognizer sees, relative to activation")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Reopened microphone vs always-on ring buffer")
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--open-latency", type=float, default=0.12, help="seconds to open the device")
+    parser.add_argument("--speech-delay", type=float, default=0.05, help="seconds after activation")
+    parser.add_argument("--preroll", type=float, default=0.3, help="seconds")
+    parser.add_argument("--buffer-seconds", type=float, default=5.0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
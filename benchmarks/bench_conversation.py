@@ -0,0 +1,122 @@
+"""
+Conversation Memory Benchmark
+Prompt size and latency over a long session, stateless versus resending the
+whole history versus the token-budgeted conversation memory
+
+A scripted session of --turns commands mixes actions, questions and
+follow-ups ("open that one again"). The stub backend stands in for Gemini:
+its time to first token grows with the prompt, and it answers a follow-up
+by repeating the last action it can see in the conversation, the way
+Gemini would. Reported per mode and stretch of the session:
+    prompt      - mean prompt tokens per request
+    p50         - median request latency
+    follow-ups  - follow-ups that repeated the right action
+
+Run: python benchmarks/bench_conversation.py [--turns 100] [--budget 300]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from ai_brain import AIBrain
+from command_executor import APP_PATHS
+from conversation import ConversationMemory
+from intent_matcher import IntentMatcher
+from llm_backends import StubBackend
+
+SESSION = [
+    "open spotify",
+    "what's the weather usually like in lisbon in may",
+    "open that one again",
+    "search for cheap flights to lisbon",
+    "play some jazz music",
+    "tell me a joke about saiyans",
+    "do that again",
+    "open visual studio code",
+    "how far away is the moon",
+    "open that one again",
+]
+FOLLOW_UP = re.compile(r"\bagain\b")
+LAST_ACTION = re.compile(r"^Goku: ([A-Z_]+)(?: (\{.*?\}))?(?: - said|$)", re.MULTILINE)
+
+MODES = {
+    "stateless": None,
+    "full history": lambda budget: ConversationMemory(max_tokens=10 ** 9, max_turns=10 ** 9, idle_timeout=0),
+    "memory": lambda budget: ConversationMemory(max_tokens=budget, idle_timeout=0),
+}
+
+
+def responder():
+    """Plans like the stub's default, plus follow-ups resolved from the context"""
+    matcher = IntentMatcher(APP_PATHS)
+
+    def respond(prompt):
+        command = re.findall(r"User command: (.*)", prompt)[-1].strip()
+        if FOLLOW_UP.search(command):
+            seen = [found for found in LAST_ACTION.findall(prompt) if found[0] != "CONVERSATION"]
+            if seen:
+                action, params = seen[-1]
+                return json.dumps({"intent": "repeat", "action": action,
+                                   "parameters": json.loads(params or "{}"), "response": "Once more"})
+        plan = matcher.match(command) or {
+            "intent": "conversation", "action": "CONVERSATION", "parameters": {},
+            "response": f"Here is a short answer about {command}, in a sentence or two.",
+        }
+        return json.dumps(plan)
+    return respond
+
+
+def measure(args, make_memory):
+    brain = AIBrain(
+        backend=StubBackend(latency=args.llm_latency, token_latency=args.token_latency, chunk_delay=0,
+                            responder=responder()),
+        memory=make_memory(args.budget) if make_memory else None,
+    )
+    expected, right = None, []
+    for turn in range(args.turns):
+        command = SESSION[turn % len(SESSION)]
+        plan = brain.process_command(command)
+        if FOLLOW_UP.search(command):
+            right.append(plan["action"] == expected[0] and plan["parameters"] == expected[1])
+        elif plan["action"] != "CONVERSATION":
+            expected = (plan["action"], plan["parameters"])
+    return list(brain.usage.records), right
+
+
+def run(args):
+    stretches = [(0, 10), (10, 40), (args.turns - 20, args.turns)]
+    header = "".join(f"{f'turns {start + 1}-{end}':>24}" for start, end in stretches)
+    print(f"{args.turns} turns, LLM {args.llm_latency * 1000:.0f} ms + {args.token_latency * 1e6:.0f} us "
+          f"per prompt token, memory budget {args.budget} tokens\n")
+    print(f"{'':<14}{header}{'follow-ups':>13}")
+    print(f"{'':<14}" + f"{'prompt':>12}{'p50':>12}" * len(stretches))
+    for mode, make_memory in MODES.items():
+        records, right = measure(args, make_memory)
+        cells = []
+        for start, end in stretches:
+            part = records[start:end]
+            tokens = statistics.mean(r["prompt_tokens"] for r in part)
+            latency = statistics.median(r["latency"] for r in part)
+            cells.append(f"{tokens:>8.0f} tok{latency * 1000:>9.0f} ms")
+        print(f"{mode:<14}{''.join(cells)}{sum(right):>8}/{len(right)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stateless vs full history vs bounded conversation memory")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--budget", type=int, default=300, help="memory budget, tokens")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds to first token")
+    parser.add_argument("--token-latency", type=float, default=0.0004, help="extra seconds per prompt token")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,136 @@
+"""
+End-to-End Benchmark
+Drives the whole Goku pipeline headless: VoiceInput reads WAV fixtures
+instead of the microphone, a stand-in recognizer replaces Google STT, the
+stub backend replaces Gemini and VoiceOutput uses the null sink. Actions run
+against a scratch directory with browser and app launches disabled.
+
+Reports per-stage and total latency, throughput and memory.
+
+Run: python benchmarks/bench_e2e.py [--rounds 3] [--stt-latency 0.3]
+         [--llm-latency 0.5] [--llm-jitter 0.2] [--tts-ms-per-char 0]
+         [--no-local-intents] [--no-stream]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import speech_recognition as sr
+
+import command_executor
+from audio_fixtures import ensure_fixtures
+from config.settings import Settings
+from llm_backends import StubBackend
+from main import Goku
+from tracing import format_summary
+from voice_input import VoiceInput
+from voice_output import VoiceOutput
+
+
+class FixtureRecognizer:
+    """Stand-in for recognize_google: returns the current fixture's transcript"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.transcript = None
+
+    def __call__(self, audio):
+        time.sleep(self.latency)
+        return self.transcript
+
+
+def disable_side_effects():
+    """Keep actions from opening browsers or launching programs"""
+    command_executor.webbrowser.open = lambda url: True
+    command_executor.subprocess = SimpleNamespace(Popen=lambda *args, **kwargs: None)
+
+
+def build_goku(args, stt, first_fixture):
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ["RESPONSE_CACHE"] = "false"
+    os.environ["TRACING"] = "true"
+    os.environ["LOCAL_INTENTS"] = "false" if args.no_local_intents else "true"
+    os.environ["STREAM_RESPONSES"] = "false" if args.no_stream else "true"
+
+    voice_input = VoiceInput(source=sr.AudioFile(str(first_fixture)), recognize=stt, calibrate=False)
+    voice_output = VoiceOutput(sink="null", seconds_per_char=args.tts_ms_per_char / 1000)
+    backend = StubBackend(latency=args.llm_latency, jitter=args.llm_jitter)
+    goku = Goku(settings=Settings(), voice_input=voice_input, voice_output=voice_output, backend=backend)
+    goku.wait_until_ready()
+    return goku
+
+
+def run(args):
+    fixtures = ensure_fixtures()
+    stt = FixtureRecognizer(args.stt_latency)
+    disable_side_effects()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Notes and folders created by actions land in the scratch directory
+        os.chdir(scratch)
+        tracemalloc.start()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            goku = build_goku(args, stt, fixtures[0][0])
+        goku.tracer.logs_dir = Path(scratch) / "logs"
+
+        audio_seconds = 0.0
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.rounds):
+                for path, transcript in fixtures:
+                    goku.voice_input.microphone = sr.AudioFile(str(path))
+                    stt.transcript = transcript
+                    goku.activate_listening(pressed_at=time.perf_counter())
+                    with sr.AudioFile(str(path)) as source:
+                        audio_seconds += source.DURATION
+            goku.voice_output.wait_idle()
+        elapsed = time.perf_counter() - started
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        goku.tracer.close()
+        summary = goku.tracer.summary()
+
+    commands = args.rounds * len(fixtures)
+    print(f"{commands} commands ({len(fixtures)} fixtures x {args.rounds} rounds), "
+          f"{audio_seconds:.1f} s of audio")
+    print(f"STT {args.stt_latency * 1000:.0f} ms, LLM {args.llm_latency * 1000:.0f} ms "
+          f"+ up to {args.llm_jitter * 1000:.0f} ms jitter, local intents "
+          f"{'off' if args.no_local_intents else 'on'}, streaming {'off' if args.no_stream else 'on'}")
+    print()
+    print(format_summary(summary))
+    print()
+    print(f"Throughput:  {commands / elapsed:.2f} commands/s")
+    print(f"Memory:      {peak / 1024 / 1024:.1f} MiB peak traced, "
+          f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB max RSS")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline end-to-end Goku benchmark")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--stt-latency", type=float, default=0.3, help="seconds")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="seconds")
+    parser.add_argument("--tts-ms-per-char", type=float, default=0.0,
+                        help="simulated speaking time of the null sink")
+    parser.add_argument("--no-local-intents", action="store_true")
+    parser.add_argument("--no-stream", action="store_true")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
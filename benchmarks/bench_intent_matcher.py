@@ -0,0 +1,105 @@
+"""
+Intent Matcher Benchmark
+Measures local hit rate, accuracy and match latency over sample commands
+
+Run: python benchmarks/bench_intent_matcher.py
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from command_executor import APP_PATHS, plan_steps
+from intent_matcher import IntentMatcher
+
+# (command, expected action) - None means it should fall through to Gemini,
+# compound commands expect their actions joined with "+"
+CORPUS = [
+    ("open notepad", "OPEN_APP"),
+    ("Open Notepad.", "OPEN_APP"),
+    ("launch calculator", "OPEN_APP"),
+    ("open visual studio code", "OPEN_APP"),
+    ("hey goku open vs code please", "OPEN_APP"),
+    ("start spotify", "OPEN_APP"),
+    ("open command prompt", "OPEN_APP"),
+    ("open file explorer", "OPEN_APP"),
+    ("open my browser", "OPEN_BROWSER"),
+    ("open the browser", "OPEN_BROWSER"),
+    ("open youtube", "OPEN_WEBSITE"),
+    ("go to github.com", "OPEN_WEBSITE"),
+    ("visit stack overflow", "OPEN_WEBSITE"),
+    ("search for python tutorials", "SEARCH_WEB"),
+    ("google best pizza near me", "SEARCH_WEB"),
+    ("look up the weather in tokyo", "SEARCH_WEB"),
+    ("play linkin park on youtube", "PLAY_YOUTUBE"),
+    ("search for cooking recipes on youtube", "PLAY_YOUTUBE"),
+    ("play lofi on youtube music", "PLAY_MUSIC"),
+    ("play some jazz music", "PLAY_MUSIC"),
+    ("play the song numb", "PLAY_MUSIC"),
+    ("show me system stats", "SYSTEM_STATS"),
+    ("what's my cpu usage?", "SYSTEM_STATS"),
+    ("what is my ram", "SYSTEM_STATS"),
+    ("how much storage do i have", "SYSTEM_STATS"),
+    ("system stats", "SYSTEM_STATS"),
+    ("take a note buy groceries tomorrow", "TAKE_NOTE"),
+    ("take a note: meeting at 3 PM", "TAKE_NOTE"),
+    ("note that the server restarts friday", "TAKE_NOTE"),
+    ("search my notes for dentist", "SEARCH_NOTES"),
+    ("what did i note about the server yesterday", "SEARCH_NOTES"),
+    ("read my last three notes", "READ_NOTES"),
+    ("read my work notes", None),
+    ("create a folder called Projects", "CREATE_FOLDER"),
+    ("make a new directory named reports", "CREATE_FOLDER"),
+    ("make a file named test.txt", "CREATE_FILE"),
+    ("how are you?", None),
+    ("what can you do", None),
+    ("open that thing i used yesterday", None),
+    ("tell me a joke about saiyans", None),
+    ("who won the world cup in 2018", None),
+    ("open google and search for ai news", "OPEN_WEBSITE+SEARCH_WEB"),
+    ("open vs code, start spotify and search for pandas docs", "OPEN_APP+OPEN_APP+SEARCH_WEB"),
+    ("open notepad then take a note call mom", "OPEN_APP+TAKE_NOTE"),
+    ("open notepad and calculator", None),
+]
+
+
+def run(iterations=2000):
+    matcher = IntentMatcher(APP_PATHS)
+
+    correct = 0
+    wrong = []
+    for command, expected in CORPUS:
+        plan = matcher.match(command)
+        actual = "+".join(step["action"] for step in plan_steps(plan)) if plan else None
+        if actual == expected:
+            correct += 1
+        else:
+            wrong.append((command, expected, actual))
+
+    matchable = sum(1 for _, expected in CORPUS if expected)
+    hits = sum(1 for command, _ in CORPUS if matcher.match(command))
+
+    timings = []
+    for _ in range(iterations):
+        for command, _ in CORPUS:
+            start = time.perf_counter()
+            matcher.match(command)
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+
+    print(f"Corpus size:      {len(CORPUS)} commands ({matchable} locally matchable)")
+    print(f"Local hit rate:   {hits / len(CORPUS):.1%}")
+    print(f"Accuracy:         {correct / len(CORPUS):.1%}")
+    print(f"Match latency:    mean {statistics.mean(timings):.1f} us, "
+          f"p50 {timings[len(timings) // 2]:.1f} us, "
+          f"p99 {timings[int(len(timings) * 0.99)]:.1f} us")
+    for command, expected, actual in wrong:
+        print(f"  mismatch: {command!r} expected {expected}, got {actual}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,117 @@
+"""
+Multi-Action Benchmark
+Compound commands ("open VS Code, start spotify and search for pandas docs")
+as one request per action versus one multi-action plan, run step by step or
+with independent actions in parallel
+
+The stub backend stands in for Gemini (its responder plans compound
+commands the way the system instruction asks) and every action takes
+--action-latency seconds, like a program starting up. Reported per mode:
+    LLM calls  - backend round trips for all commands
+    p50 / p95  - from the command to the spoken summary
+
+A last run gives one action longer than ACTION_TIMEOUT to show the summary
+is not held up by it.
+
+Run: python benchmarks/bench_multi_action.py [--rounds 3] [--llm-latency 0.5]
+         [--action-latency 0.3] [--timeout 1.0]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from ai_brain import AIBrain
+from bench_e2e import disable_side_effects
+from command_executor import CommandExecutor
+from intent_matcher import COMPOUND_JOINS
+from llm_backends import StubBackend
+from system_info import SystemInfo
+
+COMMANDS = [
+    "open vs code, start spotify and search for pandas docs",
+    "open notepad and search for python tutorials",
+    "open youtube, open github and take a note review pull requests",
+    "start spotify and play some jazz music",
+    "create a folder called reports then make a file named reports/q3.txt",
+]
+
+MODES = ("one per action", "plan, in order", "plan, parallel")
+
+
+def slow_executor(action_latency, max_parallel, timeout=10.0, slow=None):
+    """CommandExecutor whose handlers each take action_latency seconds"""
+    executor = CommandExecutor(voice_output=None, system_info=SystemInfo(), action_timeout=timeout,
+                               max_parallel=max_parallel)
+    execute_action = executor._execute_action
+
+    def delayed(action, params, response):
+        time.sleep(slow if slow and action == "SEARCH_WEB" else action_latency)
+        return execute_action(action, params, response)
+    executor._execute_action = delayed
+    return executor
+
+
+def measure(args, mode):
+    brain = AIBrain(backend=StubBackend(latency=args.llm_latency))
+    executor = slow_executor(args.action_latency, max_parallel=1 if mode == "plan, in order" else 4)
+    samples = []
+    for _ in range(args.rounds):
+        for command in COMMANDS:
+            start = time.perf_counter()
+            if mode == "one per action":
+                # A single-action plan per request, the way the old format forced it
+                for part in COMPOUND_JOINS.split(command):
+                    executor.execute(brain.process_command(part))
+            else:
+                result = executor.execute(brain.process_command(command))
+                assert result["success"], result
+            samples.append(time.perf_counter() - start)
+    return {
+        "calls": brain.usage.summary()["calls"],
+        "p50": statistics.median(samples),
+        "p95": sorted(samples)[int(0.95 * (len(samples) - 1))],
+    }
+
+
+def run(args):
+    disable_side_effects()
+    print(f"{len(COMMANDS)} compound commands x {args.rounds} rounds, LLM {args.llm_latency * 1000:.0f} ms, "
+          f"{args.action_latency * 1000:.0f} ms per action\n")
+    print(f"{'mode':<16}{'LLM calls':>10}{'p50':>10}{'p95':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        # Notes and folders created by actions land in the scratch directory
+        os.chdir(scratch)
+        for mode in MODES:
+            stats = measure(args, mode)
+            print(f"{mode:<16}{stats['calls']:>10}{stats['p50'] * 1000:>7.0f} ms{stats['p95'] * 1000:>7.0f} ms")
+
+        brain = AIBrain(backend=StubBackend(latency=0))
+        executor = slow_executor(args.action_latency, max_parallel=4, timeout=args.timeout, slow=args.timeout * 3)
+        start = time.perf_counter()
+        result = executor.execute(brain.process_command(COMMANDS[0]))
+        elapsed = time.perf_counter() - start
+    print(f"\nSearch stuck for {args.timeout * 3:.0f} s, ACTION_TIMEOUT {args.timeout:g} s: "
+          f"summary after {elapsed * 1000:.0f} ms")
+    print(f"  \"{result['message']}\"")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="One request per action vs multi-action plans")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds")
+    parser.add_argument("--action-latency", type=float, default=0.3, help="seconds per action")
+    parser.add_argument("--timeout", type=float, default=1.0, help="ACTION_TIMEOUT for the last run, seconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,129 @@
+"""
+Noise Tracking Benchmark
+Endpointing after the room gets louder or quieter, with the speech threshold
+from a one-off calibration versus continuous noise-floor tracking
+
+Calibration hears the room as it was at startup. The tracker is fed the
+room as it is now, the way the capture thread feeds it between commands.
+Each command is an endpointing fixture (pauses between words) at the new
+noise level, read as fast as possible:
+    latency  - audio read past the end of speech before recognition
+    stuck    - phrases that ran into phrase_time_limit or the end of the
+               file instead of ending at the silence after them
+    missed   - phrases where no speech was detected at all
+
+Run: python benchmarks/bench_noise.py [--aggressiveness 1] [--background 3]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import speech_recognition as sr
+
+from audio_fixtures import FIXTURES_DIR, SAMPLE_RATE, ensure_endpoint_fixtures, write_noise
+from bench_vad import CountingFile
+from endpointer import NoiseFloorTracker
+from voice_input import VoiceInput
+
+QUIET, LOUD = 60, 900
+SCENARIOS = (("quiet -> quiet", QUIET, QUIET), ("quiet -> loud", QUIET, LOUD), ("loud -> quiet", LOUD, QUIET))
+PHRASE_LIMIT = 10  # seconds, as passed to listen()
+
+
+def room(noise, seconds):
+    """Noise-only WAV of a room, generated on first use"""
+    path = FIXTURES_DIR / "endpoint" / f"room_noise{noise}_{seconds:g}s.wav"
+    if not path.exists():
+        write_noise(path, seconds, noise, seed=noise)
+    return path
+
+
+def frames(path):
+    with sr.AudioFile(str(path)) as source:
+        return source.stream.read(source.FRAME_COUNT)
+
+
+def prepare(voice_input, mode, before, now, background):
+    """Set the threshold the way each mode would have by the next command"""
+    if mode == "calibrated":
+        # VoiceInput's startup calibration, a second of the room back then
+        with sr.AudioFile(str(room(before, 1))) as calibration:
+            voice_input.recognizer.adjust_for_ambient_noise(calibration, duration=1)
+        if voice_input.endpointer is not None:
+            # The floor the endpointer kept from the last command
+            voice_input.endpointer.reset(SAMPLE_RATE, 2)
+            voice_input.endpointer.feed(frames(room(before, 1)))
+    else:
+        # What the capture thread would have fed it since
+        voice_input.noise = voice_input.noise or NoiseFloorTracker()
+        current = frames(room(now, background))
+        for start in range(0, len(current), 2048):
+            voice_input.noise.feed(current[start:start + 2048], SAMPLE_RATE, 2)
+
+
+def measure(args, fixture, mode, endpointing, before):
+    heard = []
+    source = CountingFile(str(fixture["path"]))
+    voice_input = VoiceInput(source=source, recognize=lambda audio: heard.append(audio) or "ok", calibrate=False,
+                             vad_aggressiveness=args.aggressiveness if endpointing else None,
+                             track_noise=mode == "tracked")
+    prepare(voice_input, mode, before, fixture["noise"], args.background)
+    voice_input.listen(timeout=5, phrase_time_limit=PHRASE_LIMIT)
+
+    consumed = source.consumed / (SAMPLE_RATE * 2)
+    with sr.AudioFile(str(fixture["path"])) as whole:
+        duration = whole.DURATION
+    return {
+        "latency": consumed - fixture["speech_end"],
+        "stuck": bool(heard) and (consumed >= duration - 0.01 or len(heard[-1].frame_data) >= PHRASE_LIMIT * SAMPLE_RATE * 2),
+        "missed": not heard,
+    }
+
+
+def tracker_cost(seconds=60):
+    """CPU time the tracker spends per second of 16 kHz audio"""
+    audio = frames(room(QUIET, 3))
+    tracker = NoiseFloorTracker()
+    chunk = 2048  # 1024 frames, sr.Microphone's buffer
+    started = time.process_time()
+    for _ in range(int(seconds * SAMPLE_RATE * 2 / len(audio))):
+        for start in range(0, len(audio), chunk):
+            tracker.feed(audio[start:start + chunk], SAMPLE_RATE, 2)
+    return (time.process_time() - started) / seconds
+
+
+def run(args):
+    fixtures = ensure_endpoint_fixtures()
+    print(f"Startup stall: 1000 ms calibrating, 0 ms tracking "
+          f"(tracker costs {tracker_cost() * 1000:.2f} ms CPU per second of audio)\n")
+    print(f"{'room':<16}{'endpointing':<14}{'threshold':<12}{'median ms':>10}{'stuck':>8}{'missed':>8}")
+    for name, before, now in SCENARIOS:
+        selected = [fixture for fixture in fixtures if fixture["noise"] == now]
+        for endpointing in (False, True):
+            for mode in ("calibrated", "tracked"):
+                results = [measure(args, fixture, mode, endpointing, before) for fixture in selected]
+                ended = [r["latency"] for r in results if not r["stuck"] and not r["missed"]]
+                median = f"{statistics.median(ended) * 1000:.0f}" if ended else "-"
+                print(f"{name:<16}{'vad ' + str(args.aggressiveness) if endpointing else 'pause 0.8 s':<14}{mode:<12}"
+                      f"{median:>10}{sum(r['stuck'] for r in results):>5}/{len(results):<2}"
+                      f"{sum(r['missed'] for r in results):>5}/{len(results):<2}")
+        print()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="One-off calibration vs continuous noise tracking")
+    parser.add_argument("--aggressiveness", type=int, default=1)
+    parser.add_argument("--background", type=float, default=3.0,
+                        help="seconds of the changed room the tracker hears before the command")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,165 @@
+"""
+Notes Benchmark
+The flat notes.txt (one open and append per note, recall by reading the
+whole file) against the SQLite note store, at --notes notes
+
+Notes are generated from a fixed vocabulary and spread over the last two
+years. Reported for each store:
+    add         - per note, as TAKE_NOTE sees it (the store commits in
+                  groups, its flushes are timed separately)
+    last 5      - the latest five notes
+    rare word   - a word in about one note in a thousand
+    common word - a word in about one note in five
+    word + week - a common word within the last seven days
+    date range  - the notes of one day a year ago
+
+Run: python benchmarks/bench_notes.py [--notes 200000] [--queries 50]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from note_store import NoteStore
+
+WORDS = ("call meeting buy milk project review email mom dentist idea book flight pay rent gym fix bug "
+         "send invoice plan trip read article water plants car service backup laptop groceries").split()
+COMMON = "meeting"  # drawn with weight, about one note in five
+RARE = "zeppelin"  # about one note in a thousand
+SPAN = 2 * 365 * 86400  # seconds of history
+
+
+def generate(count, seed=0):
+    """(created, text) pairs, oldest first"""
+    rng = random.Random(seed)
+    now = time.time()
+    notes = []
+    for i in range(count):
+        words = rng.sample(WORDS, rng.randint(3, 8))
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), COMMON)
+        if rng.random() < 0.001:
+            words.append(RARE)
+        notes.append((now - SPAN + SPAN * i / count, " ".join(words)))
+    return notes
+
+
+class FlatNotes:
+    """notes.txt as CommandExecutor used to keep it"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def add(self, text, created=None):
+        with open(self.path, "a", encoding="utf-8") as f:
+            timestamp = datetime.fromtimestamp(created or time.time()).strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"[{timestamp}] {text}\n")
+
+    def bulk(self, notes):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for created, text in notes:
+                f.write(f"[{datetime.fromtimestamp(created):%Y-%m-%d %H:%M:%S}] {text}\n")
+
+    def _all(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                yield line[1:20], line[22:].rstrip("\n")
+
+    def recent(self, count=5, since=None, until=None):
+        return list(self._filter(None, since, until))[-count:][::-1]
+
+    def search(self, query, since=None, until=None, limit=10):
+        return list(self._filter(query.lower(), since, until))[-limit:][::-1]
+
+    def _filter(self, word, since, until):
+        since = datetime.fromtimestamp(since).strftime("%Y-%m-%d %H:%M:%S") if since else None
+        until = datetime.fromtimestamp(until).strftime("%Y-%m-%d %H:%M:%S") if until else None
+        for stamp, text in self._all():
+            if (since and stamp < since) or (until and stamp >= until):
+                continue
+            if word is None or word in text.lower():
+                yield stamp, text
+
+
+def queries(now):
+    day = datetime.fromtimestamp(now - 365 * 86400).replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "last 5": lambda store: store.recent(5),
+        "rare word": lambda store: store.search(RARE, limit=6),
+        "common word": lambda store: store.search(COMMON, limit=6),
+        "word + week": lambda store: store.search(COMMON, since=now - 7 * 86400, limit=6),
+        "date range": lambda store: store.recent(6, since=day.timestamp(),
+                                                 until=(day + timedelta(days=1)).timestamp()),
+    }
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def ms(samples):
+    return f"{statistics.median(samples) * 1000:>9.2f} ms"
+
+
+def run(args):
+    notes = generate(args.notes)
+    extra = [(time.time() - 60 + i * 0.01, text) for i, (_, text) in enumerate(generate(args.adds, seed=1))]
+    with tempfile.TemporaryDirectory() as scratch:
+        flat = FlatNotes(Path(scratch) / "notes.txt")
+        start = time.perf_counter()
+        flat.bulk(notes)
+        flat_load = time.perf_counter() - start
+
+        store = NoteStore(Path(scratch) / "notes.db", batch_size=4096)
+        start = time.perf_counter()
+        for created, text in notes:
+            store.add(text, created=created)
+        store.flush()
+        store_load = time.perf_counter() - start
+
+        flat_adds = [timed(lambda: flat.add(text, created), 1)[0][0] for created, text in extra]
+        store.batch_size = 256  # as the executor has it
+        store_adds = [timed(lambda: store.add(text, created), 1)[0][0] for created, text in extra]
+        flush, _ = timed(store.flush, 1)
+
+        size = (Path(scratch) / "notes.db").stat().st_size + sum(
+            p.stat().st_size for p in Path(scratch).glob("notes.db-*"))
+        print(f"{len(store):,} notes: notes.txt {flat.path.stat().st_size / 2**20:.1f} MB, "
+              f"notes.db {size / 2**20:.1f} MB")
+        print(f"Initial load: notes.txt {flat_load:.2f} s, note store {store_load:.2f} s "
+              f"({len(notes) / store_load:,.0f} notes/s)\n")
+
+        print(f"{'':<14}{'notes.txt':>12}{'note store':>13}   found")
+        print(f"{'add':<14}{ms(flat_adds)}{ms(store_adds)}   (+ {flush[0] * 1000:.1f} ms per group of "
+              f"{len(extra)} committed)")
+        for name, query in queries(time.time()).items():
+            flat_times, flat_found = timed(lambda: query(flat), max(1, args.queries // 10))
+            store_times, found = timed(lambda: query(store), args.queries)
+            assert len(found) == len(flat_found), (name, len(found), len(flat_found))
+            print(f"{name:<14}{ms(flat_times)}{ms(store_times)}   {len(found)}")
+        store.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="notes.txt vs the SQLite note store")
+    parser.add_argument("--notes", type=int, default=200000)
+    parser.add_argument("--adds", type=int, default=200, help="notes added one by one")
+    parser.add_argument("--queries", type=int, default=50, help="runs per query (a tenth for notes.txt)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,71 @@
+"""
+Prompt Token Benchmark
+Compares prompt/output tokens and latency per command for the legacy prompt
+(instructions concatenated into every call) and the system-instruction
+prompt styles
+
+Run offline:        python benchmarks/bench_prompt_tokens.py
+Run against Gemini: python benchmarks/bench_prompt_tokens.py --live
+                    (needs GEMINI_API_KEY, reports Gemini's own token counts)
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from ai_brain import AIBrain, PROMPT_STYLES
+from llm_backends import GeminiBackend, StubBackend
+
+COMMANDS = [
+    "how are you",
+    "open visual studio code",
+    "search for the latest python release notes",
+    "play interstellar soundtrack on youtube",
+    "what's my cpu usage",
+    "take a note call the dentist on monday",
+    "create a folder called invoices",
+    "what's the capital of australia",
+]
+
+
+def make_backend(live):
+    if live:
+        from config.settings import Settings
+        return GeminiBackend(Settings().GEMINI_API_KEY)
+    # Time to first token grows with prompt length
+    return StubBackend(latency=0.25, token_latency=0.0004, chunk_delay=0.01)
+
+
+def run(live=False):
+    results = {}
+    for style in PROMPT_STYLES:
+        brain = AIBrain(backend=make_backend(live), prompt_style=style)
+        for command in COMMANDS:
+            brain.process_command(command)
+        results[style] = list(brain.usage.records)
+
+    print(f"{'command':<45}" + "".join(f"{style:>22}" for style in PROMPT_STYLES))
+    for i, command in enumerate(COMMANDS):
+        cells = []
+        for style in PROMPT_STYLES:
+            record = results[style][i]
+            cells.append(f"{record['prompt_tokens']:>5}+{record['output_tokens']:<4}tok {record['latency'] * 1000:5.0f}ms")
+        print(f"{command[:44]:<45}" + "".join(f"{cell:>22}" for cell in cells))
+
+    print()
+    baseline = sum(r["prompt_tokens"] for r in results["legacy"]) or 1
+    for style in PROMPT_STYLES:
+        records = results[style]
+        prompt = sum(r["prompt_tokens"] for r in records)
+        cached = sum(r["cached_tokens"] for r in records)
+        latency = sum(r["latency"] for r in records) / len(records)
+        print(f"{style:>8}: {prompt / len(records):6.0f} prompt tokens/command "
+              f"({prompt / baseline:.0%} of legacy, {cached} served from cache), "
+              f"{latency * 1000:5.0f} ms avg")
+
+
+if __name__ == "__main__":
+    run(live="--live" in sys.argv)
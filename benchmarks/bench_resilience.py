@@ -0,0 +1,121 @@
+"""
+Resilience Benchmark
+Tail latency of plan requests against a stand-in backend that is
+occasionally very slow or failing, bare versus wrapped in ResilientBackend
+(deadline and retries only, then with hedged requests as well), and what
+an outage costs with and without the circuit breaker
+
+Reported per mode over --requests sequential requests:
+    p50 / p95 / p99 / max  - seconds until the plan (or the fallback) is back
+    failed                 - requests that ended in the fallback reply
+    extra                  - duplicate and retried requests sent, % of requests
+
+Run: python benchmarks/bench_resilience.py [--requests 200] [--slow-rate 0.05]
+         [--slow-latency 4.0] [--error-rate 0.02] [--timeout 2.0]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from ai_brain import AIBrain
+from llm_backends import StubBackend
+from resilience import CircuitBreaker, ResilientBackend
+
+COMMANDS = ("open notepad", "what is the capital of france", "play some jazz music", "tell me a joke")
+
+
+def stub(args, error_rate=None):
+    return StubBackend(latency=args.latency, jitter=args.jitter, chunk_delay=0,
+                       error_rate=args.error_rate if error_rate is None else error_rate,
+                       slow_rate=args.slow_rate, slow_latency=args.slow_latency, seed=1)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+def measure(brain, requests):
+    samples, failed = [], 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(requests):
+            start = time.perf_counter()
+            plan = brain.process_command(COMMANDS[i % len(COMMANDS)])
+            samples.append(time.perf_counter() - start)
+            failed += plan["action"] == "UNKNOWN"
+    return samples, failed
+
+
+def run_tail(args):
+    modes = {
+        "bare": lambda: stub(args),
+        "deadline+retry": lambda: ResilientBackend(stub(args), timeout=args.timeout, hedge=False, seed=1),
+        "+ hedging": lambda: ResilientBackend(stub(args), timeout=args.timeout, seed=1),
+    }
+    print(f"{args.requests} requests, {args.latency * 1000:.0f}-{(args.latency + args.jitter) * 1000:.0f} ms, "
+          f"{args.slow_rate:.0%} stuck for {args.slow_latency:g} s, {args.error_rate:.0%} errors, "
+          f"deadline {args.timeout:g} s\n")
+    print(f"{'mode':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'failed':>8}{'extra':>8}")
+    for mode, make in modes.items():
+        backend = make()
+        samples, failed = measure(AIBrain(backend=backend), args.requests)
+        extra = 0
+        if isinstance(backend, ResilientBackend):
+            stats = backend.stats()
+            extra = stats["hedges"] + stats["retries"]
+        print(f"{mode:<16}" + "".join(f"{percentile(samples, q):>8.2f}s" for q in (0.5, 0.95, 0.99, 1.0))
+              + f"{failed:>8}{extra / args.requests:>8.0%}")
+
+
+def run_outage(args):
+    """Every request fails for a while, then the backend recovers"""
+    print(f"\nOutage: {args.outage} requests fail (each error after {args.latency * 1000:.0f} ms), "
+          f"then {args.outage} succeed")
+    print(f"{'mode':<16}{'outage mean':>13}{'total':>9}{'failed fast':>13}")
+    modes = {
+        "retries only": CircuitBreaker(threshold=10 ** 9),
+        "circuit breaker": CircuitBreaker(threshold=5, reset_after=args.reset),
+    }
+    for mode, breaker in modes.items():
+        backend = stub(args, error_rate=1.0)
+        backend.slow_rate = 0
+        resilient = ResilientBackend(backend, timeout=args.timeout, breaker=breaker, seed=1)
+        brain = AIBrain(backend=resilient)
+        start = time.perf_counter()
+        during, _ = measure(brain, args.outage)
+        backend.error_rate = 0.0
+        # A breaker that opened lets a trial through after reset_after
+        time.sleep(args.reset)
+        measure(brain, args.outage)
+        total = time.perf_counter() - start
+        print(f"{mode:<16}{statistics.mean(during) * 1000:>10.0f} ms{total:>8.1f}s"
+              f"{resilient.stats()['rejected']:>13}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Deadlines, retries, hedging and circuit breaking")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=4.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--timeout", type=float, default=2.0, help="LLM_TIMEOUT, seconds")
+    parser.add_argument("--outage", type=int, default=20, help="requests during and after the outage")
+    parser.add_argument("--reset", type=float, default=1.0, help="BREAKER_RESET, seconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run_tail(args)
+    run_outage(args)
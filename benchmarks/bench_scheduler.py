@@ -0,0 +1,194 @@
+"""
+Scheduler Benchmark
+Hotkey responsiveness when commands come in while earlier ones are still
+thinking or speaking: the whole pipeline in the keyboard hook, one worker
+(commands strictly one after another) and the worker pool
+
+A scripted user double-presses the hotkey, speaks for --speak seconds and
+presses again --gap seconds after finishing, while Goku is still asking the
+stub backend and answering. Reported per mode:
+    hook       - longest time the keyboard hook's callback took
+    to listen  - from the second press to the microphone listening
+    wall       - from the first press to the last reply spoken
+    queue      - scheduler queue depth and wait (p95)
+
+A second run cancels a command while it is thinking and reports how soon
+the job ended and whether its action still ran.
+
+Run: python benchmarks/bench_scheduler.py [--commands 6] [--speak 1.5]
+         [--gap 0.3] [--llm-latency 1.0]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from bench_e2e import disable_side_effects
+from config.settings import Settings
+from llm_backends import StubBackend
+from main import Goku
+from voice_output import VoiceOutput
+
+COMMANDS = ("tell me a joke", "what is the capital of france", "how far away is the moon")
+DOUBLE_PRESS = 0.1  # seconds between the two presses
+MODES = ("hook inline", "1 worker", "4 workers")
+
+
+class ScriptedVoiceInput:
+    """Stands in for VoiceInput: the user speaks each command for a while"""
+
+    streaming = None
+
+    def __init__(self, speak_seconds):
+        self.speak_seconds = speak_seconds
+        self.listening = []  # perf_counter() of each listen() call
+        self.count = 0
+
+    def listen(self, timeout=5, phrase_time_limit=10, wait_for=None, on_partial=None, cancel=None):
+        self.listening.append(time.perf_counter())
+        command = COMMANDS[self.count % len(COMMANDS)]
+        self.count += 1
+        if cancel is not None:
+            if cancel.wait(self.speak_seconds):
+                return None
+        else:
+            time.sleep(self.speak_seconds)
+        return command
+
+    def close(self):
+        pass
+
+
+def build_goku(args, workers):
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ["RESPONSE_CACHE"] = "false"
+    os.environ["TRACING"] = "false"
+    os.environ["METRICS_HISTORY"] = "false"
+    os.environ["LOCAL_INTENTS"] = "false"
+    os.environ["SCHEDULER_WORKERS"] = str(workers)
+    voice_input = ScriptedVoiceInput(args.speak)
+    voice_output = VoiceOutput(sink="null", seconds_per_char=args.tts_ms_per_char / 1000)
+    goku = Goku(settings=Settings(), voice_input=voice_input, voice_output=voice_output,
+                backend=StubBackend(latency=args.llm_latency))
+    goku.wait_until_ready()
+    return goku
+
+
+def inline_hotkey(goku):
+    """The hook as it used to be: double press detection, then the whole pipeline"""
+    def on_hotkey():
+        pressed_at = time.perf_counter()
+        if pressed_at - goku.last_press_time <= goku.double_press_window:
+            if goku.voice_output.busy():
+                goku.voice_output.cancel_all()
+            goku.activate_listening(pressed_at)
+        goku.last_press_time = pressed_at
+    return on_hotkey
+
+
+def measure(args, mode):
+    with contextlib.redirect_stdout(io.StringIO()):
+        goku = build_goku(args, workers=1 if mode == "1 worker" else 4)
+    on_hotkey = inline_hotkey(goku) if mode == "hook inline" else goku.on_hotkey
+
+    # The user starts the next command this long after the previous press
+    period = DOUBLE_PRESS + args.speak + args.gap
+    hook_times, intended = [], []
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index in range(args.commands):
+            for press in range(2):
+                # A blocked hook holds up every later press, keep the schedule
+                at = started + index * period + press * DOUBLE_PRESS
+                time.sleep(max(0.0, at - time.perf_counter()))
+                called = time.perf_counter()
+                on_hotkey()
+                hook_times.append(time.perf_counter() - called)
+            intended.append(at)
+        # Let the dispatcher take the last presses, then wait for the replies
+        time.sleep(0.1)
+        while goku.scheduler.in_flight():
+            time.sleep(0.01)
+        goku.voice_output.wait_idle()
+    wall = time.perf_counter() - started
+
+    goku.system_info.stop_sampler()
+    stats = goku.scheduler.stats()
+    goku.scheduler.shutdown()
+    listening = goku.voice_input.listening
+    delays = [heard - pressed for pressed, heard in zip(intended, listening)]
+    return {
+        "hook": max(hook_times),
+        "accepted": len(listening),
+        "to_listen": statistics.median(delays) if delays else float("nan"),
+        "to_listen_max": max(delays) if delays else float("nan"),
+        "wall": wall,
+        "max_depth": stats["jobs"]["max_depth"],
+        "wait_p95": stats["jobs"]["wait"]["p95"],
+    }
+
+
+def measure_cancel(args):
+    """Cancel a command half way through thinking"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        goku = build_goku(args, workers=4)
+        executed = []
+        execute = goku.executor.execute
+        goku.executor.execute = lambda command_data: executed.append(command_data) or execute(command_data)
+
+        goku.on_hotkey()
+        goku.on_hotkey()
+        time.sleep(args.speak + args.llm_latency / 2)
+        job = goku.scheduler.in_flight()[0]
+        cancelled_at = time.perf_counter()
+        goku.on_cancel_hotkey()
+        job.wait(timeout=10)
+        ended = time.perf_counter() - cancelled_at
+    goku.system_info.stop_sampler()
+    goku.scheduler.shutdown()
+    return {"state": job.state, "ended": ended, "executed": bool(executed)}
+
+
+def run(args):
+    disable_side_effects()
+    print(f"{args.commands} commands, {args.speak:.1f} s each, next one {args.gap:.1f} s after speaking, "
+          f"LLM {args.llm_latency * 1000:.0f} ms\n")
+    print(f"{'mode':<13}{'hook max':>10}{'accepted':>10}{'to listen p50':>15}{'max':>9}"
+          f"{'wall':>9}{'queue max':>11}{'wait p95':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        for mode in MODES:
+            r = measure(args, mode)
+            print(f"{mode:<13}{r['hook'] * 1000:>7.0f} ms{r['accepted']:>6}/{args.commands:<3}"
+                  f"{r['to_listen'] * 1000:>12.0f} ms{r['to_listen_max'] * 1000:>6.0f} ms"
+                  f"{r['wall']:>7.1f} s{r['max_depth']:>11}{r['wait_p95'] * 1000:>7.0f} ms")
+
+        r = measure_cancel(args)
+    print(f"\nCancelled while thinking: job {r['state']} {r['ended'] * 1000:.0f} ms after the cancel press, "
+          f"action {'executed' if r['executed'] else 'not executed'}")
+    print("(the backend call itself can't be interrupted, its plan is dropped when it returns)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inline hook vs one worker vs worker pool")
+    parser.add_argument("--commands", type=int, default=6)
+    parser.add_argument("--speak", type=float, default=1.5, help="seconds the user speaks per command")
+    parser.add_argument("--gap", type=float, default=0.3, help="seconds before the next command")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="seconds")
+    parser.add_argument("--tts-ms-per-char", type=float, default=30.0,
+                        help="simulated speaking time of the null sink")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,218 @@
+"""
+Speculation Benchmark
+Time from the end of speech to the command's action with whole-phrase STT,
+streaming STT, and streaming STT with speculative intent resolution
+
+WAV fixtures play in real time through the NumPy endpointer. The streaming
+stand-in replays each fixture's transcript word by word (with half-word
+partials in between) and the stub backend stands in for Gemini, so STT and
+LLM latency are both simulated. Every command goes to the backend.
+
+After the corpus come REVISIONS: fixtures whose last word the streaming
+recognizer first gets wrong and only corrects in its final result, after
+the pause the speculation started on. Their speculative plans have to be
+discarded and the command resolved again from the final transcript.
+Reported per mode:
+    action      - end of speech until the action runs, p50 / p90
+    done        - end of speech until the activation finished, p50
+    LLM calls   - plan requests once the phrase was over, per command
+    correct     - executed actions matching the plan of the spoken transcript
+    speculation - speculative plans used and discarded, and the plan
+                  requests speculating took
+
+Run: python benchmarks/bench_speculation.py [--rounds 1] [--stt-latency 0.3]
+         [--final-latency 0.1] [--llm-latency 0.5] [--llm-jitter 0.2]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import speech_recognition as sr
+
+from audio_fixtures import SECONDS_PER_WORD, ensure_fixtures
+from bench_e2e import FixtureRecognizer, disable_side_effects
+from command_executor import APP_PATHS
+from config.settings import Settings
+from intent_matcher import IntentMatcher
+from llm_backends import StubBackend
+from main import Goku
+from streaming_stt import TimedTranscriptRecognizer
+from voice_input import VoiceInput
+from voice_output import VoiceOutput
+
+FIXTURE_LEAD = 0.4  # seconds of silence before speech in every fixture
+PARTIAL_LAG = 0.15  # seconds a streaming recognizer trails the audio
+
+MODES = ("whole phrase", "streaming", "speculative")
+
+# Spoken transcript -> what the streaming recognizer hears until its final result
+REVISIONS = {
+    "open notepad": "open notes",
+    "search for python tutorials": "search for python tutorial",
+    "take a note buy groceries tomorrow": "take a note buy groceries today",
+}
+
+
+class PacedAudioFile(sr.AudioFile):
+    """AudioFile read no faster than a microphone would record it"""
+
+    def __enter__(self):
+        super().__enter__()
+        self.CHUNK = 1024  # sr.Microphone's buffer
+        self.opened_at = time.perf_counter()
+        self.frames = 0
+        stream = self.stream
+        paced = self
+
+        class Stream:
+            def read(self, size):
+                chunk = stream.read(size)
+                paced.frames += len(chunk) // paced.SAMPLE_WIDTH
+                time.sleep(max(0.0, paced.opened_at + paced.frames / paced.SAMPLE_RATE - time.perf_counter()))
+                return chunk
+
+        self.stream = Stream()
+        return self
+
+
+def build_goku(args, mode, recognizer):
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ["RESPONSE_CACHE"] = "false"
+    os.environ["TRACING"] = "false"
+    os.environ["METRICS_HISTORY"] = "false"  # stop_sampler() would write it to data/
+    os.environ["LOCAL_INTENTS"] = "false"
+    os.environ["SPECULATIVE_INTENTS"] = "true" if mode == "speculative" else "false"
+
+    voice_input = VoiceInput(
+        source=sr.AudioFile(str(ensure_fixtures()[0][0])),
+        recognize=recognizer if mode == "whole phrase" else None,
+        calibrate=False,
+        vad_aggressiveness=1,
+        streaming=recognizer if mode != "whole phrase" else None,
+    )
+    backend = StubBackend(latency=args.llm_latency, jitter=args.llm_jitter)
+    goku = Goku(settings=Settings(), voice_input=voice_input, voice_output=VoiceOutput(sink="null"), backend=backend)
+    goku.wait_until_ready()
+    return goku
+
+
+def commands():
+    """
+    Returns:
+        list: (wav path, spoken transcript, transcript heard until the
+              final result) for the corpus, then for REVISIONS
+    """
+    fixtures = ensure_fixtures()
+    revised = [(path, transcript, REVISIONS[transcript]) for path, transcript in fixtures
+               if transcript in REVISIONS]
+    return [(path, transcript, transcript) for path, transcript in fixtures] + revised
+
+
+def expected_plan(matcher, transcript):
+    """(action, parameters) the stub backend plans for transcript"""
+    plan = matcher.match(transcript)
+    return (plan["action"], plan["parameters"]) if plan else ("CONVERSATION", {})
+
+
+def measure(args, mode):
+    if mode == "whole phrase":
+        recognizer = FixtureRecognizer(args.stt_latency)
+    else:
+        recognizer = TimedTranscriptRecognizer(final_latency=args.final_latency)
+    with contextlib.redirect_stdout(io.StringIO()):
+        goku = build_goku(args, mode, recognizer)
+
+    acted = []
+    execute = goku.executor.execute
+    goku.executor.execute = lambda command_data: acted.append((time.perf_counter(), command_data)) or \
+        execute(command_data)
+
+    matcher = IntentMatcher(APP_PATHS)
+    samples, replied, correct = [], [], 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(args.rounds):
+            for path, transcript, heard in commands():
+                microphone = PacedAudioFile(str(path))
+                goku.voice_input.microphone = microphone
+                if mode == "whole phrase":
+                    recognizer.transcript = transcript
+                else:
+                    # Streamed audio starts at the endpointer's padding before speech
+                    delay = goku.voice_input.endpointer.padding + PARTIAL_LAG
+                    recognizer.timeline = TimedTranscriptRecognizer.timeline_for(heard, SECONDS_PER_WORD, delay)
+                    if heard != transcript:
+                        # Never a partial, only the final result corrects it
+                        recognizer.timeline.append((float("inf"), transcript))
+
+                acted.clear()
+                goku.activate_listening()
+                speech_end = microphone.opened_at + FIXTURE_LEAD + len(transcript.split()) * SECONDS_PER_WORD
+                acted_at, command_data = acted[0]
+                samples.append(acted_at - speech_end)
+                replied.append(time.perf_counter() - speech_end)
+                correct += (command_data.get("action"), command_data.get("parameters", {})) == \
+                    expected_plan(matcher, transcript)
+        goku.voice_output.wait_idle()
+
+    goku.system_info.stop_sampler()
+    usage = goku.ai_brain.usage.summary()
+    speculative = usage["kinds"].get("plan_speculative", 0)
+    result = {
+        "median": statistics.median(samples),
+        "p90": sorted(samples)[int(0.9 * (len(samples) - 1))],
+        "replied": statistics.median(replied),
+        "llm_calls": usage["calls"] - speculative,
+        "speculative_calls": speculative,
+        "commands": len(samples),
+        "correct": correct,
+    }
+    if goku.speculator:
+        result.update(goku.speculator.stats())
+    return result
+
+
+def run(args):
+    disable_side_effects()
+    print(f"STT {args.stt_latency * 1000:.0f} ms whole phrase / {args.final_latency * 1000:.0f} ms final when "
+          f"streaming, LLM {args.llm_latency * 1000:.0f} ms + up to {args.llm_jitter * 1000:.0f} ms jitter\n")
+    print(f"{len(REVISIONS)} commands per round end in a word the recognizer corrects only in its final result\n")
+    print(f"{'mode':<14}{'action p50':>12}{'action p90':>12}{'done p50':>10}{'LLM calls':>11}{'correct':>9}"
+          f"  speculation")
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        for mode in MODES:
+            stats = measure(args, mode)
+            speculation = ""
+            if "attempts" in stats:
+                speculation = (f"{stats['committed']} used, {stats['discarded']} discarded, "
+                               f"{stats['speculative_calls']} LLM calls")
+            print(f"{mode:<14}{stats['median'] * 1000:>9.0f} ms{stats['p90'] * 1000:>9.0f} ms"
+                  f"{stats['replied'] * 1000:>7.0f} ms{stats['llm_calls']:>5}/{stats['commands']:<5}"
+                  f"{stats['correct']:>4}/{stats['commands']:<4}  {speculation}")
+    print("\nTimes from the end of speech; done: activation finished with the reply queued")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Whole-phrase vs streaming vs speculative recognition")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--stt-latency", type=float, default=0.3, help="whole-phrase recognition, seconds")
+    parser.add_argument("--final-latency", type=float, default=0.1,
+                        help="streaming recognizer's final result, seconds")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="seconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,162 @@
+"""
+Startup Benchmark
+Time-to-ready of Goku with serial and parallel (FAST_STARTUP) component
+initialization, each measured in a fresh interpreter so import caching
+doesn't flatter later runs
+
+Reports, per mode:
+    import   - importing main
+    hotkey   - until start() can register the hotkey
+    ready    - until every component is built
+
+Headless by default: a WAV fixture stands in for the microphone (with the
+calibration time simulated when NOISE_TRACKING=false), the null sink for
+the speakers and the stub backend for Gemini.
+
+Run: python benchmarks/bench_startup.py [--runs 5] [--calibration 1.0]
+         [--tts-init 0.3] [--devices] [--live] [--imports 10]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+MODES = {"serial": "false", "parallel": "true"}
+
+
+def child(args):
+    """Measure one startup in this process and print the timings as JSON"""
+    started = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+
+    if not args.devices:
+        import speech_recognition as sr
+        from audio_fixtures import ensure_fixtures
+
+        fixture = str(ensure_fixtures()[0][0])
+
+        # Options meant for the real devices (capture, phrase cache) are ignored
+        class FixtureVoiceInput(main.VoiceInput):
+            def __init__(self, **options):
+                if os.getenv("NOISE_TRACKING", "true").lower() != "true":
+                    # A real microphone listens this long in adjust_for_ambient_noise
+                    time.sleep(args.calibration)
+                super().__init__(source=sr.AudioFile(fixture), recognize=lambda audio: "", calibrate=False)
+
+        class NullVoiceOutput(main.VoiceOutput):
+            def __init__(self, **options):
+                time.sleep(args.tts_init)  # pyttsx3.init() on a real TTS driver
+                super().__init__(sink="null")
+
+        main.VoiceInput = FixtureVoiceInput
+        main.VoiceOutput = NullVoiceOutput
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        goku = main.Goku()
+        constructed = time.perf_counter()
+        goku.wait_until_ready()
+        ready = time.perf_counter()
+    goku.system_info.stop_sampler()
+
+    print(json.dumps({
+        "import": imported - started,
+        "hotkey": constructed - started,
+        "ready": ready - started,
+    }))
+
+
+def measure(args, mode):
+    env = dict(
+        os.environ,
+        FAST_STARTUP=MODES[mode],
+        LLM_BACKEND="gemini" if args.live else "stub",
+        TRACING="false",
+        METRICS_HISTORY="false",  # stop_sampler() would write it to data/
+    )
+    command = [sys.executable, __file__, "--child",
+               "--calibration", str(args.calibration), "--tts-init", str(args.tts_init)]
+    if args.devices:
+        command.append("--devices")
+
+    runs = []
+    for _ in range(args.runs):
+        launched = time.perf_counter()
+        output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+        process = time.perf_counter() - launched
+        timings = json.loads(output.strip().splitlines()[-1])
+        timings["process"] = process
+        runs.append(timings)
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def slowest_imports(count):
+    """Top-level imports of main by cumulative time, from -X importtime"""
+    code = f"import sys; sys.path[:0] = [{str(ROOT_DIR)!r}, {str(ROOT_DIR / 'src')!r}]; import main"
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True).stderr
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Indentation is nesting depth, main's own imports sit one level in
+        if name.startswith("   ") and not name.startswith("     "):
+            imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def run(args):
+    print(f"{args.runs} runs per mode, "
+          f"{'real devices' if args.devices else f'calibration {args.calibration:.1f} s, TTS init {args.tts_init:.1f} s'}, "
+          f"{'Gemini' if args.live else 'stub'} backend")
+    print(f"{'mode':<10}{'import ms':>11}{'hotkey ms':>11}{'ready ms':>11}{'process ms':>12}")
+    results = {}
+    for mode in MODES:
+        results[mode] = result = measure(args, mode)
+        print(f"{mode:<10}{result['import'] * 1000:>11.0f}{result['hotkey'] * 1000:>11.0f}"
+              f"{result['ready'] * 1000:>11.0f}{result['process'] * 1000:>12.0f}")
+
+    serial, parallel = results["serial"], results["parallel"]
+    print()
+    print(f"Hotkey registered {(serial['hotkey'] - parallel['hotkey']) * 1000:.0f} ms sooner, "
+          f"fully ready {(serial['ready'] - parallel['ready']) * 1000:.0f} ms sooner")
+
+    if args.imports:
+        print()
+        print("Slowest imports of main (cumulative):")
+        for microseconds, name in slowest_imports(args.imports):
+            print(f"  {microseconds / 1000:8.1f} ms  {name}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Goku startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--calibration", type=float, default=1.0,
+                        help="simulated microphone calibration, seconds")
+    parser.add_argument("--tts-init", type=float, default=0.3,
+                        help="simulated TTS engine start, seconds")
+    parser.add_argument("--devices", action="store_true", help="use the real microphone and speakers")
+    parser.add_argument("--live", action="store_true", help="use Gemini (needs GEMINI_API_KEY)")
+    parser.add_argument("--imports", type=int, default=10, help="slowest imports to list, 0 to skip")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    if arguments.child:
+        child(arguments)
+    else:
+        run(arguments)
@@ -0,0 +1,75 @@
+"""
+Streaming Benchmark
+Compares time-to-first-action and time-to-first-speech of the blocking
+AIBrain.process_command path against process_command_stream, using the
+local stub backend instead of Gemini
+
+Run: python benchmarks/bench_streaming.py
+"""
+
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from ai_brain import AIBrain
+from llm_backends import StubBackend
+
+FIRST_CHUNK_SECONDS = 0.35   # time to first token
+CHUNK_SECONDS = 0.03         # gap between chunks
+CHUNK_CHARS = 12             # characters per chunk
+
+REPLY = "```json\n" + json.dumps({
+    "intent": "user wants to hear some relaxing music",
+    "action": "PLAY_MUSIC",
+    "parameters": {"query": "lofi hip hop"},
+    "response": "Sure thing! Putting on some lofi hip hop for you. "
+                "It's great background music for studying or coding. "
+                "Let me know if you want something more upbeat.",
+}, indent=4) + "\n```"
+
+
+def measure_blocking(brain):
+    start = time.perf_counter()
+    brain.process_command("play some lofi")
+    elapsed = time.perf_counter() - start
+    # Action and speech can only start once the whole reply is parsed
+    return elapsed, elapsed, elapsed
+
+
+def measure_streaming(brain):
+    marks = {}
+    start = time.perf_counter()
+
+    def on_action(command_data):
+        marks.setdefault("action", time.perf_counter() - start)
+
+    def on_sentence(sentence):
+        marks.setdefault("speech", time.perf_counter() - start)
+
+    brain.process_command_stream("play some lofi", on_action, on_sentence)
+    return marks["action"], marks["speech"], time.perf_counter() - start
+
+
+def run(runs=5):
+    backend = StubBackend(
+        latency=FIRST_CHUNK_SECONDS,
+        chunk_chars=CHUNK_CHARS,
+        chunk_delay=CHUNK_SECONDS,
+        responder=lambda prompt: REPLY,
+    )
+    brain = AIBrain(backend=backend)
+
+    for name, measure in (("blocking", measure_blocking), ("streaming", measure_streaming)):
+        samples = [measure(brain) for _ in range(runs)]
+        action, speech, total = (statistics.mean(column) for column in zip(*samples))
+        print(f"{name:>9}: first action {action * 1000:6.0f} ms, "
+              f"first speech {speech * 1000:6.0f} ms, full reply {total * 1000:6.0f} ms")
+
+
+if __name__ == "__main__":
+    run()
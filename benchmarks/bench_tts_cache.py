@@ -0,0 +1,79 @@
+"""
+TTS Phrase Cache Benchmark
+Playback latency of the fixed phrases through live pyttsx3 synthesis versus
+pre-rendered audio from the phrase cache
+
+Both paths block until the phrase has been spoken, so each call is reported
+next to the audio length: the difference is the time spent before (and
+after) the audio itself, which the cache is meant to remove.
+
+Needs a TTS engine and speakers.
+Run: python benchmarks/bench_tts_cache.py [--rounds 3]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from main import FIXED_PHRASES
+from phrase_cache import find_player
+from voice_output import VoiceOutput
+
+
+def audio_seconds(path):
+    with wave.open(str(path), "rb") as f:
+        return f.getnframes() / f.getframerate()
+
+
+def time_speak(voice, text, rounds):
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        voice.speak(text).wait()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def run(args):
+    if find_player() is None:
+        print("No WAV player found (needs winsound, afplay, aplay or paplay)")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        live = VoiceOutput()
+        cached = VoiceOutput(phrase_cache_dir=cache_dir)
+
+        started = time.perf_counter()
+        cached.prerender(FIXED_PHRASES)
+        cached.phrases.flush()
+        print(f"Rendered {len(FIXED_PHRASES)} phrases in {time.perf_counter() - started:.2f} s\n")
+
+        print(f"{'phrase':<40}{'audio ms':>10}{'live ms':>10}{'cached ms':>11}{'saved ms':>10}")
+        saved = []
+        for text in FIXED_PHRASES:
+            length = audio_seconds(cached.phrases.lookup(text))
+            live_seconds = time_speak(live, text, args.rounds)
+            cached_seconds = time_speak(cached, text, args.rounds)
+            saved.append(live_seconds - cached_seconds)
+            print(f"{text[:39]:<40}{length * 1000:>10.0f}{live_seconds * 1000:>10.0f}"
+                  f"{cached_seconds * 1000:>11.0f}{saved[-1] * 1000:>10.0f}")
+
+        print(f"\nMedian saved per phrase: {statistics.median(saved) * 1000:.0f} ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Live vs pre-rendered TTS latency")
+    parser.add_argument("--rounds", type=int, default=3)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,118 @@
+"""
+Endpointing Benchmark
+End-of-utterance latency and false cutoffs of SpeechRecognition's fixed pause
+threshold versus the NumPy endpointer at each aggressiveness
+
+Every fixture is one command with seeded pauses between some words, at three
+background noise levels. Fixtures are read as fast as possible, so times are
+in audio seconds:
+    latency  - audio consumed past the true end of speech before the phrase
+               was handed to recognition (phrases not cut off)
+    cutoffs  - phrases ended before the speech did (a pause taken for the end)
+    cpu      - processing time per second of audio
+
+Run: python benchmarks/bench_vad.py [--aggressiveness 0 1 2 3]
+         [--pause-threshold 0.8]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import speech_recognition as sr
+
+from audio_fixtures import ENDPOINT_NOISE, SAMPLE_RATE, ensure_endpoint_fixtures
+from voice_input import VoiceInput
+
+
+class CountingFile(sr.AudioFile):
+    """AudioFile that remembers how many bytes the listener consumed"""
+
+    def __enter__(self):
+        super().__enter__()
+        self.CHUNK = 1024  # sr.Microphone's buffer, AudioFile reads 4096 frames at a time
+        self.consumed = 0
+        stream = self.stream
+        counting = self
+
+        class Stream:
+            def read(self, size):
+                chunk = stream.read(size)
+                counting.consumed += len(chunk)
+                return chunk
+
+        self.stream = Stream()
+        return self
+
+
+def measure(fixture, aggressiveness, pause_threshold):
+    heard = []
+    source = CountingFile(str(fixture["path"]))
+    voice_input = VoiceInput(source=source, recognize=lambda audio: heard.append(audio) or "ok",
+                             calibrate=False, vad_aggressiveness=aggressiveness)
+    recognizer = voice_input.recognizer
+    recognizer.pause_threshold = pause_threshold
+    recognizer.dynamic_energy_threshold = False
+    # Where adjust_for_ambient_noise would settle for this much noise
+    recognizer.energy_threshold = max(300, 1.5 * fixture["noise"])
+
+    started = time.process_time()
+    voice_input.listen(timeout=5, phrase_time_limit=10)
+    cpu = time.process_time() - started
+
+    consumed = source.consumed / (SAMPLE_RATE * 2)
+    decided = consumed
+    if voice_input.endpointer is not None:
+        # The endpointer can decide partway into the last chunk read
+        endpointer = voice_input.endpointer
+        decided = endpointer.frames * endpointer.frame_size / SAMPLE_RATE
+    return {
+        "latency": consumed - fixture["speech_end"],
+        "cutoff": not heard or decided < fixture["speech_end"],
+        "cpu": cpu / consumed,
+    }
+
+
+def summarize(results):
+    # A phrase cut off early has no meaningful latency
+    latencies = sorted(result["latency"] for result in results if not result["cutoff"]) or [float("nan")]
+    return {
+        "median": statistics.median(latencies),
+        "p90": latencies[int(0.9 * (len(latencies) - 1))],
+        "cutoffs": sum(result["cutoff"] for result in results),
+        "cpu": statistics.mean(result["cpu"] for result in results),
+    }
+
+
+def run(args):
+    fixtures = ensure_endpoint_fixtures()
+    modes = [(f"pause {args.pause_threshold:.1f} s", None)]
+    modes += [(f"vad {level}", level) for level in args.aggressiveness]
+
+    print(f"{len(fixtures)} fixtures, noise levels {', '.join(map(str, ENDPOINT_NOISE))}, "
+          f"longest pause between words {max(f['longest_pause'] for f in fixtures):.2f} s\n")
+    print(f"{'mode':<14}{'median ms':>11}{'p90 ms':>9}{'cutoffs':>10}{'cpu ms/s':>10}")
+    for name, level in modes:
+        stats = summarize([measure(fixture, level, args.pause_threshold) for fixture in fixtures])
+        print(f"{name:<14}{stats['median'] * 1000:>11.0f}{stats['p90'] * 1000:>9.0f}"
+              f"{stats['cutoffs']:>5}/{len(fixtures):<4}{stats['cpu'] * 1000:>10.2f}")
+
+    print("\nLatency: audio read past the end of speech before recognition could start")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pause threshold vs NumPy endpointer")
+    parser.add_argument("--aggressiveness", type=int, nargs="+", default=[0, 1, 2, 3])
+    parser.add_argument("--pause-threshold", type=float, default=0.8,
+                        help="SpeechRecognition's pause_threshold, seconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,163 @@
+"""
+Warm-up Benchmark
+Latency of the first command after an idle spell: cold, with speculative
+warm-up on the first Shift+Space press, with the LLM keep-alive, and with
+both
+
+Headless like bench_e2e: WAV fixtures stand in for the microphone (opening
+one takes --mic-open seconds, like a real audio device), the stub backend
+for Gemini (a request after --idle seconds without traffic pays
+--connect seconds to connect again) and the null sink for the speakers.
+Every command comes after the connection has gone idle, as a double press
+--gap seconds apart. Reported per mode:
+    command   - second press until the reply is spoken, p50 / max
+    mic ready - commands whose microphone was open by the second press
+    ai        - waiting for the plan, p50
+    connects  - requests and warm-ups that had to connect first
+
+Run: python benchmarks/bench_warmup.py [--commands 5] [--idle 1.5]
+         [--connect 0.3] [--mic-open 0.15] [--gap 0.25]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+import speech_recognition as sr
+
+from audio_fixtures import ensure_fixtures
+from bench_e2e import FixtureRecognizer, disable_side_effects
+from config.settings import Settings
+from llm_backends import StubBackend
+from main import Goku
+from voice_input import VoiceInput
+from voice_output import VoiceOutput
+
+MODES = {
+    "cold": {"HOTKEY_WARMUP": "false", "keepalive": False},
+    "first-press warm-up": {"HOTKEY_WARMUP": "true", "keepalive": False},
+    "keep-alive": {"HOTKEY_WARMUP": "false", "keepalive": True},
+    "both": {"HOTKEY_WARMUP": "true", "keepalive": True},
+}
+
+
+class SlowOpenAudioFile(sr.AudioFile):
+    """A WAV fixture that takes as long to open as an audio device"""
+
+    def __init__(self, path, open_latency):
+        super().__init__(path)
+        self.open_latency = open_latency
+        self.opened = None
+
+    def __enter__(self):
+        time.sleep(self.open_latency)
+        self.opened = time.perf_counter()
+        return super().__enter__()
+
+
+def build_goku(args, mode, stt, backend):
+    os.environ["LLM_BACKEND"] = "stub"
+    os.environ["RESPONSE_CACHE"] = "false"
+    os.environ["LOCAL_INTENTS"] = "false"  # every command asks the LLM
+    os.environ["HOTKEY_WARMUP"] = MODES[mode]["HOTKEY_WARMUP"]
+    os.environ["LLM_KEEPALIVE"] = str(args.idle / 2) if MODES[mode]["keepalive"] else "0"
+
+    voice_input = VoiceInput(source=sr.AudioFile(str(ensure_fixtures()[0][0])), recognize=stt, calibrate=False)
+    voice_output = VoiceOutput(sink="null")
+    goku = Goku(settings=Settings(), voice_input=voice_input, voice_output=voice_output, backend=backend)
+    goku.wait_until_ready()
+    return goku
+
+
+def double_press(goku, gap):
+    """
+    Press twice and wait for the command to finish
+
+    Returns:
+        tuple: (seconds from the second press, microphone open by then)
+    """
+    done = goku.scheduler.stats()["completed"]
+    goku.on_hotkey()
+    time.sleep(gap)
+    pressed = time.perf_counter()
+    goku.on_hotkey()
+    while goku.scheduler.stats()["completed"] == done:
+        time.sleep(0.002)
+    opened = goku.voice_input.microphone.opened
+    return time.perf_counter() - pressed, opened is not None and opened <= pressed
+
+
+def measure(args, mode, scratch):
+    fixtures = ensure_fixtures()
+    stt = FixtureRecognizer(args.stt_latency)
+    backend = StubBackend(latency=args.llm_latency, chunk_delay=0, connect_latency=args.connect,
+                          idle_timeout=args.idle)
+    with contextlib.redirect_stdout(io.StringIO()):
+        goku = build_goku(args, mode, stt, backend)
+        goku.tracer.logs_dir = Path(scratch) / "logs"
+        samples, ready = [], 0
+        for i in range(args.commands):
+            path, transcript = fixtures[i % len(fixtures)]
+            goku.voice_input.microphone = SlowOpenAudioFile(str(path), args.mic_open)
+            stt.transcript = transcript
+            # Long enough for the connection to close unless it is kept alive
+            time.sleep(args.idle + 0.2)
+            latency, mic_ready = double_press(goku, args.gap)
+            samples.append(latency)
+            ready += mic_ready
+
+        # A stray single press: whatever it opened is released again
+        goku.voice_input.microphone = SlowOpenAudioFile(str(fixtures[0][0]), args.mic_open)
+        goku.on_hotkey()
+        time.sleep(args.gap + args.mic_open + goku.settings.WARMUP_HOLD + 0.2)
+        released = goku.voice_input.warm_source is None
+        if goku.keepalive is not None:
+            goku.keepalive.stop()
+        goku.tracer.close()
+    return samples, ready, goku.tracer.summary(), backend.connects, released, goku.warmup
+
+
+def run(args):
+    print(f"{args.commands} commands per mode, each after {args.idle:g} s idle; connecting "
+          f"{args.connect * 1000:.0f} ms, opening the microphone {args.mic_open * 1000:.0f} ms, "
+          f"LLM {args.llm_latency * 1000:.0f} ms, presses {args.gap * 1000:.0f} ms apart\n")
+    print(f"{'mode':<22}{'command p50':>13}{'max':>9}{'mic ready':>11}{'ai p50':>9}{'connects':>10}")
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        disable_side_effects()
+        stray = []
+        for mode in MODES:
+            samples, ready, stages, connects, released, warmup = measure(args, mode, scratch)
+            print(f"{mode:<22}{statistics.median(samples) * 1000:>10.0f} ms{max(samples) * 1000:>6.0f} ms"
+                  f"{ready:>8}/{args.commands}{stages['ai']['p50'] * 1000:>6.0f} ms"
+                  f"{connects:>10}")
+            if warmup is not None:
+                stray.append(f"{mode}: {warmup.stats()['released']} released, microphone "
+                             f"{'closed' if released else 'still open'}")
+        print("\nSingle press without a second one: " + "; ".join(stray))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cold vs warm first command after idling")
+    parser.add_argument("--commands", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=1.5, help="seconds until the connection closes")
+    parser.add_argument("--connect", type=float, default=0.3, help="seconds to connect (DNS, TCP, TLS)")
+    parser.add_argument("--mic-open", type=float, default=0.15, help="seconds to open the microphone")
+    parser.add_argument("--gap", type=float, default=0.25, help="seconds between the two presses")
+    parser.add_argument("--llm-latency", type=float, default=0.4, help="seconds to first token")
+    parser.add_argument("--stt-latency", type=float, default=0.3, help="seconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
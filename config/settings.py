@@ -7,8 +7,11 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / 'data'
+
 # Load .env file from project root
-env_path = Path(__file__).parent.parent / '.env'
+env_path = PROJECT_ROOT / '.env'
 load_dotenv(env_path)
 
 class Settings:
@@ -19,22 +22,115 @@ class Settings:
         # Hotkey configuration (Shift+Space double press)
         self.ACTIVATION_HOTKEY = 'shift+space'
         self.DOUBLE_PRESS_WINDOW = float(os.getenv('DOUBLE_PRESS_WINDOW', '0.5'))  # seconds
+        self.CANCEL_HOTKEY = os.getenv('CANCEL_HOTKEY', 'ctrl+shift+space').lower()
+        
+        # Commands in flight at once (one listens while the others think or speak)
+        self.SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', '4'))
         
         # Voice settings
         self.VOICE_RATE = int(os.getenv('VOICE_RATE', '180'))
         self.VOICE_VOLUME = float(os.getenv('VOICE_VOLUME', '0.9'))
         
+        # Resolve common commands locally before asking Gemini
+        self.LOCAL_INTENTS = os.getenv('LOCAL_INTENTS', 'true').lower() == 'true'
+        
+        # Response cache for repeated AI commands
+        self.RESPONSE_CACHE = os.getenv('RESPONSE_CACHE', 'true').lower() == 'true'
+        self.CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '500'))
+        self.CACHE_PLAN_TTL = int(os.getenv('CACHE_PLAN_TTL', '86400'))  # seconds
+        self.CACHE_CHAT_TTL = int(os.getenv('CACHE_CHAT_TTL', '600'))  # seconds
+        
+        # Resolve OPEN_APP names through an index of installed apps kept in data/app_index.json
+        self.APP_INDEX = os.getenv('APP_INDEX', 'true').lower() == 'true'
+        
+        # Seconds each action of a multi-action plan may take before it is reported as too slow
+        self.ACTION_TIMEOUT = float(os.getenv('ACTION_TIMEOUT', '10'))
+        
+        # Send recent turns with each request so follow-ups ("open that one again") work
+        self.CONVERSATION_MEMORY = os.getenv('CONVERSATION_MEMORY', 'true').lower() == 'true'
+        self.CONVERSATION_TOKENS = int(os.getenv('CONVERSATION_TOKENS', '300'))  # context budget
+        self.CONVERSATION_TIMEOUT = float(os.getenv('CONVERSATION_TIMEOUT', '600'))  # seconds idle before forgetting
+        
+        # Stream Gemini replies and act before the full reply has arrived
+        self.STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'true').lower() == 'true'
+        
+        # LLM backend: gemini, stub (offline stand-in), record or replay
+        self.LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini').lower()
+        self.STUB_LATENCY = float(os.getenv('STUB_LATENCY', '0.5'))  # seconds
+        self.STUB_JITTER = float(os.getenv('STUB_JITTER', '0.0'))  # seconds
+        self.STUB_ERROR_RATE = float(os.getenv('STUB_ERROR_RATE', '0.0'))  # 0.0 to 1.0
+        self.STUB_SLOW_RATE = float(os.getenv('STUB_SLOW_RATE', '0.0'))  # 0.0 to 1.0, requests stuck for STUB_SLOW_LATENCY
+        self.STUB_SLOW_LATENCY = float(os.getenv('STUB_SLOW_LATENCY', '5.0'))  # seconds
+        self.STUB_CONNECT_LATENCY = float(os.getenv('STUB_CONNECT_LATENCY', '0.0'))  # seconds, after a minute idle
+        
+        # Deadlines, retries, hedged duplicates and a circuit breaker around LLM calls
+        self.LLM_RESILIENCE = os.getenv('LLM_RESILIENCE', 'true').lower() == 'true'
+        self.LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '8'))  # seconds without a reply
+        self.LLM_RETRIES = int(os.getenv('LLM_RETRIES', '2'))
+        self.LLM_HEDGE = os.getenv('LLM_HEDGE', 'true').lower() == 'true'
+        self.BREAKER_THRESHOLD = int(os.getenv('BREAKER_THRESHOLD', '5'))  # failed calls in a row
+        self.BREAKER_RESET = float(os.getenv('BREAKER_RESET', '30'))  # seconds before trying again
+        
+        # Touch the LLM connection after this many idle seconds so it stays open (0 disables)
+        self.LLM_KEEPALIVE = float(os.getenv('LLM_KEEPALIVE', '45'))
+        
+        # Open the microphone and LLM connection on the first Shift+Space press, before the second
+        self.HOTKEY_WARMUP = os.getenv('HOTKEY_WARMUP', 'true').lower() == 'true'
+        self.WARMUP_HOLD = float(os.getenv('WARMUP_HOLD', '2'))  # seconds kept open without a second press
+        
+        # System instruction style: full, compact or legacy (instructions in every prompt)
+        self.PROMPT_STYLE = os.getenv('PROMPT_STYLE', 'full').lower()
+        
+        # Per-stage latency traces written to logs/trace-YYYYMMDD.jsonl
+        self.TRACING = os.getenv('TRACING', 'true').lower() == 'true'
+        
+        # Keep the microphone open and capture into a ring buffer (0 reopens it per command)
+        self.AUDIO_CAPTURE_SECONDS = float(os.getenv('AUDIO_CAPTURE_SECONDS', '5'))  # seconds of audio kept
+        self.AUDIO_PREROLL = float(os.getenv('AUDIO_PREROLL', '0.3'))  # seconds before activation kept
+        
+        # End phrases with the NumPy endpointer instead of a fixed pause threshold
+        self.VAD_ENDPOINTING = os.getenv('VAD_ENDPOINTING', 'true').lower() == 'true'
+        self.VAD_AGGRESSIVENESS = int(os.getenv('VAD_AGGRESSIVENESS', '1'))  # 0 (patient) to 3 (fastest)
+        
+        # Track background noise continuously instead of calibrating for a second at startup
+        self.NOISE_TRACKING = os.getenv('NOISE_TRACKING', 'true').lower() == 'true'
+        
+        # Speech recognition: google (whole phrase) or vosk (streams partial transcripts)
+        self.STT_BACKEND = os.getenv('STT_BACKEND', 'google').lower()
+        self.VOSK_MODEL = os.getenv('VOSK_MODEL', 'models/vosk')
+        
+        # Start resolving stable partial transcripts before the phrase ends
+        self.SPECULATIVE_INTENTS = os.getenv('SPECULATIVE_INTENTS', 'true').lower() == 'true'
+        
+        # Play fixed and repeated phrases from pre-rendered audio in data/tts_cache
+        self.TTS_PHRASE_CACHE = os.getenv('TTS_PHRASE_CACHE', 'true').lower() == 'true'
+        
+        # Build components in parallel and register the hotkey before they are ready
+        self.FAST_STARTUP = os.getenv('FAST_STARTUP', 'true').lower() == 'true'
+        
+        # Background system stats sampling (0 disables it)
+        self.STATS_SAMPLE_INTERVAL = float(os.getenv('STATS_SAMPLE_INTERVAL', '1.0'))  # seconds
+        
+        # Record sampled stats into data/metrics_history.bin for range queries
+        self.METRICS_HISTORY = os.getenv('METRICS_HISTORY', 'true').lower() == 'true'
+        
         # Paths
-        self.PROJECT_ROOT = Path(__file__).parent.parent
+        self.PROJECT_ROOT = PROJECT_ROOT
         self.LOGS_DIR = self.PROJECT_ROOT / 'logs'
-        self.DATA_DIR = self.PROJECT_ROOT / 'data'
+        self.DATA_DIR = DATA_DIR
         
         # Create directories if they don't exist
         self.LOGS_DIR.mkdir(exist_ok=True)
         self.DATA_DIR.mkdir(exist_ok=True)
         
-        # Validate API key
-        if not self.GEMINI_API_KEY:
+        # Action plugins: *.py files in PLUGIN_DIR, plus plugins of installed packages (goku.actions entry points)
+        self.PLUGIN_DIR = Path(os.getenv('PLUGIN_DIR', str(self.PROJECT_ROOT / 'plugins')))
+        self.PLUGIN_ENTRY_POINTS = os.getenv('PLUGIN_ENTRY_POINTS', 'true').lower() == 'true'
+        
+        self.LLM_RECORDINGS = Path(os.getenv('LLM_RECORDINGS', str(self.DATA_DIR / 'llm_recordings.jsonl')))
+        
+        # Validate API key (the stub and replay backends work offline)
+        if not self.GEMINI_API_KEY and self.LLM_BACKEND in ('gemini', 'record'):
             raise ValueError(
                 "GEMINI_API_KEY not found in .env file. "
                 "Please create a .env file with your API key."
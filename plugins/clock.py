@@ -0,0 +1,31 @@
+"""
+Clock Plugin
+Answers "what time is it" and "what's the date" from the system clock,
+which Gemini can't know on its own
+
+Imported the first time one of its actions runs (see src/actions.py).
+"""
+
+from datetime import datetime
+
+ACTIONS = {
+    "TELL_TIME": {
+        "description": "Say the current time",
+        "handler": "tell_time",
+    },
+    "TELL_DATE": {
+        "description": "Say today's date and weekday",
+        "handler": "tell_date",
+    },
+}
+
+
+def tell_time(executor, params):
+    now = datetime.now()
+    hour = now.hour % 12 or 12
+    return {"success": True, "message": f"It's {hour}:{now:%M} {'AM' if now.hour < 12 else 'PM'}"}
+
+
+def tell_date(executor, params):
+    now = datetime.now()
+    return {"success": True, "message": f"Today is {now:%A}, {now:%B} {now.day}, {now.year}"}
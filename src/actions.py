@@ -0,0 +1,282 @@
+"""
+Actions Module
+Registry of the actions plans can contain: what the prompt tells Gemini
+about each one and which handler runs it
+
+Built-in actions are methods of CommandExecutor. More come from plugins:
+Python files in the plugin directory, or modules that installed packages
+list under the "goku.actions" entry point group. A plugin declares its
+actions in a module-level ACTIONS dict of plain literals:
+
+    ACTIONS = {
+        "TELL_TIME": {
+            "description": "Say the current time",
+            "parameters": {},           # example for the prompt
+            "handler": "tell_time",     # function(executor, params) -> result dict
+        },
+    }
+
+The dict is read from the source without running it, so plugins cost a
+file parse at startup and are imported only when one of their actions is
+first executed. The action section of both prompt styles is generated
+from the registry, so Gemini is offered exactly the actions that can run.
+"""
+
+import ast
+import importlib
+import importlib.util
+import json
+import sys
+import threading
+from pathlib import Path
+
+ENTRY_POINT_GROUP = "goku.actions"
+
+# Catch-alls, listed after every other action including plugin ones
+FALLBACK_ACTIONS = ("CONVERSATION", "UNKNOWN")
+
+# Width the compact prompt's action list is wrapped at
+COMPACT_WIDTH = 80
+
+
+class ActionSpec:
+    def __init__(self, name, description, parameters=None, signature=None, handler=None, source=None):
+        """
+        Args:
+            name: Action name, e.g. "OPEN_APP"
+            description: What the action does, for the prompt
+            parameters: Example parameters for the full prompt, a dict or
+                        the text as written there (None: takes none)
+            signature: Parameters for the compact prompt, e.g.
+                       "{query, since, until}", defaults to the keys of
+                       parameters
+            handler: CommandExecutor method name for built-ins, function
+                     name in the plugin module otherwise
+            source: Plugin file or module name, None for built-ins
+        """
+        self.name = name
+        self.description = description
+        if isinstance(parameters, dict):
+            signature = signature or "{" + ", ".join(parameters) + "}"
+            parameters = json.dumps(parameters, ensure_ascii=False) if parameters else None
+        self.parameters = parameters
+        self.signature = signature or "{}"
+        self.handler = handler
+        self.source = source
+
+    @property
+    def builtin(self):
+        return self.source is None
+
+
+BUILTIN_ACTIONS = [
+    ActionSpec("OPEN_BROWSER", "Open default browser", handler="_open_browser"),
+    ActionSpec("SEARCH_WEB", "Search Google", '{"query": "search term"}', "{query}", "_search_web"),
+    ActionSpec("OPEN_APP", "Launch an application", '{"app_name": "chrome"/"notepad"/"calculator"}',
+               "{app_name}", "_open_app"),
+    ActionSpec("OPEN_WEBSITE", "Open specific URL", '{"url": "https://example.com"}', "{url}", "_open_website"),
+    ActionSpec("PLAY_YOUTUBE", "Play video on YouTube", '{"query": "video search term"}', "{query}",
+               "_play_youtube"),
+    ActionSpec("PLAY_MUSIC", "Play music on YouTube Music", '{"query": "song name"}', "{query}", "_play_music"),
+    ActionSpec("SYSTEM_STATS", "Show CPU/GPU/RAM/Storage stats", handler="_system_stats"),
+    ActionSpec("SYSTEM_HISTORY", "Summarize past CPU/RAM/disk usage (averages, peaks)",
+               '{"metric": "cpu"/"memory"/"disk", "minutes": 60}', "{metric: cpu/memory/disk, minutes}",
+               "_system_history"),
+    ActionSpec("CREATE_FOLDER", "Create a directory", '{"path": "folder_name"}', "{path}", "_create_folder"),
+    ActionSpec("CREATE_FILE", "Create a file", '{"path": "file_name.txt", "content": "optional content"}',
+               "{path, content}", "_create_file"),
+    ActionSpec("OPEN_FILE", "Open a file in default app", '{"path": "file_name.txt"}', "{path}", "_open_file"),
+    ActionSpec("TAKE_NOTE", "Save a note", '{"note": "note text"}', "{note}", "_take_note"),
+    ActionSpec("READ_NOTES", "Read back the latest notes",
+               '{"count": 3}, optionally "since"/"until" as for SEARCH_NOTES', "{count, since, until}",
+               "_read_notes"),
+    ActionSpec("SEARCH_NOTES", "Find notes by keyword and/or date",
+               '{"query": "keywords"}, optionally "since"/"until": days ago (0 today, 1 yesterday) '
+               'or a YYYY-MM-DD date',
+               "{query, since, until} (days ago or YYYY-MM-DD)", "_search_notes"),
+    ActionSpec("CONVERSATION", "Just chatting/asking questions", signature="{} (chat/questions)",
+               handler="_conversation"),
+    ActionSpec("UNKNOWN", "Cannot determine action", handler="_unknown"),
+]
+
+
+def read_manifest(path):
+    """
+    The ACTIONS literal of a plugin file, without importing it
+
+    Args:
+        path: Plugin source file
+
+    Returns:
+        dict: Action name -> declaration, empty if there is none
+
+    Raises:
+        OSError, SyntaxError, ValueError for unreadable or malformed files
+    """
+    tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == "ACTIONS"):
+            actions = ast.literal_eval(node.value)
+            if not isinstance(actions, dict):
+                raise ValueError("ACTIONS must be a dict")
+            return actions
+    return {}
+
+
+class ActionRegistry:
+    def __init__(self, plugin_dirs=(), entry_points=False, builtins=BUILTIN_ACTIONS):
+        """
+        Args:
+            plugin_dirs: Directories whose *.py files are plugins
+            entry_points: Also look for plugins of installed packages
+                          (the "goku.actions" entry point group)
+            builtins: ActionSpecs handled by CommandExecutor itself
+        """
+        self.specs = {spec.name: spec for spec in builtins}
+        self.lock = threading.Lock()
+        self.functions = {}  # action name -> plugin handler, once imported
+        self.modules = {}  # plugin source -> imported module
+        for directory in plugin_dirs:
+            self.discover_dir(directory)
+        if entry_points:
+            self.discover_entry_points()
+
+    def discover_dir(self, directory):
+        """Register the actions of every plugin file in directory"""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return
+        for path in sorted(directory.glob("*.py")):
+            if not path.name.startswith("_"):
+                self._register(path, path)
+
+    def discover_entry_points(self, group=ENTRY_POINT_GROUP):
+        """
+        Register the actions of plugin modules installed packages declare,
+        e.g. in pyproject.toml:
+
+            [project.entry-points."goku.actions"]
+            weather = "goku_weather"
+        """
+        from importlib.metadata import entry_points
+        try:
+            found = entry_points(group=group)
+        except TypeError:
+            # Python < 3.10
+            found = entry_points().get(group, [])
+        for entry_point in found:
+            module = entry_point.value.split(":")[0].strip()
+            try:
+                # Locating a module imports its parent packages, not the module
+                spec = importlib.util.find_spec(module)
+            except (ImportError, ValueError) as e:
+                print(f"Could not find action plugin {module}: {e}")
+                continue
+            if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+                print(f"Could not find the source of action plugin {module}")
+                continue
+            self._register(Path(spec.origin), module)
+
+    def _register(self, path, source):
+        try:
+            declared = read_manifest(path)
+        except (OSError, SyntaxError, ValueError) as e:
+            print(f"Skipping action plugin {path}: {e}")
+            return
+        for name, declaration in declared.items():
+            if not isinstance(declaration, dict) or not declaration.get("handler"):
+                print(f"Skipping action {name} in {path}: it needs a handler")
+                continue
+            if name in self.specs and self.specs[name].builtin:
+                print(f"Action plugin {path} replaces the built-in {name}")
+            self.specs[name] = ActionSpec(
+                name,
+                declaration.get("description", name.lower().replace("_", " ")),
+                declaration.get("parameters") or None,
+                declaration.get("signature"),
+                declaration["handler"],
+                source,
+            )
+
+    def get(self, name):
+        """The ActionSpec of an action, None if there is no such action"""
+        return self.specs.get(name)
+
+    def names(self):
+        return list(self.specs)
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def __len__(self):
+        return len(self.specs)
+
+    def load(self, name):
+        """
+        The handler function of a plugin action, importing its plugin the
+        first time
+
+        Returns:
+            callable: function(executor, params) -> result dict
+
+        Raises:
+            KeyError for an unknown or built-in action, or whatever
+            importing the plugin raises
+        """
+        function = self.functions.get(name)
+        if function is not None:
+            return function
+        spec = self.specs[name]
+        if spec.builtin:
+            raise KeyError(f"{name} is handled by CommandExecutor")
+        with self.lock:
+            module = self.modules.get(spec.source)
+            if module is None:
+                module = self._import(spec.source)
+                self.modules[spec.source] = module
+            function = getattr(module, spec.handler)
+            self.functions[name] = function
+        return function
+
+    @staticmethod
+    def _import(source):
+        if isinstance(source, str):
+            return importlib.import_module(source)
+        name = f"goku_plugins.{source.stem}"
+        module_spec = importlib.util.spec_from_file_location(name, source)
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules[name] = module
+        try:
+            module_spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        return module
+
+    def prompt_section(self, compact=False):
+        """
+        The action part of the system instruction
+
+        Args:
+            compact: The one-line-per-few-actions list of the compact
+                     prompt instead of descriptions and examples
+
+        Returns:
+            str: Text listing every registered action
+        """
+        specs = sorted(self.specs.values(), key=lambda spec: spec.name in FALLBACK_ACTIONS)
+        if compact:
+            lines, line = [], ""
+            for spec in specs:
+                entry = f"{spec.name} {spec.signature}"
+                if line and len(line) + len(entry) + 3 > COMPACT_WIDTH:
+                    lines.append(line + " |")
+                    line = entry
+                else:
+                    line = f"{line} | {entry}" if line else entry
+            lines.append(line)
+            return "ACTION {parameters}:\n" + "\n".join(lines)
+        listing = "\n".join(f"- {spec.name}: {spec.description}" for spec in specs)
+        examples = "\n".join(f"- For {spec.name}: {spec.parameters}" for spec in specs if spec.parameters)
+        return f"Available PRIMARY_ACTION_TYPES:\n{listing}\n\nParameter examples:\n{examples}"
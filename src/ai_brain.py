@@ -3,15 +3,53 @@ AI Brain Module
 Uses Google Gemini AI to understand commands and generate execution plans
 """
 
-import google.generativeai as genai
 import json
+import re
+import time
+from actions import ActionRegistry
+from json_stream import StreamingJSONParser
+from llm_backends import GeminiBackend
+from resilience import BackendTimeout, CircuitOpen
+from usage_tracker import UsageTracker
+
+# Sentence boundary inside a partially received response
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+PROMPT_STYLES = ("legacy", "full", "compact")
+
+CHAT_INSTRUCTION = "You are Goku, a helpful Windows voice assistant. Respond naturally and briefly."
 
 class AIBrain:
-    def __init__(self, api_key):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+    def __init__(self, api_key=None, cache=None, backend=None, prompt_style="full", usage=None, memory=None,
+                 actions=None):
+        """
+        Args:
+            api_key: Gemini API key, used when no backend is given
+            cache: Optional ResponseCache for repeated commands
+            backend: Optional LLMBackend (stub, record/replay, ...),
+                     defaults to Gemini
+            prompt_style: "full" or "compact" system instruction sent
+                          separately from the command, or "legacy" to
+                          prepend the full instructions to every prompt
+            usage: Optional UsageTracker for token counts and latency
+            memory: Optional ConversationMemory sent with every request,
+                    so follow-ups can refer to earlier commands
+            actions: ActionRegistry the prompts list the actions of, the
+                     same one the executor runs them with; defaults to
+                     the built-in actions
+        """
+        if prompt_style not in PROMPT_STYLES:
+            raise ValueError(f"Unknown prompt style: {prompt_style}")
         
-        # System prompt to guide AI behavior
+        self.backend = backend or GeminiBackend(api_key)
+        self.cache = cache
+        self.prompt_style = prompt_style
+        self.usage = usage or UsageTracker()
+        self.memory = memory
+        self.actions = actions or ActionRegistry()
+        self.last_used = time.monotonic()  # last request or warm-up, for keep-alive
+        
+        # System prompt to guide AI behavior (the action list comes from the registry)
         self.system_context = """You are Goku, a Windows voice assistant. Your job is to understand user commands and generate structured execution plans.
 
 Analyze the user's command and respond with ONLY a JSON object in this format:
@@ -24,50 +62,274 @@ Analyze the user's command and respond with ONLY a JSON object in this format:
     "response": "Natural language response to speak to user"
 }
 
-Available PRIMARY_ACTION_TYPES:
-- OPEN_BROWSER: Open default browser
-- SEARCH_WEB: Search Google
-- OPEN_APP: Launch an application
-- OPEN_WEBSITE: Open specific URL
-- PLAY_YOUTUBE: Play video on YouTube
-- PLAY_MUSIC: Play music on YouTube Music
-- SYSTEM_STATS: Show CPU/GPU/RAM/Storage stats
-- CREATE_FOLDER: Create a directory
-- CREATE_FILE: Create a file
-- OPEN_FILE: Open a file in default app
-- TAKE_NOTE: Save a note
-- CONVERSATION: Just chatting/asking questions
-- UNKNOWN: Cannot determine action
+""" + self.actions.prompt_section() + """
 
-Parameter examples:
-- For SEARCH_WEB: {"query": "search term"}
-- For OPEN_APP: {"app_name": "chrome"/"notepad"/"calculator"}
-- For OPEN_WEBSITE: {"url": "https://example.com"}
-- For PLAY_YOUTUBE: {"query": "video search term"}
-- For PLAY_MUSIC: {"query": "song name"}
-- For CREATE_FOLDER: {"path": "folder_name"}
-- For CREATE_FILE: {"path": "file_name.txt", "content": "optional content"}
-- For TAKE_NOTE: {"note": "note text"}
+For several actions in one command, replace "action" and "parameters" with a list, e.g.
+"actions": [{"action": "CREATE_FOLDER", "parameters": {"path": "work"}}, {"action": "CREATE_FILE", "parameters": {"path": "work/todo.txt"}, "after": [1]}, {"action": "OPEN_APP", "parameters": {"app_name": "vscode"}}]
+"after" lists the numbers (from 1) of earlier actions that must finish first; actions without it run at the same time.
 
 Respond ONLY with valid JSON, no other text."""
+        
+        # Same contract in about a third of the tokens
+        self.compact_context = """You are Goku, a Windows voice assistant. Reply with ONLY a JSON object:
+{"intent": "...", "action": "ACTION", "parameters": {...}, "response": "text to speak"}
+""" + self.actions.prompt_section(compact=True) + """
+Several things at once: "actions": [{"action", "parameters", "after": [numbers of earlier actions it needs]}] instead of action/parameters"""
 
-    def process_command(self, command):
+    def process_command(self, command, remember=True, speculative=False):
         """
         Process user command using Gemini AI
         
         Args:
             command: User's voice command
+            remember: Add the exchange to the conversation memory
+            speculative: Plan a partial transcript that may be thrown away:
+                         nothing is remembered or cached, and the request
+                         is recorded as "plan_speculative" usage. Pass the
+                         plan to cache_plan() once it is used.
             
         Returns:
             dict: Structured command with intent, action, parameters, response
         """
+        cache = self._cache_for(command)
+        command_data = cache.get("plan", command) if cache else None
+        if not command_data:
+            command_data = self._generate_plan(command, "plan_speculative" if speculative else "plan")
+            if not speculative:
+                self.cache_plan(command, command_data)
+        
+        if remember and not speculative:
+            self.remember(command, command_data)
+        return command_data
+    
+    def cache_plan(self, command, command_data):
+        """
+        Cache the plan of a command, e.g. a speculative one once it is used
+        
+        Args:
+            command: User's voice command
+            command_data: Plan dict from process_command
+        """
+        cache = self._cache_for(command)
+        # Error fallbacks are UNKNOWN and must not be cached
+        if not cache or command_data.get("action") == "UNKNOWN":
+            return
+        cache.put(
+            "plan", command, command_data,
+            conversational=command_data.get("action") == "CONVERSATION"
+        )
+    
+    def remember(self, command, reply):
+        """
+        Add an exchange to the conversation memory, e.g. a command that was
+        matched locally and never reached the AI
+        
+        Args:
+            command: User's voice command
+            reply: The plan dict acted on, or a chat answer
+        """
+        if self.memory is None or not reply:
+            return
+        if isinstance(reply, dict) and reply.get("intent") == "error":
+            return  # Nothing happened worth referring back to
+        self.memory.add(command, reply)
+    
+    def _cache_for(self, command):
+        """The response cache, unless command refers back to earlier turns"""
+        if self.memory is not None and self.memory.refers_back(command):
+            return None  # "open it again" means something else every time
+        return self.cache
+    
+    def process_command_stream(self, command, on_action=None, on_sentence=None, remember=True):
+        """
+        Process user command with a streamed Gemini reply
+        
+        The reply is parsed as it arrives. on_action is called once, as soon
+        as "action" and "parameters" are complete, and on_sentence with each
+        finished sentence of "response" while the rest is still streaming.
+        Both are also called for cache hits and error fallbacks, so callers
+        can rely on them alone.
+        
+        Args:
+            command: User's voice command
+            on_action: Callback taking the command dict (response may be missing)
+            on_sentence: Callback taking one sentence of the response text
+            remember: Add the exchange to the conversation memory
+            
+        Returns:
+            dict: The complete command, same as process_command
+        """
+        on_action = on_action or (lambda command_data: None)
+        on_sentence = on_sentence or (lambda sentence: None)
+        
+        cache = self._cache_for(command)
+        if cache:
+            cached = cache.get("plan", command)
+            if cached:
+                on_action(cached)
+                self._emit_sentences(cached.get("response", ""), 0, on_sentence, final=True)
+                if remember:
+                    self.remember(command, cached)
+                return cached
+        
+        parser = StreamingJSONParser()
+        action_sent = False
+        spoken = 0  # characters of "response" already passed to on_sentence
+        command_data = None
+        error = None
+        
+        try:
+            for chunk in self._stream("plan_stream", self._build_prompt(command), self._system_instruction()):
+                parser.feed(chunk)
+                
+                # A single action with its parameters, or the list of actions
+                fields = parser.fields
+                if not action_sent and (("action" in fields and "parameters" in fields) or "actions" in fields):
+                    action_sent = True
+                    on_action(dict(parser.fields))
+                
+                spoken = self._emit_sentences(
+                    parser.partial_string("response"), spoken, on_sentence,
+                    final="response" in parser.fields
+                )
+            
+            if parser.done and ("action" in parser.fields or "actions" in parser.fields):
+                command_data = dict(parser.fields)
+                if "actions" not in command_data:
+                    command_data.setdefault("parameters", {})
+            else:
+                print("JSON parsing error: incomplete streamed response")
+        except Exception as e:
+            print(f"AI processing error: {e}")
+            error = e
+        
+        if command_data is None:
+            command_data = self._fallback_plan(understood=error is None, error=error)
+            if not action_sent:
+                self._emit_sentences(command_data["response"], 0, on_sentence, final=True)
+        else:
+            self.cache_plan(command, command_data)
+        
+        if not action_sent:
+            on_action(command_data)
+        
+        if remember:
+            self.remember(command, command_data)
+        return command_data
+    
+    def _emit_sentences(self, text, spoken, on_sentence, final=False):
+        """
+        Pass complete sentences of text after offset spoken to on_sentence
+        
+        Returns:
+            int: New offset of the first character not yet emitted
+        """
+        if not text:
+            return spoken
+        
+        pending = text[spoken:]
+        if final:
+            complete, spoken = pending, len(text)
+        else:
+            boundaries = list(SENTENCE_END.finditer(pending))
+            if not boundaries:
+                return spoken
+            complete, spoken = pending[:boundaries[-1].start()], spoken + boundaries[-1].end()
+        
+        for sentence in SENTENCE_END.split(complete):
+            if sentence.strip():
+                on_sentence(sentence.strip())
+        return spoken
+    
+    def _fallback_plan(self, understood, error=None):
+        """Command returned when the AI reply is unusable or didn't come"""
+        if isinstance(error, (CircuitOpen, BackendTimeout)):
+            # Local matches still work, say so instead of a generic error
+            outage = isinstance(error, CircuitOpen)
+            return {
+                "intent": "error",
+                "action": "UNKNOWN",
+                "parameters": {},
+                "response": "I can't reach my AI right now, but simple commands like open notepad still work."
+                            if outage else "That took too long to answer. Please try again."
+            }
+        if understood:
+            return {
+                "intent": "unknown",
+                "action": "UNKNOWN",
+                "parameters": {},
+                "response": "I didn't quite understand that. Could you rephrase?"
+            }
+        return {
+            "intent": "error",
+            "action": "UNKNOWN",
+            "parameters": {},
+            "response": "I encountered an error processing your request."
+        }
+    
+    def warm(self):
+        """
+        Get the backend's connection ready for a request expected soon
+        
+        Returns:
+            bool: False if that failed (the request will connect itself)
+        """
+        self.last_used = time.monotonic()
+        try:
+            self.backend.warm(self._system_instruction())
+            return True
+        except Exception:
+            return False
+    
+    def _system_instruction(self):
+        if self.prompt_style == "legacy":
+            return None
+        if self.prompt_style == "compact":
+            return self.compact_context
+        return self.system_context
+    
+    def _build_prompt(self, command):
+        # The conversation goes after the instructions so they stay a
+        # cacheable prefix
+        context = self._context()
+        if self.prompt_style == "legacy":
+            # Instructions re-sent inside every prompt
+            return f"{self.system_context}\n\n{context}User command: {command}\n\nRespond with JSON:"
+        return f"{context}User command: {command}\n\nRespond with JSON:"
+    
+    def _context(self):
+        """The remembered conversation, ending in a blank line, or nothing"""
+        context = self.memory.context() if self.memory is not None else ""
+        return f"{context}\n\n" if context else ""
+    
+    def _generate(self, kind, prompt, system):
+        """Call the backend, recording tokens and latency"""
+        usage = {}
+        start = time.perf_counter()
+        self.last_used = time.monotonic()
+        try:
+            return self.backend.generate(prompt, system, usage)
+        finally:
+            self.usage.record(kind, usage, time.perf_counter() - start)
+    
+    def _stream(self, kind, prompt, system):
+        """Stream from the backend, recording tokens and latency at the end"""
+        usage = {}
+        start = time.perf_counter()
+        self.last_used = time.monotonic()
+        try:
+            yield from self.backend.stream(prompt, system, usage)
+        finally:
+            self.usage.record(kind, usage, time.perf_counter() - start)
+    
+    def _generate_plan(self, command, kind="plan"):
+        """Ask Gemini for the execution plan of a command, recorded as kind"""
         try:
             # Create prompt
-            prompt = f"{self.system_context}\n\nUser command: {command}\n\nRespond with JSON:"
+            prompt = self._build_prompt(command)
             
             # Get AI response
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
+            response_text = self._generate(kind, prompt, self._system_instruction()).strip()
             
             # Clean response (remove markdown code blocks if present)
             if response_text.startswith("```"):
@@ -83,33 +345,37 @@ Respond ONLY with valid JSON, no other text."""
             
         except json.JSONDecodeError as e:
             print(f"JSON parsing error: {e}")
-            return {
-                "intent": "unknown",
-                "action": "UNKNOWN",
-                "parameters": {},
-                "response": "I didn't quite understand that. Could you rephrase?"
-            }
+            return self._fallback_plan(understood=True)
         except Exception as e:
             print(f"AI processing error: {e}")
-            return {
-                "intent": "error",
-                "action": "UNKNOWN",
-                "parameters": {},
-                "response": "I encountered an error processing your request."
-            }
+            return self._fallback_plan(understood=False, error=e)
     
-    def chat(self, message):
+    def chat(self, message, remember=True):
         """
         Simple chat without command structure
         
         Args:
             message: User's message
+            remember: Add the exchange to the conversation memory
             
         Returns:
             str: AI response
         """
-        try:
-            response = self.model.generate_content(f"You are Goku, a helpful Windows voice assistant. Respond naturally and briefly to: {message}")
-            return response.text
-        except Exception as e:
-            return f"Error: {e}"
\ No newline at end of file
+        cache = self._cache_for(message)
+        answer = cache.get("chat", message) if cache else None
+        if not answer:
+            context = self._context()
+            try:
+                if self.prompt_style == "legacy":
+                    answer = self._generate("chat", f"You are Goku, a helpful Windows voice assistant. {context}Respond naturally and briefly to: {message}", None)
+                else:
+                    answer = self._generate("chat", f"{context}{message}", CHAT_INSTRUCTION)
+            except Exception as e:
+                return f"Error: {e}"
+            
+            if cache:
+                cache.put("chat", message, answer, conversational=True)
+        
+        if remember:
+            self.remember(message, answer)
+        return answer
\ No newline at end of file
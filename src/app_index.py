@@ -0,0 +1,386 @@
+"""
+App Index Module
+Finds the application OPEN_APP names among PATH executables, desktop entries
+(.desktop files on Linux, Start Menu shortcuts on Windows) and the built-in
+APP_PATHS, with aliases, prefix and fuzzy matching
+
+The index is kept in a JSON file. A refresh only rescans directories whose
+mtime changed since they were last read, and only re-parses the desktop
+entries that changed in them, so startup doesn't walk every directory.
+"""
+
+import bisect
+import difflib
+import json
+import os
+import re
+import shlex
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Spoken names of apps, keys are APP_PATHS names or executables
+APP_ALIASES = {
+    "notepad": ["note pad", "text editor"],
+    "calculator": ["calc", "the calculator"],
+    "paint": ["ms paint", "microsoft paint"],
+    "explorer": ["file explorer", "windows explorer", "my files", "files"],
+    "chrome": ["google chrome", "chrome browser"],
+    "edge": ["microsoft edge", "edge browser"],
+    "firefox": ["mozilla firefox", "fire fox"],
+    "cmd": ["command prompt", "terminal", "the terminal"],
+    "powershell": ["power shell"],
+    "vscode": ["vs code", "visual studio code", "code editor", "v s code"],
+    "spotify": [],
+}
+
+CACHE_VERSION = 1
+FUZZY_CUTOFF = 0.8  # difflib ratio a misheard name needs to count
+REFRESH_INTERVAL = 5.0  # seconds between refreshes triggered by misses
+
+# Exec= field codes, see the Desktop Entry Specification
+_FIELD_CODE = re.compile(r"%[fFuUdDnNickvm]")
+_NOT_NAME = re.compile(r"[^\w\s+]")
+
+
+def _bigrams(key):
+    return {key[i:i + 2] for i in range(len(key) - 1)}
+
+
+def normalize(name):
+    """Spoken or file name -> index key: lowercase words, no extension"""
+    name = str(name).lower()
+    for suffix in (".exe", ".desktop", ".lnk"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return " ".join(_NOT_NAME.sub(" ", name.replace("_", " ")).split())
+
+
+def default_path_dirs():
+    return [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+
+
+def default_desktop_dirs():
+    """Where desktop entries live on this platform"""
+    if os.name == "nt":
+        roots = [os.environ.get("APPDATA"), os.environ.get("PROGRAMDATA")]
+        return [str(Path(root) / "Microsoft" / "Windows" / "Start Menu" / "Programs") for root in roots if root]
+    data_home = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    dirs = [str(Path(d) / "applications") for d in [data_home] + data_dirs if d]
+    dirs += [
+        str(Path(data_home) / "flatpak" / "exports" / "share" / "applications"),
+        "/var/lib/flatpak/exports/share/applications",
+        "/var/lib/snapd/desktop/applications",
+    ]
+    return list(dict.fromkeys(dirs))
+
+
+def parse_desktop_entry(path):
+    """
+    Read the launcher of a .desktop file
+
+    Returns:
+        dict: {"name", "command"} or None if it isn't a visible application
+    """
+    fields, section = {}, None
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    section = line
+                elif section == "[Desktop Entry]" and "=" in line:
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if (fields.get("Type", "Application") != "Application" or "Exec" not in fields
+            or fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true"):
+        return None
+    try:
+        command = shlex.split(_FIELD_CODE.sub("", fields["Exec"]).replace("%%", "%"))
+    except ValueError:
+        return None
+    if not command:
+        return None
+    return {"name": fields.get("Name") or Path(path).stem, "command": command}
+
+
+class AppIndex:
+    def __init__(self, cache_file=None, builtins=None, aliases=None, path_dirs=None, desktop_dirs=None):
+        """
+        Args:
+            cache_file: JSON file the index is kept in, None keeps it in
+                        memory only
+            builtins: Name -> command of known apps (APP_PATHS), used when
+                      nothing else on this machine has that name
+            aliases: Name -> spoken aliases (APP_ALIASES)
+            path_dirs: Directories of executables, defaults to PATH
+            desktop_dirs: Directories searched (recursively) for .desktop
+                          files or Start Menu shortcuts
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.builtins = dict(builtins or {})
+        self.aliases = aliases if aliases is not None else APP_ALIASES
+        self.path_dirs = default_path_dirs() if path_dirs is None else list(path_dirs)
+        self.desktop_dirs = default_desktop_dirs() if desktop_dirs is None else list(desktop_dirs)
+        self.path_exts = None
+        if os.name == "nt":
+            self.path_exts = {ext.lower() for ext in os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(";") if ext}
+
+        # directory -> {"mtime", "kind", "entries"}, plus "subdirs" for desktop ones
+        self.dirs = {}
+        self.lock = threading.Lock()
+        self.refreshed_at = 0.0
+        self.stats = {"scanned": 0, "reused": 0, "parsed": 0}
+        self._load()
+        self.refresh()
+
+    def _load(self):
+        if self.cache_file is None or not self.cache_file.exists():
+            return
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            if data.get("version") == CACHE_VERSION:
+                self.dirs = data["dirs"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load app index: {e}")
+
+    def save(self):
+        """Write the index to disk atomically"""
+        if self.cache_file is None:
+            return
+        with self.lock:
+            data = json.dumps({"version": CACHE_VERSION, "dirs": self.dirs})
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(".tmp")
+            tmp_file.write_text(data, encoding="utf-8")
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Could not save app index: {e}")
+
+    def refresh(self):
+        """
+        Rescan the directories that changed since the last refresh and
+        rebuild the lookup tables
+
+        Returns:
+            dict: Directories scanned and reused, desktop entries parsed
+        """
+        stats = {"scanned": 0, "reused": 0, "parsed": 0}
+        dirs = {}
+        for directory in self.path_dirs:
+            self._refresh_dir(directory, "path", dirs, stats)
+        pending = list(reversed(self.desktop_dirs))
+        while pending:
+            # Subdirectories are listed with their parent, so an unchanged
+            # tree costs one stat per directory
+            info = self._refresh_dir(pending.pop(), "desktop", dirs, stats)
+            if info is not None:
+                pending.extend(reversed(info["subdirs"]))
+
+        changed = stats["scanned"] > 0 or set(dirs) != set(self.dirs)
+        with self.lock:
+            self.dirs = dirs
+            self._build_tables()
+            self.refreshed_at = time.monotonic()
+            self.stats = stats
+        if changed:
+            self.save()
+        return stats
+
+    def _refresh_dir(self, directory, kind, dirs, stats):
+        """The directory's entry in dirs, reused if its mtime is unchanged"""
+        if directory in dirs:
+            return None  # listed twice, e.g. in PATH
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return None
+        cached = self.dirs.get(directory)
+        if cached is not None and cached["mtime"] == mtime and cached["kind"] == kind:
+            stats["reused"] += 1
+        else:
+            stats["scanned"] += 1
+            if kind == "path":
+                cached = {"mtime": mtime, "kind": kind, "entries": self._scan_executables(directory)}
+            else:
+                previous = cached["entries"] if cached and cached["kind"] == kind else {}
+                entries, subdirs = self._scan_desktop(directory, previous, stats)
+                cached = {"mtime": mtime, "kind": kind, "entries": entries, "subdirs": subdirs}
+        dirs[directory] = cached
+        return cached
+
+    def _scan_executables(self, directory):
+        """Executable name -> path"""
+        entries = {}
+        try:
+            with os.scandir(directory) as scan:
+                for item in scan:
+                    if self.path_exts is not None:
+                        stem, ext = os.path.splitext(item.name)
+                        if ext.lower() not in self.path_exts:
+                            continue
+                    else:
+                        stem = item.name
+                    try:
+                        if item.is_file() and (self.path_exts is not None or os.access(item.path, os.X_OK)):
+                            # Earlier PATH directories win, like the shell
+                            entries.setdefault(stem, item.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return entries
+
+    def _scan_desktop(self, directory, previous, stats):
+        """
+        Returns:
+            tuple: (file name -> [mtime, {"name", "command"} or None],
+                    subdirectory paths), unchanged files are reused
+        """
+        entries, subdirs = {}, []
+        shortcut = ".lnk" if os.name == "nt" else None
+        try:
+            with os.scandir(directory) as scan:
+                for item in scan:
+                    if item.is_dir():
+                        subdirs.append(item.path)
+                        continue
+                    if not item.name.endswith(shortcut or ".desktop"):
+                        continue
+                    try:
+                        mtime = item.stat().st_mtime
+                    except OSError:
+                        continue
+                    if item.name in previous and previous[item.name][0] == mtime:
+                        entries[item.name] = previous[item.name]
+                        continue
+                    stats["parsed"] += 1
+                    if shortcut:
+                        # Start Menu shortcuts open through the shell
+                        entry = {"name": item.name[:-len(shortcut)], "command": None, "shortcut": item.path}
+                    else:
+                        entry = parse_desktop_entry(item.path)
+                    entries[item.name] = [mtime, entry]
+        except OSError:
+            pass
+        return entries, sorted(subdirs)
+
+    def _build_tables(self):
+        """Lookup tables from the scanned directories (holding the lock)"""
+        exact = {}  # key -> app, PATH executables and desktop entries by file name
+        apps = {}  # key -> app, the names people say: desktop names, builtins, aliases
+
+        for directory in reversed(self.path_dirs):
+            for name, path in self.dirs.get(directory, {}).get("entries", {}).items():
+                exact[normalize(name)] = {"name": name, "command": [path]}
+        for key, command in self.builtins.items():
+            # The executable found on PATH, as is only where the shell may know it
+            found = exact.get(normalize(os.path.basename(command)))
+            if found is None and os.name != "nt":
+                continue
+            app = {"name": key, "command": found["command"] if found else [command]}
+            exact.setdefault(normalize(key), app)
+            apps[normalize(key)] = app
+        for directory, info in self.dirs.items():
+            if info["kind"] != "desktop":
+                continue
+            for file_name, (_, entry) in info["entries"].items():
+                if entry is not None:
+                    exact.setdefault(normalize(file_name), entry)
+                    apps[normalize(entry["name"])] = entry
+                    if entry["command"]:
+                        # "thunderbird" for "Thunderbird Mail"
+                        apps.setdefault(normalize(os.path.basename(entry["command"][0])), entry)
+
+        for key, spoken in self.aliases.items():
+            target = apps.get(normalize(key)) or exact.get(normalize(key))
+            if target is None:
+                continue
+            for alias in [key] + list(spoken):
+                apps.setdefault(normalize(alias), target)
+
+        # Run-together forms ("vs code" -> "vscode") of everything people say
+        for key, app in list(apps.items()):
+            apps.setdefault(key.replace(" ", ""), app)
+        for key, app in apps.items():
+            exact.setdefault(key, app)
+        self.exact = exact
+        self.apps = apps
+        self.app_keys = sorted(apps)
+        self.grams = {}  # bigram -> app keys containing it, narrows fuzzy matching
+        for app_key in self.app_keys:
+            for gram in _bigrams(app_key):
+                self.grams.setdefault(gram, []).append(app_key)
+
+    def resolve(self, name, refresh=True, fuzzy=True):
+        """
+        Find an application by a spoken name
+
+        Tries the exact name or an alias, then the only app name that starts
+        with it, then a close match (a misheard name). On a miss the index
+        is refreshed (at most every few seconds) in case it was just
+        installed.
+
+        Args:
+            name: e.g. "firefox", "Visual Studio Code", "fire"
+            refresh: Refresh the index on a miss
+            fuzzy: Also try prefixes and close matches, not just exact
+                   names and aliases
+
+        Returns:
+            dict: {"name", "command"} (or "shortcut" to open through the
+                  shell on Windows), or None
+        """
+        key = normalize(name)
+        if not key:
+            return None
+        app = self._lookup(key, fuzzy)
+        if app is None and refresh and time.monotonic() - self.refreshed_at > REFRESH_INTERVAL:
+            self.refresh()
+            app = self._lookup(key, fuzzy)
+        return app
+
+    def _lookup(self, key, fuzzy):
+        with self.lock:
+            app = self.exact.get(key) or self.exact.get(key.replace(" ", ""))
+            if app is not None or not fuzzy:
+                return app
+
+            # The one app name this starts, e.g. "fire" -> "firefox"
+            start = bisect.bisect_left(self.app_keys, key)
+            end = bisect.bisect_left(self.app_keys, key + "\uffff", start)
+            candidates = {id(self.apps[app_key]): self.apps[app_key] for app_key in self.app_keys[start:end]}
+            if len(candidates) == 1:
+                return next(iter(candidates.values()))
+
+            # A close match shares most bigrams, only those are compared
+            grams = _bigrams(key)
+            shared = Counter(app_key for gram in grams for app_key in self.grams.get(gram, ()))
+            candidates = [app_key for app_key, count in shared.items() if count * 2 >= len(grams)]
+            close = difflib.get_close_matches(key, candidates, n=1, cutoff=FUZZY_CUTOFF)
+            return self.apps[close[0]] if close else None
+
+    def __len__(self):
+        with self.lock:
+            return len(self.exact)
+
+
+def main():
+    """Print what names resolve to: python src/app_index.py firefox "vs code" ..."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from command_executor import APP_PATHS
+
+    index = AppIndex(builtins=APP_PATHS)
+    print(f"{len(index)} names, {index.stats}")
+    for name in sys.argv[1:]:
+        print(f"{name!r} -> {index.resolve(name, refresh=False)}")
+
+
+if __name__ == "__main__":
+    main()
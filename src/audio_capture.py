@@ -0,0 +1,213 @@
+"""
+Audio Capture Module
+Always-on microphone capture into a fixed-size ring buffer
+
+The device is opened once and a background thread keeps writing frames into
+a preallocated buffer. Listening reads from that buffer, so it starts without
+reopening the device and can include a little audio from before activation.
+"""
+
+import threading
+import time
+import speech_recognition as sr
+
+
+class AudioRingBuffer:
+    """Fixed-size byte ring addressed by absolute stream position"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = bytearray(capacity)
+        self.view = memoryview(self.data)
+        self.written = 0  # bytes written since the start, never wraps
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def write(self, frames):
+        frames = memoryview(frames)
+        with self.condition:
+            total = len(frames)
+            if total > self.capacity:
+                # Only the newest capacity bytes can be kept anyway
+                self.written += total - self.capacity
+                frames = frames[total - self.capacity:]
+            start = self.written % self.capacity
+            first = min(len(frames), self.capacity - start)
+            self.view[start:start + first] = frames[:first]
+            self.view[:len(frames) - first] = frames[first:]
+            self.written += len(frames)
+            self.condition.notify_all()
+
+    def oldest(self):
+        """Position of the oldest byte still held"""
+        return max(0, self.written - self.capacity)
+
+    def read(self, position, size, timeout=None):
+        """
+        Copy bytes out of the ring, waiting for them to be captured
+
+        Args:
+            position: Stream position to start at, moved up to oldest() if
+                      that audio has already been overwritten
+            size: Bytes wanted
+            timeout: Seconds to wait for the bytes, returns what there is
+
+        Returns:
+            tuple: (bytes, position after them), empty once closed
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.written >= position + size or self.closed, timeout)
+            position = max(position, self.oldest())
+            end = min(position + size, self.written)
+            if end <= position:
+                return b"", position
+
+            chunk = bytearray(end - position)
+            start = position % self.capacity
+            first = min(len(chunk), self.capacity - start)
+            chunk[:first] = self.view[start:start + first]
+            chunk[first:] = self.view[:len(chunk) - first]
+            return bytes(chunk), end
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class RingSource(sr.AudioSource):
+    """
+    AudioSource that replays the capture ring from a position onward and
+    then follows live audio, optionally jumping over one span (our own
+    prompt playing through the speakers)
+    """
+
+    def __init__(self, capture, position, skip=None):
+        self.capture = capture
+        self.SAMPLE_RATE = capture.sample_rate
+        self.SAMPLE_WIDTH = capture.sample_width
+        self.CHUNK = capture.chunk
+        self.position = position
+        self.skip = skip
+        self.stream = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def read(self, size):
+        if self.skip is not None:
+            skip_start, skip_end = self.skip
+            if self.position >= skip_start:
+                self.position = max(self.position, skip_end)
+                self.skip = None
+            else:
+                size = min(size, skip_start - self.position)
+        # A stalled device ends the phrase instead of hanging the listener
+        chunk, self.position = self.capture.ring.read(self.position, size, timeout=2.0)
+        return chunk
+
+
+class AudioCapture:
+    def __init__(self, source, buffer_seconds=5.0, on_audio=None):
+        """
+        Args:
+            source: AudioSource to keep open, usually sr.Microphone()
+            buffer_seconds: Audio kept in the ring; memory is
+                            buffer_seconds * sample rate * sample width
+            on_audio: Optional function (frames, sample rate, sample width)
+                      called on the capture thread with every chunk, must
+                      be quick
+        """
+        self.source = source
+        self.buffer_seconds = buffer_seconds
+        self.on_audio = on_audio
+        self.ring = None
+        self.sample_rate = None
+        self.sample_width = None
+        self.chunk = None
+        self.clock = (0, time.perf_counter())  # (position, time) of the last write
+        self.thread = None
+        self.opened = threading.Event()
+        self.stop_event = threading.Event()
+
+    def start(self, timeout=5.0):
+        """Open the device on the capture thread and wait until it runs"""
+        if self.thread is not None:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+        if not self.opened.wait(timeout):
+            raise RuntimeError("Audio device did not open")
+
+    def stop(self):
+        """Stop capturing and close the device"""
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout=2)
+        self.thread = None
+
+    def _capture_loop(self):
+        try:
+            with self.source as source:
+                self.sample_rate = source.SAMPLE_RATE
+                self.sample_width = source.SAMPLE_WIDTH
+                self.chunk = source.CHUNK
+                # Microphone audio is mono, one sample per frame
+                capacity = int(self.buffer_seconds * self.sample_rate) * self.sample_width
+                self.ring = AudioRingBuffer(capacity)
+                self.clock = (0, time.perf_counter())
+                self.opened.set()
+
+                while not self.stop_event.is_set():
+                    frames = source.stream.read(source.CHUNK)
+                    if not frames:
+                        break  # File sources run out
+                    self.ring.write(frames)
+                    self.clock = (self.ring.written, time.perf_counter())
+                    if self.on_audio is not None:
+                        self.on_audio(frames, self.sample_rate, self.sample_width)
+        except Exception as e:
+            print(f"Audio capture error: {e}")
+        finally:
+            if self.ring is not None:
+                self.ring.close()
+            self.opened.set()
+
+    def position_at(self, moment):
+        """
+        Stream position of audio captured at a time.perf_counter() moment,
+        clamped to what the ring still holds
+        """
+        position, at = self.clock
+        offset = int((at - moment) * self.sample_rate) * self.sample_width
+        return max(self.ring.oldest(), min(position - offset, self.ring.written))
+
+    def reader(self, since, skip=None):
+        """
+        AudioSource reading from a moment onward
+
+        Args:
+            since: time.perf_counter() moment to start from (pre-roll)
+            skip: Optional (start, end) moments to leave out
+
+        Returns:
+            RingSource
+        """
+        if self.ring is None:
+            raise RuntimeError("Audio capture is not running")
+        start = self.position_at(since)
+        span = None
+        if skip is not None:
+            skip_start, skip_end = (self.position_at(moment) for moment in skip)
+            if skip_end > start:
+                span = (max(skip_start, start), skip_end)
+        return RingSource(self, start, span)
+
+    def memory_bytes(self):
+        """Size of the preallocated ring"""
+        return self.ring.capacity if self.ring else 0
@@ -5,64 +5,135 @@ Executes system commands based on AI-generated action plans
 
 import os
 import subprocess
+from functools import partial
+import time
 import webbrowser
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
 from pathlib import Path
+from actions import ActionRegistry
+from note_store import NoteStore
 from system_info import SystemInfo
 
+# Common Windows apps, also used by IntentMatcher for local OPEN_APP matching
+APP_PATHS = {
+    "notepad": "notepad.exe",
+    "calculator": "calc.exe",
+    "paint": "mspaint.exe",
+    "explorer": "explorer.exe",
+    "chrome": "chrome.exe",
+    "edge": "msedge.exe",
+    "firefox": "firefox.exe",
+    "cmd": "cmd.exe",
+    "powershell": "powershell.exe",
+    "vscode": "code.exe",
+    "spotify": "spotify.exe",
+}
+
+# Spoken names for SYSTEM_HISTORY metrics
+METRIC_NAMES = {"cpu": "CPU", "memory": "RAM", "disk": "disk usage"}
+
+# Notes READ_NOTES and SEARCH_NOTES read out at most
+SPOKEN_NOTES = 5
+
+def plan_steps(command_data):
+    """
+    The actions of a plan, one for a single-action plan
+    
+    Multi-action plans list them under "actions", each with its own action
+    and parameters, and "after": the step numbers (from 1) it waits for.
+    
+    Args:
+        command_data: Plan from AIBrain or IntentMatcher
+        
+    Returns:
+        list: Dicts with action, parameters and after (0-based indexes of
+              earlier steps only, so the steps can't wait on each other)
+    """
+    if "actions" not in command_data:
+        return [{
+            "action": command_data.get("action", "UNKNOWN"),
+            "parameters": command_data.get("parameters", {}),
+            "after": [],
+        }]
+    steps = []
+    for index, step in enumerate(command_data.get("actions") or []):
+        if not isinstance(step, dict):
+            step = {}
+        after = step.get("after") or []
+        if not isinstance(after, list):
+            after = [after]
+        steps.append({
+            "action": step.get("action", "UNKNOWN"),
+            "parameters": step.get("parameters") or {},
+            "after": sorted({n - 1 for n in after if isinstance(n, int) and 1 <= n <= index}),
+        })
+    return steps
+
+def _spoken(action):
+    """OPEN_APP -> open app"""
+    return str(action).lower().replace("_", " ")
+
+def _sentence(message):
+    message = message.strip()
+    return message if message.endswith((".", "!", "?")) else message + "."
+
 class CommandExecutor:
-    def __init__(self, voice_output):
-        self.system_info = SystemInfo()
+    def __init__(self, voice_output, system_info=None, action_timeout=10.0, max_parallel=4, app_index=None,
+                 notes=None, actions=None):
+        """
+        Args:
+            voice_output: VoiceOutput instance for speaking
+            system_info: SystemInfo for stats and history
+            action_timeout: Seconds each action of a multi-action plan gets
+                            before the summary reports it as too slow (it
+                            is left to finish in the background)
+            max_parallel: Actions of one plan run at the same time at most
+            app_index: AppIndex that OPEN_APP resolves names through, None
+                       tries app_paths and then the name as a command
+            notes: NoteStore for TAKE_NOTE, READ_NOTES and SEARCH_NOTES,
+                   defaults to notes.db in the data directory
+            actions: ActionRegistry naming each action's handler, defaults
+                     to the built-in actions only
+        """
+        self.system_info = system_info or SystemInfo()
         self.voice_output = voice_output  # Voice output instance for speaking
-        self.notes_file = Path("data/notes.txt")
-        self.notes_file.parent.mkdir(exist_ok=True)
-        
-        # Common Windows apps
-        self.app_paths = {
-            "notepad": "notepad.exe",
-            "calculator": "calc.exe",
-            "paint": "mspaint.exe",
-            "explorer": "explorer.exe",
-            "chrome": "chrome.exe",
-            "edge": "msedge.exe",
-            "firefox": "firefox.exe",
-            "cmd": "cmd.exe",
-            "powershell": "powershell.exe",
-            "vscode": "code.exe",
-            "spotify": "spotify.exe",
-        }
+        if notes is None:
+            # The same data directory Goku uses, wherever the process starts
+            from config.settings import DATA_DIR
+            notes = NoteStore(DATA_DIR / "notes.db", legacy_file=DATA_DIR / "notes.txt")
+        self.notes = notes
+        
+        self.actions = actions or ActionRegistry()
+        self.handlers = {}  # action -> bound handler, filled as actions are first used
+        
+        self.app_paths = dict(APP_PATHS)
+        self.apps = app_index
+        self.action_timeout = action_timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="action")
     
     def execute(self, command_data):
         """
         Execute command based on AI-generated plan
         
         Args:
-            command_data: Dict with action, parameters, and response
+            command_data: Dict with action, parameters, and response, or
+                          with a list of actions instead (see plan_steps)
             
         Returns:
-            dict: Result with success status and message
+            dict: Result with success status and message (one summary of
+                  every action for a multi-action plan)
         """
-        action = command_data.get("action", "UNKNOWN")
-        params = command_data.get("parameters", {})
-        response = command_data.get("response", "Done")
-        
+        steps = plan_steps(command_data)
+        if len(steps) > 1:
+            return self._execute_steps(steps, command_data.get("response", "Done"))
+        step = steps[0] if steps else {"action": "UNKNOWN", "parameters": {}}
+        return self._execute_action(step["action"], step["parameters"], command_data.get("response", "Done"))
+    
+    def _execute_action(self, action, params, response):
+        """Run one action's handler, falling back to response for the message"""
         try:
-            # Route to appropriate handler
-            handlers = {
-                "OPEN_BROWSER": self._open_browser,
-                "SEARCH_WEB": self._search_web,
-                "OPEN_APP": self._open_app,
-                "OPEN_WEBSITE": self._open_website,
-                "PLAY_YOUTUBE": self._play_youtube,
-                "PLAY_MUSIC": self._play_music,
-                "SYSTEM_STATS": self._system_stats,
-                "CREATE_FOLDER": self._create_folder,
-                "CREATE_FILE": self._create_file,
-                "OPEN_FILE": self._open_file,
-                "TAKE_NOTE": self._take_note,
-                "CONVERSATION": self._conversation,
-            }
-            
-            handler = handlers.get(action, self._unknown)
+            handler = self.handlers.get(action) or self._handler(action)
             result = handler(params)
             
             # Determine what to say
@@ -83,6 +154,77 @@ class CommandExecutor:
                 "message": f"Execution error: {str(e)}"
             }
     
+    def _handler(self, action):
+        """
+        Look up an action's handler in the registry, importing its plugin
+        the first time, and keep it for the next call
+        """
+        spec = self.actions.get(action)
+        if spec is None:
+            return self._unknown
+        if spec.builtin:
+            handler = getattr(self, spec.handler)
+        else:
+            try:
+                handler = partial(self.actions.load(action), self)
+            except Exception as e:
+                print(f"Could not load action {action}: {e}")
+                return lambda params: {"success": False, "message": f"The {_spoken(action)} action failed to load"}
+        self.handlers[action] = handler
+        return handler
+    
+    def _execute_steps(self, steps, response):
+        """
+        Run the steps of a multi-action plan, each as soon as the steps it
+        waits for have succeeded, independent ones at the same time
+        
+        Returns:
+            dict: success if any step succeeded, message summarizing them
+                  all in plan order, and results per step
+        """
+        results = [None] * len(steps)
+        started = set()
+        running = {}  # future -> (step index, deadline)
+        
+        while True:
+            for index, step in enumerate(steps):
+                if index in started:
+                    continue
+                waits_for = [results[i] for i in step["after"]]
+                if any(result is not None and not result["success"] for result in waits_for):
+                    started.add(index)
+                    results[index] = {"success": False, "message": f"Skipped {_spoken(step['action'])}"}
+                elif all(result is not None for result in waits_for):
+                    started.add(index)
+                    # Actions speak through the summary, not the plan's response
+                    future = self.pool.submit(self._execute_action, step["action"], step["parameters"], None)
+                    running[future] = (index, time.monotonic() + self.action_timeout)
+            if not running:
+                break
+            
+            next_deadline = min(deadline for _, deadline in running.values())
+            done, _ = wait(running, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            for future in list(running):
+                index, deadline = running[future]
+                if future in done:
+                    results[index] = future.result()
+                elif now >= deadline:
+                    results[index] = {"success": False, "message": f"Gave up waiting to {_spoken(steps[index]['action'])}"}
+                else:
+                    continue
+                del running[future]
+        
+        messages = [result["message"] for result in results if result["message"]]
+        if response and any(result["success"] and not result["message"] for result in results):
+            # Conversation steps have nothing to report but the reply itself
+            messages.append(response)
+        return {
+            "success": any(result["success"] for result in results),
+            "message": " ".join(_sentence(message) for message in messages) or None,
+            "results": results,
+        }
+    
     def _open_browser(self, params):
         """Open default web browser"""
         webbrowser.open("about:blank")
@@ -98,6 +240,8 @@ class CommandExecutor:
     def _open_app(self, params):
         """Launch application"""
         app_name = params.get("app_name", "").lower()
+        if self.apps is not None:
+            return self._launch(app_name)
         
         # Check if it's a known app
         if app_name in self.app_paths:
@@ -114,6 +258,20 @@ class CommandExecutor:
         except:
             return {"success": False, "message": f"Could not find application: {app_name}"}
     
+    def _launch(self, app_name):
+        """Launch what the app index resolves app_name to"""
+        app = self.apps.resolve(app_name)
+        if app is None:
+            return {"success": False, "message": f"Could not find application: {app_name}"}
+        try:
+            if app.get("shortcut"):
+                os.startfile(app["shortcut"])
+            else:
+                subprocess.Popen(app["command"])
+            return {"success": True, "message": f"Opening {app['name']}"}
+        except OSError:
+            return {"success": False, "message": f"Could not start {app['name']}"}
+    
     def _open_website(self, params):
         """Open specific URL"""
         url = params.get("url", "")
@@ -149,6 +307,37 @@ class CommandExecutor:
         
         return {"success": True, "message": message}
     
+    def _system_history(self, params):
+        """Summarize a metric over the last few minutes from the metrics history"""
+        history = self.system_info.history
+        if history is None:
+            return {"success": False, "message": "System history is not being recorded"}
+        
+        metric = str(params.get("metric", "cpu")).lower()
+        metric = {"ram": "memory", "storage": "disk"}.get(metric, metric)
+        if metric not in METRIC_NAMES:
+            return {"success": False, "message": f"I don't keep history for {metric}"}
+        try:
+            minutes = max(1, float(params.get("minutes", 60)))
+        except (TypeError, ValueError):
+            minutes = 60
+        
+        stats = history.query(metric, time.time() - minutes * 60)
+        if stats is None:
+            return {"success": True, "message": f"I don't have any {METRIC_NAMES[metric]} history yet"}
+        
+        if minutes % 60 == 0:
+            hours = int(minutes // 60)
+            span = "hour" if hours == 1 else f"{hours} hours"
+        else:
+            span = f"{minutes:g} minutes"
+        peak_at = datetime.fromtimestamp(stats["peak_time"]).strftime("%H:%M")
+        message = (
+            f"Over the last {span} your {METRIC_NAMES[metric]} averaged {stats['avg']} percent, "
+            f"peaking at {stats['max']} percent at {peak_at}, with a low of {stats['min']} percent."
+        )
+        return {"success": True, "message": message}
+    
     def _create_folder(self, params):
         """Create a directory"""
         path = params.get("path", "")
@@ -179,16 +368,82 @@ class CommandExecutor:
             return {"success": False, "message": f"Could not open file: {str(e)}"}
     
     def _take_note(self, params):
-        """Save a note to notes file"""
+        """Save a note to the note store"""
         note = params.get("note", "")
+        if not note.strip():
+            return {"success": False, "message": "The note was empty"}
+        self.notes.add(note)
+        return {"success": True, "message": f"Note saved: {note}"}
+    
+    def _read_notes(self, params):
+        """Read back the latest notes, optionally from a date range"""
         try:
-            with open(self.notes_file, "a", encoding="utf-8") as f:
-                from datetime import datetime
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] {note}\n")
-            return {"success": True, "message": f"Note saved: {note}"}
-        except Exception as e:
-            return {"success": False, "message": f"Could not save note: {str(e)}"}
+            count = min(max(1, int(params.get("count", 3))), SPOKEN_NOTES)
+        except (TypeError, ValueError):
+            count = 3
+        since, until = self._note_range(params)
+        notes = self.notes.recent(count, since, until)
+        if not notes:
+            return {"success": True, "message": "You don't have any notes" + (" from then" if since else " yet")}
+        heading = "Your last note" if len(notes) == 1 else f"Your last {len(notes)} notes"
+        return {"success": True, "message": f"{heading}: {self._spoken_notes(notes)}"}
+    
+    def _search_notes(self, params):
+        """Find notes by keyword and/or date range"""
+        query = str(params.get("query", "")).strip()
+        since, until = self._note_range(params)
+        notes = self.notes.search(query, since, until, limit=SPOKEN_NOTES + 1)
+        about = f" about {query}" if query else ""
+        if not notes:
+            return {"success": True, "message": f"I couldn't find any notes{about}"}
+        if len(notes) > SPOKEN_NOTES:
+            heading = f"Your latest {SPOKEN_NOTES} notes{about}"
+        else:
+            heading = f"I found {len(notes)} note{'s' if len(notes) > 1 else ''}{about}"
+        return {"success": True, "message": f"{heading}: {self._spoken_notes(notes[:SPOKEN_NOTES])}"}
+    
+    @staticmethod
+    def _note_range(params):
+        """
+        Unix time range from "since" and "until" (inclusive), each a number
+        of days ago (0 is today) or a YYYY-MM-DD date
+        
+        Returns:
+            tuple: (since, until), either may be None
+        """
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        def day(value):
+            if value is None or value == "":
+                return None
+            try:
+                return today - timedelta(days=int(value))
+            except (TypeError, ValueError):
+                pass
+            try:
+                return datetime.strptime(str(value), "%Y-%m-%d")
+            except ValueError:
+                return None
+        
+        since, until = day(params.get("since")), day(params.get("until"))
+        return (since.timestamp() if since else None,
+                (until + timedelta(days=1)).timestamp() if until else None)
+    
+    @staticmethod
+    def _spoken_notes(notes):
+        """'today at 14:02, buy milk; on May 3, call mom'"""
+        today = datetime.now().date()
+        spoken = []
+        for note in notes:
+            created = datetime.fromtimestamp(note["created"])
+            if created.date() == today:
+                when = f"today at {created:%H:%M}"
+            elif created.date() == today - timedelta(days=1):
+                when = f"yesterday at {created:%H:%M}"
+            else:
+                when = f"on {created:%B} {created.day}"
+            spoken.append(f"{when}, {note['text']}")
+        return "; ".join(spoken)
     
     def _conversation(self, params):
         """Just conversation, no action needed"""
@@ -0,0 +1,151 @@
+"""
+Conversation Module
+Bounded memory of the conversation, so follow-ups like "open that one
+again" reach Gemini with what they refer to
+
+The latest turns are kept word for word. Older ones are folded into a short
+rolling summary (the command and the actions it led to). The window and
+the summary are trimmed to a token budget, so the context sent with each
+request stops growing after a few turns however long the session runs.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import deque
+from usage_tracker import estimate_tokens
+
+# Words that make a command depend on what came before it
+FOLLOW_UP = re.compile(
+    r"\b(?:it|its|that|this|those|these|them|one|ones|again|same|there|he|she|him|her|they|"
+    r"previous|before|instead|too|also|another|more)\b",
+    re.IGNORECASE,
+)
+
+# Characters of a reply kept in a turn, long answers would crowd out the rest
+REPLY_CHARS = 240
+
+
+def _clip(text, limit=REPLY_CHARS):
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _actions(command_data):
+    """The actions of a plan as 'OPEN_APP {"app_name": "spotify"}'"""
+    steps = command_data.get("actions")
+    if not isinstance(steps, list):
+        steps = [command_data]
+    described = []
+    for step in steps:
+        if not isinstance(step, dict):
+            continue
+        action = step.get("action", "UNKNOWN")
+        params = step.get("parameters") or {}
+        described.append(f"{action} {json.dumps(params, ensure_ascii=False)}" if params else action)
+    return "; ".join(described)
+
+
+class ConversationMemory:
+    def __init__(self, max_tokens=300, summary_tokens=100, max_turns=6, idle_timeout=600):
+        """
+        Args:
+            max_tokens: Budget of the whole context (summary and turns)
+            summary_tokens: Part of the budget the summary may use
+            max_turns: Turns kept word for word at most
+            idle_timeout: Seconds without a turn after which the
+                          conversation starts over (0 never forgets)
+        """
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.max_turns = max_turns
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        self.turns = deque()  # (text, tokens, summary line)
+        self.turn_tokens = 0
+        self.summary = deque()  # (line, tokens), oldest first
+        self.summary_used = 0
+        self.last_turn = 0.0
+
+    def add(self, user, reply):
+        """
+        Remember one exchange
+
+        Args:
+            user: What the user said
+            reply: The plan dict Goku acted on, or the text of a chat answer
+        """
+        if isinstance(reply, dict):
+            actions = _actions(reply)
+            said = _clip(reply.get("response") or "")
+            text = f"User: {user}\nGoku: {actions}" + (f" - said \"{said}\"" if said else "")
+            line = f"{user} -> {actions}"
+        else:
+            text = f"User: {user}\nGoku: {_clip(reply)}"
+            line = f"{user} -> {_clip(reply, 60)}"
+        tokens = estimate_tokens(text)
+
+        with self.lock:
+            self._expire()
+            self.last_turn = time.monotonic()
+            self.turns.append((text, tokens, line))
+            self.turn_tokens += tokens
+            # The latest turn always stays, however long it is
+            while len(self.turns) > 1 and (
+                    len(self.turns) > self.max_turns
+                    or self.turn_tokens + self.summary_used > self.max_tokens):
+                self._fold(self.turns.popleft())
+
+    def _fold(self, turn):
+        """Move an old turn into the summary, dropping its oldest lines"""
+        _, tokens, line = turn
+        self.turn_tokens -= tokens
+        line_tokens = estimate_tokens(line) + 1
+        self.summary.append((line, line_tokens))
+        self.summary_used += line_tokens
+        limit = min(self.summary_tokens, max(0, self.max_tokens - self.turn_tokens))
+        while self.summary and self.summary_used > limit:
+            self.summary_used -= self.summary.popleft()[1]
+
+    def _expire(self):
+        if self.idle_timeout and self.last_turn and time.monotonic() - self.last_turn > self.idle_timeout:
+            self._reset()
+
+    def _reset(self):
+        self.turns.clear()
+        self.summary.clear()
+        self.turn_tokens = self.summary_used = 0
+
+    def context(self):
+        """
+        The conversation so far, to put before a new command
+
+        Returns:
+            str: Empty when there is nothing to remember
+        """
+        with self.lock:
+            self._expire()
+            if not self.turns:
+                return ""
+            lines = ["Conversation so far (for follow-ups):"]
+            if self.summary:
+                lines.append("Earlier: " + "; ".join(line for line, _ in self.summary))
+            lines.extend(text for text, _, _ in self.turns)
+            return "\n".join(lines)
+
+    def refers_back(self, command):
+        """True if command likely depends on earlier turns ("open it again")"""
+        with self.lock:
+            self._expire()
+            remembered = bool(self.turns)
+        return remembered and FOLLOW_UP.search(command or "") is not None
+
+    def tokens(self):
+        """Estimated tokens context() adds to a prompt"""
+        return estimate_tokens(self.context())
+
+    def clear(self):
+        """Forget the conversation"""
+        with self.lock:
+            self._reset()
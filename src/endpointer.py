@@ -0,0 +1,286 @@
+"""
+Endpointer Module
+Voice-activity detection that ends a phrase as soon as speech is over
+
+Audio is cut into short frames and scored a whole chunk at a time with
+NumPy: RMS energy against a noise floor that adapts as it goes, plus the
+zero-crossing rate to tell voiced speech from broadband noise. A phrase
+starts after a run of speech frames and ends after a run of silent ones,
+both measured in frames rather than per buffer.
+
+NoiseFloorTracker keeps estimating the background level between phrases,
+so neither the endpointer nor SpeechRecognition's energy threshold needs a
+calibration pass.
+"""
+
+import threading
+
+# (threshold over the noise floor, seconds of silence that end a phrase)
+AGGRESSIVENESS = {
+    0: (2.0, 0.80),
+    1: (2.5, 0.55),
+    2: (3.0, 0.40),
+    3: (3.0, 0.25),
+}
+
+NOISE_ADAPT = 0.05  # share of the noise floor replaced by each quiet frame
+NOISE_RISE = 1.01  # per-frame rise while no frame is quiet (noise got louder)
+MIN_ENERGY = 0.003  # RMS below this (about -50 dBFS) is never speech
+MAX_VOICED_ZCR = 0.35  # louder frames with more crossings need a stronger signal
+
+_DTYPES = {1: "i1", 2: "<i2", 4: "<i4"}
+
+
+def _frames(np, data, sample_width, frame_size):
+    """Whole frames of PCM bytes as rows of floats, full scale 1.0"""
+    count = len(data) // (frame_size * sample_width)
+    samples = np.frombuffer(data, dtype=_DTYPES[sample_width], count=count * frame_size)
+    return samples.reshape(count, frame_size).astype(np.float32) / float(2 ** (8 * sample_width - 1))
+
+
+def _rms(np, frames):
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+class Endpointer:
+    def __init__(self, aggressiveness=1, frame_ms=20, min_speech=0.1, padding=0.2):
+        """
+        Args:
+            aggressiveness: 0 (patient, tolerates long pauses) to 3 (ends
+                            phrases soonest, may cut slow speakers off)
+            frame_ms: Analysis frame length in milliseconds
+            min_speech: Seconds of continuous speech that start a phrase
+            padding: Seconds of audio kept before and after the speech
+        """
+        # Imported here so importing this module stays cheap at startup
+        import numpy as np
+
+        if aggressiveness not in AGGRESSIVENESS:
+            raise ValueError(f"aggressiveness must be one of {sorted(AGGRESSIVENESS)}")
+        self.np = np
+        self.aggressiveness = aggressiveness
+        self.ratio, self.hangover = AGGRESSIVENESS[aggressiveness]
+        self.frame_ms = frame_ms
+        self.min_speech = min_speech
+        self.padding = padding
+
+        self.sample_rate = None
+        self.sample_width = None
+        self.noise_floor = None  # RMS, full scale is 1.0, kept across phrases
+        self.reset(16000, 2)
+
+    def reset(self, sample_rate, sample_width):
+        """
+        Start a new phrase, keeping the noise floor if the format is unchanged
+
+        Args:
+            sample_rate: Frames per second of the audio about to be fed
+            sample_width: Bytes per sample (mono)
+        """
+        if sample_width not in _DTYPES:
+            raise ValueError(f"Unsupported sample width: {sample_width}")
+        if (sample_rate, sample_width) != (self.sample_rate, self.sample_width):
+            self.noise_floor = None
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_size = max(1, sample_rate * self.frame_ms // 1000)
+        self.frame_bytes = self.frame_size * sample_width
+        self.start_frames = max(1, round(self.min_speech * 1000 / self.frame_ms))
+        self.end_frames = max(1, round(self.hangover * 1000 / self.frame_ms))
+
+        self.pending = b""  # bytes short of a whole frame
+        self.frames = 0  # frames scored so far
+        self.speech_run = 0  # speech frames at the end of the last chunk
+        self.silence_run = 0  # silent frames at the end of the last chunk
+        self.started = None  # first frame of the phrase
+        self.ended = None  # frame after its last speech frame
+
+    @property
+    def position(self):
+        """Bytes fed so far"""
+        return self.frames * self.frame_bytes + len(self.pending)
+
+    def feed(self, chunk):
+        """
+        Score a chunk of raw audio
+
+        Args:
+            chunk: Mono PCM bytes in the format given to reset()
+
+        Returns:
+            bool: True once the phrase has ended, the rest of the chunk
+                  is then ignored
+        """
+        if self.ended is not None:
+            return True
+        data = self.pending + bytes(chunk)
+        count = len(data) // self.frame_bytes
+        self.pending = data[count * self.frame_bytes:]
+        if count == 0:
+            return False
+
+        speech, active = self._classify(data[:count * self.frame_bytes])
+        first = self.frames
+        self.frames += count
+
+        if self.started is None:
+            runs = self._runs(speech, self.speech_run)
+            hits = self.np.flatnonzero(runs >= self.start_frames)
+            self.speech_run = int(runs[-1])
+            if hits.size == 0:
+                return False
+            at = int(hits[0])
+            self.started = first + at - self.start_frames + 1
+            # Look for the end only after the phrase started
+            active = active[at + 1:]
+            first += at + 1
+            self.silence_run = 0
+            if active.size == 0:
+                return False
+
+        runs = self._runs(~active, self.silence_run)
+        hits = self.np.flatnonzero(runs >= self.end_frames)
+        self.silence_run = int(runs[-1])
+        if hits.size == 0:
+            return False
+        self.ended = first + int(hits[0]) - self.end_frames + 1
+        # Nothing after the decision point has been heard yet
+        self.frames = first + int(hits[0]) + 1
+        self.pending = b""
+        return True
+
+    def span(self):
+        """
+        Byte range of the phrase including padding, clamped to what was fed
+
+        Returns:
+            tuple: (start, end) stream positions, or None before speech
+        """
+        if self.started is None:
+            return None
+        pad = round(self.padding * 1000 / self.frame_ms)
+        start = max(0, self.started - pad) * self.frame_bytes
+        end = self.position if self.ended is None else min(self.ended + pad, self.frames) * self.frame_bytes
+        return start, end
+
+    def _classify(self, data):
+        """
+        Score every frame, updating the noise floor
+
+        Returns:
+            tuple: (speech, active) boolean arrays; speech is loud enough to
+                   start a phrase, active (a lower threshold, so the soft
+                   ends of words don't read as a pause) keeps one going
+        """
+        np = self.np
+        samples = _frames(np, data, self.sample_width, self.frame_size)
+        energy = _rms(np, samples)
+        negative = np.signbit(samples)
+        zcr = np.mean(negative[:, 1:] != negative[:, :-1], axis=1)
+
+        if self.noise_floor is None:
+            self.noise_floor = max(float(energy.min()), MIN_ENERGY / self.ratio)
+        threshold = max(self.noise_floor * self.ratio, MIN_ENERGY)
+        voiced = (zcr < MAX_VOICED_ZCR) | (energy > 2 * threshold)
+        speech = (energy > threshold) & voiced
+        active = (energy > max(self.noise_floor * self.ratio ** 0.5, MIN_ENERGY)) & voiced
+
+        # Only frames well under the threshold move the floor, not the soft
+        # edges of words
+        quiet = energy[energy < self.noise_floor * self.ratio ** 0.5]
+        if quiet.size:
+            weight = 1 - (1 - NOISE_ADAPT) ** quiet.size
+            self.noise_floor += weight * (float(quiet.mean()) - self.noise_floor)
+        else:
+            # Everything scored as speech: let a louder room catch up slowly
+            self.noise_floor = min(float(energy.min()), self.noise_floor * NOISE_RISE ** len(energy))
+        return speech, active
+
+    def _runs(self, mask, carry):
+        """Length of the run of True ending at each frame, continuing carry"""
+        np = self.np
+        index = np.arange(1, mask.size + 1)
+        last_break = np.maximum.accumulate(np.where(mask, 0, index))
+        runs = index - last_break
+        runs[last_break == 0] += carry
+        return runs
+
+
+class NoiseFloorTracker:
+    """
+    Background noise level from a rolling window of frame energies
+
+    The floor is a low quantile of the window, so speech (loud, and with
+    pauses between words) barely moves it while a fan or a noisy room does
+    within a few seconds.
+    """
+
+    def __init__(self, frame_ms=20, window_seconds=5.0, quantile=0.1, min_seconds=0.5):
+        """
+        Args:
+            frame_ms: Analysis frame length in milliseconds
+            window_seconds: Audio the estimate is taken over
+            quantile: Share of the window's frames at or below the floor
+            min_seconds: Audio needed before the estimate is used
+        """
+        # Imported here so importing this module stays cheap at startup
+        import numpy as np
+
+        self.np = np
+        self.frame_ms = frame_ms
+        self.size = max(1, round(window_seconds * 1000 / frame_ms))
+        self.quantile = quantile
+        self.min_frames = max(1, round(min_seconds * 1000 / frame_ms))
+        self.lock = threading.Lock()
+        self.format = None
+        self.floor = None  # RMS, full scale is 1.0
+
+    def _reset(self, sample_rate, sample_width):
+        self.format = (sample_rate, sample_width)
+        self.frame_size = max(1, sample_rate * self.frame_ms // 1000)
+        self.frame_bytes = self.frame_size * sample_width
+        self.energies = self.np.zeros(self.size, dtype=self.np.float32)
+        self.count = 0  # frames seen, the window is energies[:min(count, size)]
+        self.pending = b""
+        self.floor = None
+
+    def feed(self, chunk, sample_rate, sample_width):
+        """
+        Add captured audio, from any thread
+
+        Args:
+            chunk: Mono PCM bytes
+            sample_rate: Frames per second
+            sample_width: Bytes per sample
+        """
+        if sample_width not in _DTYPES:
+            return
+        with self.lock:
+            if self.format != (sample_rate, sample_width):
+                self._reset(sample_rate, sample_width)
+            data = self.pending + bytes(chunk)
+            whole = len(data) // self.frame_bytes * self.frame_bytes
+            self.pending = data[whole:]
+            if not whole:
+                return
+
+            energy = _rms(self.np, _frames(self.np, data[:whole], sample_width, self.frame_size))[-self.size:]
+            start = self.count % self.size
+            first = min(len(energy), self.size - start)
+            self.energies[start:start + first] = energy[:first]
+            self.energies[:len(energy) - first] = energy[first:]
+            self.count += len(energy)
+
+            if self.count >= self.min_frames:
+                window = self.energies[:min(self.count, self.size)]
+                rank = int(self.quantile * (len(window) - 1))
+                self.floor = float(self.np.partition(window, rank)[rank])
+
+    def estimate(self, sample_rate, sample_width):
+        """
+        Returns:
+            float: Noise RMS (full scale 1.0) for audio in this format, or
+                   None until enough has been heard
+        """
+        with self.lock:
+            return self.floor if self.format == (sample_rate, sample_width) else None
@@ -0,0 +1,391 @@
+"""
+Intent Matcher Module
+Resolves common commands locally so they skip the Gemini round trip
+"""
+
+import re
+from app_index import APP_ALIASES
+
+# Counts as the recognizer may spell them ("read my last three notes")
+NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
+
+# Site names that OPEN_WEBSITE understands without a full URL
+KNOWN_SITES = {
+    "youtube": "https://www.youtube.com",
+    "google": "https://www.google.com",
+    "github": "https://github.com",
+    "gmail": "https://mail.google.com",
+    "youtube music": "https://music.youtube.com",
+    "stack overflow": "https://stackoverflow.com",
+    "wikipedia": "https://www.wikipedia.org",
+    "reddit": "https://www.reddit.com",
+}
+
+# Words the recognizer often picks up around the actual command
+LEADING_FILLERS = re.compile(
+    r"^(?:(?:hey|ok|okay)\s+)?(?:goku[\s,]+)?(?:(?:can|could|would)\s+you\s+)?(?:please\s+)?",
+    re.IGNORECASE,
+)
+TRAILING_FILLERS = re.compile(r"(?:[\s,]+(?:please|for me|now))+$", re.IGNORECASE)
+TRAILING_PUNCTUATION = re.compile(r"[\s.!?,]+$")
+
+# Joins between the parts of a compound command ("open x, start y and search z")
+COMPOUND_JOINS = re.compile(r"\s*,\s*(?:and |then )?|\s+(?:and then|then|and)\s+", re.IGNORECASE)
+
+
+class _AppTrie:
+    """Word-level trie over application names and their aliases"""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, phrase, app_key):
+        node = self.root
+        for word in phrase.split():
+            node = node.setdefault(word, {})
+        node[None] = app_key
+
+    def lookup(self, words):
+        """
+        Find the longest alias at the start of words
+
+        Returns:
+            tuple: (app_key, number of words consumed) or (None, 0)
+        """
+        node = self.root
+        found, consumed = None, 0
+        for i, word in enumerate(words):
+            node = node.get(word)
+            if node is None:
+                break
+            if None in node:
+                found, consumed = node[None], i + 1
+        return found, consumed
+
+
+class IntentMatcher:
+    def __init__(self, app_names, resolve_app=None):
+        """
+        Args:
+            app_names: Application keys that OPEN_APP can launch
+                       (normally CommandExecutor.app_paths)
+            resolve_app: resolve_app(name, refresh, fuzzy) -> app or None
+                         for names beyond app_names (normally
+                         AppIndex.resolve)
+        """
+        self.resolve_app = resolve_app
+        self.app_trie = _AppTrie()
+        for app_key in app_names:
+            self.app_trie.add(app_key, app_key)
+            for alias in APP_ALIASES.get(app_key, []):
+                self.app_trie.add(alias, app_key)
+
+        self.hits = 0
+        self.misses = 0
+
+        # Rules are (action, compiled pattern, builder). They are indexed by
+        # the first word of the command so only a handful are tried per call.
+        self.rules_by_word = {}
+        self.fallback_rules = []
+        self._build_rules()
+
+    def _add_rule(self, action, pattern, builder, first_words=None):
+        rule = (action, re.compile(pattern, re.IGNORECASE), builder)
+        if not first_words:
+            self.fallback_rules.append(rule)
+            return
+        for word in first_words:
+            self.rules_by_word.setdefault(word, []).append(rule)
+
+    def _build_rules(self):
+        """Compile the phrase patterns for each supported action"""
+        open_verbs = ["open", "launch", "start", "run"]
+
+        # Order matters within a first word: more specific rules go first
+        self._add_rule(
+            "PLAY_MUSIC",
+            r"^play (?P<query>.+?) on (?:youtube music|yt music)$",
+            self._query_plan("PLAY_MUSIC", "Playing {query} on YouTube Music"),
+            ["play"],
+        )
+        self._add_rule(
+            "PLAY_YOUTUBE",
+            r"^(?:play|search(?: for)?|find|watch) (?P<query>.+?) on youtube$",
+            self._query_plan("PLAY_YOUTUBE", "Playing {query} on YouTube"),
+            ["play", "search", "find", "watch"],
+        )
+        self._add_rule(
+            "PLAY_MUSIC",
+            r"^play (?:some )?(?P<query>.+?) (?:music|songs?)$",
+            self._query_plan("PLAY_MUSIC", "Playing {query} on YouTube Music"),
+            ["play"],
+        )
+        self._add_rule(
+            "PLAY_MUSIC",
+            r"^play (?:the )?song (?P<query>.+)$",
+            self._query_plan("PLAY_MUSIC", "Playing {query} on YouTube Music"),
+            ["play"],
+        )
+        self._add_rule(
+            "SEARCH_NOTES",
+            r"^(?:search|find|check|look)(?: in| through| up)? my notes (?:for|about) (?P<query>.+)$",
+            self._notes_plan("SEARCH_NOTES"),
+            ["search", "find", "check", "look"],
+        )
+        self._add_rule(
+            "SEARCH_WEB",
+            r"^(?:search|google|look up)(?: for| up)? (?P<query>.+?)(?: on (?:google|the web|the internet))?$",
+            self._query_plan("SEARCH_WEB", "Searching for {query} on Google"),
+            ["search", "google", "look"],
+        )
+        self._add_rule(
+            "OPEN_BROWSER",
+            r"^(?:open|launch|start) (?:my |the )?(?:web )?browser$",
+            lambda m: self._plan("OPEN_BROWSER", {}, "Opening your browser"),
+            open_verbs,
+        )
+        self._add_rule(
+            "OPEN_WEBSITE",
+            r"^(?:open|go to|navigate to|visit) (?P<site>(?:https?://)?[\w-]+(?:\.[\w-]+)+(?:/\S*)?)$",
+            self._website_plan,
+            open_verbs + ["go", "navigate", "visit"],
+        )
+        self._add_rule(
+            "OPEN_WEBSITE",
+            r"^(?:open|go to|navigate to|visit) (?P<site>" + "|".join(
+                re.escape(name) for name in sorted(KNOWN_SITES, key=len, reverse=True)
+            ) + r")$",
+            self._website_plan,
+            open_verbs + ["go", "navigate", "visit"],
+        )
+        self._add_rule(
+            "OPEN_APP",
+            r"^(?:open|launch|start|run) (?:the )?(?:app |application |program )?(?P<app>.+?)(?: app| application| program)?$",
+            self._app_plan,
+            open_verbs,
+        )
+        self._add_rule(
+            "SYSTEM_HISTORY",
+            r"^(?:what was|how (?:high|busy) was) my (?P<metric>cpu|ram|memory|disk)(?: usage)?(?: averaging| like)?"
+            r" (?:over|in|during) the (?:last|past) (?:(?P<count>\d+|an?|one) )?(?P<unit>minutes?|hours?|day)$",
+            self._history_plan,
+            ["what", "how"],
+        )
+        self._add_rule(
+            "SYSTEM_HISTORY",
+            r"^when did (?:my )?(?P<metric>cpu|ram|memory|disk)(?: usage)? (?:spike|peak|max out)"
+            r"(?: (?:in|over) the (?:last|past) (?:(?P<count>\d+|an?|one) )?(?P<unit>minutes?|hours?|day)| today)?$",
+            self._history_plan,
+            ["when"],
+        )
+        self._add_rule(
+            "SYSTEM_STATS",
+            r"^(?:show|give|tell|get)(?: me)?(?: my| the)? (?:system|computer|pc) (?:stats|statistics|status|info|information)$",
+            self._stats_plan,
+            ["show", "give", "tell", "get"],
+        )
+        self._add_rule(
+            "SYSTEM_STATS",
+            r"^(?:what(?:'s| is) my|check(?: my)?) (?:cpu|ram|memory|disk|storage)(?: usage| space)?$",
+            self._stats_plan,
+            ["what's", "what", "check"],
+        )
+        self._add_rule(
+            "SYSTEM_STATS",
+            r"^how much (?:storage|disk space|ram|memory) (?:do i have|is (?:free|left|used))(?: left| free)?$",
+            self._stats_plan,
+            ["how"],
+        )
+        self._add_rule(
+            "SYSTEM_STATS",
+            r"^(?:system|computer|pc) (?:stats|statistics|status)$",
+            self._stats_plan,
+            ["system", "computer", "pc"],
+        )
+        self._add_rule(
+            "TAKE_NOTE",
+            r"^(?:take|make|add|write)(?: a| down a)? note(?: that| saying)?[:,]? (?P<note>.+)$",
+            self._note_plan,
+            ["take", "make", "add", "write"],
+        )
+        self._add_rule(
+            "TAKE_NOTE",
+            r"^note(?: that)?[:,]? (?P<note>.+)$",
+            self._note_plan,
+            ["note", "note:", "note,"],
+        )
+        self._add_rule(
+            "SEARCH_NOTES",
+            r"^what (?:did|have) i (?:note|noted|write down|written down|take notes on)"
+            r" about (?P<query>.+?)(?: (?P<when>today|yesterday|this week))?$",
+            self._notes_plan("SEARCH_NOTES"),
+            ["what"],
+        )
+        self._add_rule(
+            "READ_NOTES",
+            r"^(?:read|show|tell)(?: me)?(?: back)? my (?:(?:last|latest|recent) )?(?P<count>\w+ )?(?:(?P<many>notes)|note)"
+            r"(?: from (?P<when>today|yesterday|this week))?$",
+            self._notes_plan("READ_NOTES"),
+            ["read", "show", "tell"],
+        )
+        self._add_rule(
+            "CREATE_FOLDER",
+            r"^(?:create|make)(?: a)?(?: new)? (?:folder|directory)(?: called| named)? (?P<path>.+)$",
+            lambda m: self._plan("CREATE_FOLDER", {"path": m.group("path")}, f"Creating folder {m.group('path')}"),
+            ["create", "make"],
+        )
+        self._add_rule(
+            "CREATE_FILE",
+            r"^(?:create|make)(?: a)?(?: new)? file(?: called| named)? (?P<path>\S+)$",
+            lambda m: self._plan("CREATE_FILE", {"path": m.group("path"), "content": ""}, f"Creating file {m.group('path')}"),
+            ["create", "make"],
+        )
+
+    @staticmethod
+    def normalize(command):
+        """Strip wake words, politeness fillers and trailing punctuation"""
+        text = " ".join(command.split())
+        text = TRAILING_PUNCTUATION.sub("", text)
+        text = LEADING_FILLERS.sub("", text)
+        text = TRAILING_FILLERS.sub("", text)
+        return text.strip()
+
+    def match(self, command):
+        """
+        Try to resolve a command without the AI
+
+        Args:
+            command: User's voice command
+
+        Returns:
+            dict: Same structure as AIBrain.process_command, or None when
+                  the command should fall through to Gemini
+        """
+        text = self.normalize(command or "")
+        plan = (self._match_one(text) or self._match_compound(text)) if text else None
+        if plan is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return plan
+
+    def _match_one(self, text):
+        first_word = text.split(" ", 1)[0].lower()
+        for action, pattern, builder in self.rules_by_word.get(first_word, []) + self.fallback_rules:
+            found = pattern.match(text)
+            if not found:
+                continue
+            plan = builder(found)
+            if plan is not None:
+                return plan
+        return None
+
+    def _match_compound(self, text):
+        """
+        A multi-action plan if every part of a compound command matches,
+        a part after "then" waits for the one before it
+        """
+        parts, then, start = [], [False], 0
+        for join in COMPOUND_JOINS.finditer(text):
+            parts.append(self.normalize(text[start:join.start()]))
+            then.append("then" in join.group(0).lower())
+            start = join.end()
+        parts.append(self.normalize(text[start:]))
+        if len(parts) < 2 or not all(parts):
+            return None
+        plans = [self._match_one(part) for part in parts]
+        if any(plan is None for plan in plans):
+            return None
+
+        actions = []
+        for index, plan in enumerate(plans):
+            actions.append({"action": plan["action"], "parameters": plan["parameters"]})
+            if then[index]:
+                actions[-1]["after"] = [index]  # step numbers count from 1
+        return {
+            "intent": "local match: " + ", ".join(plan["action"].lower() for plan in plans),
+            "actions": actions,
+            "response": ". ".join(plan["response"] for plan in plans),
+        }
+
+    def hit_rate(self):
+        """Fraction of commands resolved locally so far"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _plan(self, action, parameters, response):
+        return {
+            "intent": f"local match: {action.lower()}",
+            "action": action,
+            "parameters": parameters,
+            "response": response,
+        }
+
+    def _query_plan(self, action, response):
+        def build(found):
+            query = found.group("query").strip()
+            return self._plan(action, {"query": query}, response.format(query=query))
+        return build
+
+    def _website_plan(self, found):
+        site = found.group("site").lower()
+        url = KNOWN_SITES.get(site, site)
+        return self._plan("OPEN_WEBSITE", {"url": url}, f"Opening {site}")
+
+    def _app_plan(self, found):
+        words = found.group("app").lower().split()
+        app_key, consumed = self.app_trie.lookup(words)
+        # Only a full match is trusted, anything else goes to Gemini
+        if app_key is not None and consumed == len(words):
+            return self._plan("OPEN_APP", {"app_name": app_key}, f"Opening {app_key}")
+        if self.resolve_app is None:
+            return None
+        # An installed app by its exact name or an alias, no guessing here
+        name = " ".join(words)
+        app = self.resolve_app(name, refresh=False, fuzzy=False)
+        if app is None:
+            return None
+        return self._plan("OPEN_APP", {"app_name": name}, f"Opening {app['name']}")
+
+    def _stats_plan(self, found):
+        return self._plan("SYSTEM_STATS", {}, "Checking your system stats")
+
+    def _history_plan(self, found):
+        metric = found.group("metric").lower()
+        metric = "memory" if metric == "ram" else metric
+        unit, count = found.group("unit"), found.group("count")
+        if unit is None:
+            minutes = 60 if "today" not in found.group(0).lower() else 24 * 60
+        else:
+            amount = int(count) if count and count.isdigit() else 1
+            minutes = amount * {"minute": 1, "hour": 60, "day": 24 * 60}[unit.lower().rstrip("s")]
+        return self._plan("SYSTEM_HISTORY", {"metric": metric, "minutes": minutes}, "Checking your usage history")
+
+    def _notes_plan(self, action):
+        def build(found):
+            groups = found.groupdict()
+            params = {}
+            if groups.get("query"):
+                params["query"] = groups["query"].strip()
+            if groups.get("count"):
+                count = NUMBER_WORDS.get(groups["count"].strip().lower(), groups["count"].strip())
+                if not str(count).isdigit():
+                    return None  # "read my work notes" is for Gemini
+                params["count"] = int(count)
+            elif action == "READ_NOTES" and not groups.get("many"):
+                params["count"] = 1
+            # Days ago, so the plan stays right when it is cached
+            when = (groups.get("when") or "").lower()
+            if when == "today":
+                params["since"] = 0
+            elif when == "yesterday":
+                params["since"] = params["until"] = 1
+            elif when == "this week":
+                params["since"] = 6
+            response = "Searching your notes" if action == "SEARCH_NOTES" else "Reading your notes"
+            return self._plan(action, params, response)
+        return build
+
+    def _note_plan(self, found):
+        note = found.group("note").strip()
+        return self._plan("TAKE_NOTE", {"note": note}, f"Note saved: {note}")
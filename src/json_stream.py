@@ -0,0 +1,138 @@
+"""
+JSON Stream Module
+Incremental parser that reports top-level fields of a JSON object as soon as
+they are complete, while the rest of the reply is still arriving
+"""
+
+import json
+
+
+class StreamingJSONParser:
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0              # next character to scan
+        self.started = False      # seen the opening "{" (markdown fences are skipped)
+        self.done = False         # seen the closing "}"
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+
+        self.expect = "key"       # key, colon, value or after_value (depth 1 only)
+        self.current_key = None
+        self.value_start = None
+        self.fields = {}
+
+    def feed(self, text):
+        """
+        Consume the next chunk of the reply
+
+        Args:
+            text: Chunk of model output
+
+        Returns:
+            list: (key, value) pairs completed by this chunk, in order
+        """
+        self.buffer += text
+        completed = []
+
+        while self.pos < len(self.buffer) and not self.done:
+            char = self.buffer[self.pos]
+
+            if not self.started:
+                if char == "{":
+                    self.started = True
+                    self.depth = 1
+                self.pos += 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        self._string_closed(completed)
+                self.pos += 1
+                continue
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = self.pos
+                if self.depth == 1 and self.expect == "value":
+                    self.value_start = self.pos
+            elif char in "{[":
+                if self.depth == 1 and self.expect == "value":
+                    self.value_start = self.pos
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 1 and self.value_start is not None:
+                    # Nested object/array value just closed
+                    self._complete_value(self.pos + 1, completed)
+                elif self.depth == 0:
+                    if self.expect == "value" and self.value_start is not None:
+                        self._complete_value(self.pos, completed)
+                    self.done = True
+            elif self.depth == 1:
+                if char == ":" and self.expect == "colon":
+                    self.expect = "value"
+                elif char == "," and self.expect in ("value", "after_value"):
+                    if self.expect == "value" and self.value_start is not None:
+                        # Number, true/false/null end at the comma
+                        self._complete_value(self.pos, completed)
+                    self.expect = "key"
+                elif not char.isspace() and self.expect == "value" and self.value_start is None:
+                    self.value_start = self.pos
+
+            self.pos += 1
+
+        return completed
+
+    def _string_closed(self, completed):
+        if self.expect == "key":
+            self.current_key = json.loads(self.buffer[self.string_start:self.pos + 1])
+            self.expect = "colon"
+        elif self.expect == "value":
+            self._complete_value(self.pos + 1, completed)
+
+    def _complete_value(self, end, completed):
+        raw = self.buffer[self.value_start:end].strip()
+        self.value_start = None
+        self.expect = "after_value"
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        self.fields[self.current_key] = value
+        completed.append((self.current_key, value))
+
+    def partial_string(self, key):
+        """
+        Decoded text received so far for a string field
+
+        Returns:
+            str: The complete value, the partial value while the string is
+                 still arriving, or None if the field hasn't started
+        """
+        if key in self.fields:
+            value = self.fields[key]
+            return value if isinstance(value, str) else None
+
+        if (self.current_key != key or not self.in_string or self.depth != 1
+                or self.value_start is None):
+            return None
+
+        raw = self.buffer[self.value_start + 1:self.pos]
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            pass
+        # Probably cut in the middle of an escape sequence
+        raw = raw[:raw.rfind("\\")]
+        try:
+            return json.loads(f'"{raw}"')
+        except ValueError:
+            return None
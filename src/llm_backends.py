@@ -0,0 +1,359 @@
+"""
+LLM Backends Module
+Interchangeable text-generation backends for AIBrain: Gemini, a local stub
+with injectable latency/errors, and record/replay of real traffic
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from usage_tracker import estimate_tokens
+
+
+class BackendError(Exception):
+    """Raised by a backend when a request fails"""
+
+
+class LLMBackend:
+    """
+    Interface AIBrain talks to
+
+    Subclasses implement generate() and may override stream(); the default
+    stream() yields the whole reply as a single chunk.
+    """
+
+    name = "base"
+
+    def generate(self, prompt, system=None, usage=None):
+        """
+        Args:
+            prompt: Per-call prompt text
+            system: Static system instruction, sent separately from the prompt
+            usage: Optional dict the backend fills with prompt_tokens,
+                   output_tokens, total_tokens and cached_tokens
+
+        Returns:
+            str: Model reply
+        """
+        raise NotImplementedError
+
+    def stream(self, prompt, system=None, usage=None):
+        """Yield the reply in text chunks as they arrive"""
+        yield self.generate(prompt, system, usage)
+
+    def warm(self, system=None):
+        """
+        Open (or keep open) the connection the next request will use, so
+        it doesn't pay for connecting; does nothing by default
+
+        Args:
+            system: System instruction the next request will be sent with
+        """
+
+
+def _estimate_usage(usage, prompt, system, text):
+    if usage is None:
+        return
+    usage["prompt_tokens"] = estimate_tokens(prompt) + estimate_tokens(system or "")
+    usage["output_tokens"] = estimate_tokens(text)
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["output_tokens"]
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, api_key, model_name="gemini-2.5-flash"):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.genai = genai
+        self.model_name = model_name
+        # One model per system instruction, so the instruction is set up once
+        # and the identical prefix can be served from Gemini's implicit cache
+        self.models = {}
+        self.lock = threading.Lock()
+
+    def _model(self, system):
+        with self.lock:
+            model = self.models.get(system)
+            if model is None:
+                if system:
+                    model = self.genai.GenerativeModel(self.model_name, system_instruction=system)
+                else:
+                    model = self.genai.GenerativeModel(self.model_name)
+                self.models[system] = model
+            return model
+
+    @staticmethod
+    def _fill_usage(usage, response):
+        metadata = getattr(response, "usage_metadata", None)
+        if usage is None or metadata is None:
+            return
+        usage["prompt_tokens"] = metadata.prompt_token_count
+        usage["output_tokens"] = metadata.candidates_token_count
+        usage["total_tokens"] = metadata.total_token_count
+        usage["cached_tokens"] = getattr(metadata, "cached_content_token_count", 0) or 0
+
+    def generate(self, prompt, system=None, usage=None):
+        response = self._model(system).generate_content(prompt)
+        self._fill_usage(usage, response)
+        return response.text
+
+    def stream(self, prompt, system=None, usage=None):
+        for chunk in self._model(system).generate_content(prompt, stream=True):
+            # The final chunk carries the totals for the whole reply
+            self._fill_usage(usage, chunk)
+            yield chunk.text
+
+    def warm(self, system=None):
+        # Token counting is free and goes over the same channel as
+        # generate_content, which sets up the model and the connection
+        self._model(system).count_tokens("ping")
+
+
+def _command_from_prompt(prompt):
+    """Pull the user's command back out of an AIBrain prompt"""
+    found = re.findall(r"User command: (.*)", prompt)
+    return found[-1].strip() if found else prompt.strip()
+
+
+class StubBackend(LLMBackend):
+    """
+    Deterministic local stand-in for Gemini
+
+    Replies are built by a responder function (by default IntentMatcher plus a
+    canned conversation reply) and delivered with configurable first-token
+    latency, jitter, chunking, slow requests and error injection. Seeded, so
+    runs repeat.
+    """
+
+    name = "stub"
+
+    def __init__(self, latency=0.5, jitter=0.0, error_rate=0.0, chunk_chars=16,
+                 chunk_delay=0.02, responder=None, seed=0, token_latency=0.0,
+                 slow_rate=0.0, slow_latency=5.0, connect_latency=0.0, idle_timeout=60.0):
+        """
+        Args:
+            latency: Seconds before the first chunk
+            jitter: Extra random latency, uniform in [0, jitter] seconds
+            error_rate: Probability (0-1) a request raises BackendError
+            chunk_chars: Characters per streamed chunk
+            chunk_delay: Seconds between streamed chunks
+            responder: Function prompt -> reply text
+            seed: Random seed for jitter and errors
+            token_latency: Extra first-chunk seconds per prompt token,
+                           models the cost of long prompts
+            slow_rate: Probability (0-1) a request is stuck for
+                       slow_latency seconds before its first chunk
+            slow_latency: Seconds a slow request takes to start
+            connect_latency: Extra seconds a request (or warm()) pays to
+                             connect when the connection is closed
+            idle_timeout: Seconds without a request after which the
+                          connection is closed
+        """
+        self.latency = latency
+        self.token_latency = token_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.connect_latency = connect_latency
+        self.idle_timeout = idle_timeout
+        self.last_used = None  # time.monotonic() of the last request, None before the first
+        self.connects = 0
+        self.chunk_chars = chunk_chars
+        self.chunk_delay = chunk_delay
+        self.responder = responder or self._default_responder
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.matcher = None
+
+    def _default_responder(self, prompt):
+        if self.matcher is None:
+            from command_executor import APP_PATHS
+            from intent_matcher import IntentMatcher
+            self.matcher = IntentMatcher(APP_PATHS)
+
+        command = _command_from_prompt(prompt)
+        plan = self.matcher.match(command) or {
+            "intent": "conversation",
+            "action": "CONVERSATION",
+            "parameters": {},
+            "response": f"This is the local stand-in. You said: {command}.",
+        }
+        return json.dumps(plan)
+
+    def _wait_first_token(self, prompt_tokens):
+        """First-token delay for one request, or raise an injected error"""
+        with self.lock:
+            failed = self.random.random() < self.error_rate
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            if self.slow_rate and self.random.random() < self.slow_rate:
+                delay += self.slow_latency
+            delay += self._connect()
+        time.sleep(delay + self.token_latency * prompt_tokens)
+        if failed:
+            raise BackendError("Injected stub backend error")
+
+    def _connect(self):
+        """Seconds to connect first, with self.lock held"""
+        now = time.monotonic()
+        cold = self.last_used is None or now - self.last_used > self.idle_timeout
+        self.last_used = now
+        if cold and self.connect_latency:
+            self.connects += 1
+            return self.connect_latency
+        return 0.0
+
+    def warm(self, system=None):
+        with self.lock:
+            delay = self._connect()
+        time.sleep(delay)
+
+    def generate(self, prompt, system=None, usage=None):
+        text = self.responder(prompt)
+        chunks = max(1, -(-len(text) // self.chunk_chars))
+        self._wait_first_token(estimate_tokens(prompt) + estimate_tokens(system or ""))
+        time.sleep(self.chunk_delay * (chunks - 1))
+        _estimate_usage(usage, prompt, system, text)
+        return text
+
+    def stream(self, prompt, system=None, usage=None):
+        text = self.responder(prompt)
+        self._wait_first_token(estimate_tokens(prompt) + estimate_tokens(system or ""))
+        for start in range(0, len(text), self.chunk_chars):
+            if start:
+                time.sleep(self.chunk_delay)
+            yield text[start:start + self.chunk_chars]
+        _estimate_usage(usage, prompt, system, text)
+
+
+class RecordReplayBackend(LLMBackend):
+    """
+    Records real prompt/reply pairs to a JSONL file, or serves them back
+
+    In "record" mode every request goes to the wrapped backend and is
+    appended to the file. In "replay" mode replies come from the file only,
+    optionally with the latency that was recorded.
+    """
+
+    name = "replay"
+
+    def __init__(self, path, mode="replay", backend=None, replay_latency=False):
+        """
+        Args:
+            path: JSONL recordings file
+            mode: "record" or "replay"
+            backend: Backend to record from (required for "record")
+            replay_latency: Sleep for the recorded latency when replaying
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown record/replay mode: {mode}")
+        if mode == "record" and backend is None:
+            raise ValueError("Record mode needs a backend to record from")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.backend = backend
+        self.replay_latency = replay_latency
+        self.name = mode
+        self.lock = threading.Lock()
+        self.recordings = {}
+        self._load()
+
+    @staticmethod
+    def _key(prompt, system):
+        return hashlib.sha256(f"{system or ''}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self.recordings[record["key"]] = record
+
+    def _record(self, prompt, system, text, latency, usage):
+        record = {
+            "key": self._key(prompt, system),
+            "prompt": prompt,
+            "text": text,
+            "latency": round(latency, 4),
+            "usage": usage,
+        }
+        with self.lock:
+            self.recordings[record["key"]] = record
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _lookup(self, prompt, system, usage):
+        record = self.recordings.get(self._key(prompt, system))
+        if record is None:
+            raise BackendError(f"No recording for prompt: {_command_from_prompt(prompt)!r}")
+        if self.replay_latency:
+            time.sleep(record["latency"])
+        if usage is not None:
+            usage.update(record.get("usage") or {})
+        return record["text"]
+
+    def generate(self, prompt, system=None, usage=None):
+        if self.mode == "replay":
+            return self._lookup(prompt, system, usage)
+
+        recorded_usage = {}
+        start = time.perf_counter()
+        text = self.backend.generate(prompt, system, recorded_usage)
+        self._record(prompt, system, text, time.perf_counter() - start, recorded_usage)
+        if usage is not None:
+            usage.update(recorded_usage)
+        return text
+
+    def stream(self, prompt, system=None, usage=None):
+        if self.mode == "replay":
+            yield self._lookup(prompt, system, usage)
+            return
+
+        recorded_usage = {}
+        start = time.perf_counter()
+        chunks = []
+        for chunk in self.backend.stream(prompt, system, recorded_usage):
+            chunks.append(chunk)
+            yield chunk
+        self._record(prompt, system, "".join(chunks), time.perf_counter() - start, recorded_usage)
+        if usage is not None:
+            usage.update(recorded_usage)
+
+    def warm(self, system=None):
+        if self.mode == "record":
+            self.backend.warm(system)
+
+
+def create_backend(settings):
+    """
+    Build the backend selected by Settings.LLM_BACKEND
+
+    Returns:
+        LLMBackend
+    """
+    kind = settings.LLM_BACKEND
+    if kind == "gemini":
+        return GeminiBackend(settings.GEMINI_API_KEY)
+    if kind == "stub":
+        return StubBackend(
+            latency=settings.STUB_LATENCY,
+            jitter=settings.STUB_JITTER,
+            error_rate=settings.STUB_ERROR_RATE,
+            slow_rate=settings.STUB_SLOW_RATE,
+            slow_latency=settings.STUB_SLOW_LATENCY,
+            connect_latency=settings.STUB_CONNECT_LATENCY,
+        )
+    if kind in ("record", "replay"):
+        backend = GeminiBackend(settings.GEMINI_API_KEY) if kind == "record" else None
+        return RecordReplayBackend(settings.LLM_RECORDINGS, mode=kind, backend=backend)
+    raise ValueError(f"Unknown LLM_BACKEND: {kind}")
@@ -7,79 +7,366 @@ import os
 import sys
 from pathlib import Path
 from colorama import init, Fore, Style
-import keyboard
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from voice_input import VoiceInput
-from voice_output import VoiceOutput
+from voice_output import VoiceOutput, URGENT, NORMAL
 from ai_brain import AIBrain
-from command_executor import CommandExecutor
+from actions import ActionRegistry
+from conversation import ConversationMemory
+from command_executor import APP_PATHS, CommandExecutor, plan_steps
+from app_index import AppIndex
+from metrics_history import MetricsHistory
+from note_store import NoteStore
+from system_info import SystemInfo
+from intent_matcher import IntentMatcher
+from response_cache import ResponseCache
+from speculation import Speculator
+from scheduler import CommandScheduler, Cancelled, current_job, LISTENING, THINKING, SPEAKING
+from llm_backends import create_backend
+from resilience import CircuitBreaker, ResilientBackend
+from tracing import Tracer, format_summary
+from warmup import KeepAlive, WarmUp
+import tracing
 from config.settings import Settings
 
 # Initialize colorama for colored terminal output
 init(autoreset=True)
 
+GREETING = "Goku assistant initialized. Press shift space twice to activate me"
+
+# Spoken on every activation, pre-rendered so they play without synthesis
+FIXED_PHRASES = [
+    "I'm listening",
+    "Processing",
+    "I didn't hear anything",
+    GREETING,
+    "Goodbye! Powering down.",
+]
+
 class Goku:
-    def __init__(self):
+    def __init__(self, settings=None, voice_input=None, voice_output=None, backend=None):
+        """
+        Components default to the real devices and the configured backend;
+        passing them in lets benchmarks run the pipeline headless.
+        
+        Args:
+            settings: Settings instance
+            voice_input: VoiceInput (e.g. reading WAV fixtures)
+            voice_output: VoiceOutput (e.g. with the null sink)
+            backend: LLMBackend for the AI brain
+        """
         print(f"{Fore.CYAN}{'='*50}")
         print(f"{Fore.YELLOW}🐉 Initializing GOKU Assistant...{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*50}\n")
         
         # Load settings
-        self.settings = Settings()
-        
-        # Initialize components
-        self.voice_input = VoiceInput()
-        self.voice_output = VoiceOutput()
-        self.ai_brain = AIBrain(self.settings.GEMINI_API_KEY)
-        self.executor = CommandExecutor(self.voice_output)
+        self.started_at = time.perf_counter()
+        self.settings = settings or Settings()
+        self.tracer = Tracer(self.settings.LOGS_DIR, enabled=self.settings.TRACING)
         
         # Hotkey tracking
         self.last_press_time = 0
         self.double_press_window = 0.5  # 500ms window for double press
+        
+        # The hotkey only posts events, commands run as jobs on the workers;
+        # one listens at a time while earlier ones think or speak
+        self.scheduler = CommandScheduler(workers=self.settings.SCHEDULER_WORKERS)
+        self.listen_lock = threading.Lock()
         self.is_listening = False
         
+        # Component name -> builder; actions, executor and intent_matcher use the others
+        builders = {
+            "actions": self._build_actions,
+            "voice_input": lambda: voice_input or VoiceInput(
+                capture_seconds=self.settings.AUDIO_CAPTURE_SECONDS,
+                preroll=self.settings.AUDIO_PREROLL,
+                vad_aggressiveness=self.settings.VAD_AGGRESSIVENESS if self.settings.VAD_ENDPOINTING else None,
+                streaming=self._build_streaming_stt(),
+                track_noise=self.settings.NOISE_TRACKING,
+            ),
+            "voice_output": lambda: voice_output or self._build_voice_output(),
+            "ai_brain": lambda: self._build_ai_brain(backend),
+            "system_info": self._build_system_info,
+            "executor": lambda: CommandExecutor(
+                self._component("voice_output"),
+                system_info=self._component("system_info"),
+                action_timeout=self.settings.ACTION_TIMEOUT,
+                app_index=self._build_app_index(),
+                notes=NoteStore(self.settings.DATA_DIR / 'notes.db', legacy_file=self.settings.DATA_DIR / 'notes.txt'),
+                actions=self._component("actions"),
+            ),
+            "intent_matcher": lambda: self._build_intent_matcher(self._component("executor")),
+            "speculator": self._build_speculator,
+        }
+        self.startup_lock = threading.Lock()
+        self.pending = {}
+        
+        # A first press warms up what the command will need, the second
+        # claims it; the LLM keep-alive starts once the AI brain is built
+        self.warmup = None
+        if self.settings.HOTKEY_WARMUP:
+            self.warmup = WarmUp([
+                (lambda: self._component("voice_input").warm(), lambda: self._component("voice_input").release()),
+                (lambda: self._component("ai_brain").warm(), None),
+                (lambda: self._component("voice_output").warm(["I'm listening"]), None),
+            ], hold=self.settings.WARMUP_HOLD)
+        self.keepalive = None
+        
+        if self.settings.FAST_STARTUP:
+            # Independent components build side by side (microphone
+            # calibration, TTS engine, Gemini SDK); start() registers the
+            # hotkey before waiting for them
+            self.startup_pool = ThreadPoolExecutor(max_workers=len(builders), thread_name_prefix="startup")
+            for name, build in builders.items():
+                self.pending[name] = self.startup_pool.submit(build)
+        else:
+            for name, build in builders.items():
+                setattr(self, name, build())
+            self._start_keepalive()
+            self._report_ready()
+    
+    def _component(self, name):
+        """A component, waiting for it if it is still being built"""
+        future = self.pending.get(name)
+        return future.result() if future is not None else getattr(self, name)
+    
+    def _build_voice_output(self):
+        phrase_cache_dir = None
+        if self.settings.TTS_PHRASE_CACHE:
+            phrase_cache_dir = self.settings.DATA_DIR / 'tts_cache'
+        voice_output = VoiceOutput(phrase_cache_dir=phrase_cache_dir)
+        voice_output.prerender(FIXED_PHRASES)
+        return voice_output
+    
+    def _build_actions(self):
+        # Plugins are only read here (installed ones found through package
+        # metadata), each is imported when one of its actions first runs
+        return ActionRegistry(
+            plugin_dirs=[self.settings.PLUGIN_DIR],
+            entry_points=self.settings.PLUGIN_ENTRY_POINTS,
+        )
+    
+    def _build_ai_brain(self, backend):
+        self.response_cache = None
+        if self.settings.RESPONSE_CACHE:
+            self.response_cache = ResponseCache(
+                self.settings.DATA_DIR / 'response_cache.json',
+                max_entries=self.settings.CACHE_MAX_ENTRIES,
+                plan_ttl=self.settings.CACHE_PLAN_TTL,
+                chat_ttl=self.settings.CACHE_CHAT_TTL,
+            )
+        memory = None
+        if self.settings.CONVERSATION_MEMORY:
+            memory = ConversationMemory(
+                max_tokens=self.settings.CONVERSATION_TOKENS,
+                idle_timeout=self.settings.CONVERSATION_TIMEOUT,
+            )
+        backend = backend or create_backend(self.settings)
+        if self.settings.LLM_RESILIENCE:
+            backend = ResilientBackend(
+                backend,
+                timeout=self.settings.LLM_TIMEOUT,
+                retries=self.settings.LLM_RETRIES,
+                hedge=self.settings.LLM_HEDGE,
+                breaker=CircuitBreaker(self.settings.BREAKER_THRESHOLD, self.settings.BREAKER_RESET),
+            )
+        return AIBrain(
+            cache=self.response_cache,
+            backend=backend,
+            prompt_style=self.settings.PROMPT_STYLE,
+            memory=memory,
+            actions=self._component("actions"),
+        )
+    
+    def _build_system_info(self):
+        history = None
+        if self.settings.METRICS_HISTORY and self.settings.STATS_SAMPLE_INTERVAL > 0:
+            history = MetricsHistory(self.settings.DATA_DIR / 'metrics_history.bin')
+        system_info = SystemInfo(history=history)
+        if self.settings.STATS_SAMPLE_INTERVAL > 0:
+            system_info.start_sampler(self.settings.STATS_SAMPLE_INTERVAL)
+        return system_info
+    
+    def _build_app_index(self):
+        if not self.settings.APP_INDEX:
+            return None
+        return AppIndex(self.settings.DATA_DIR / 'app_index.json', builtins=APP_PATHS)
+    
+    def _build_intent_matcher(self, executor):
+        # Local fast path for common commands (None disables it)
+        if not self.settings.LOCAL_INTENTS:
+            return None
+        resolve_app = executor.apps.resolve if executor.apps is not None else None
+        return IntentMatcher(executor.app_paths, resolve_app=resolve_app)
+    
+    def _build_streaming_stt(self):
+        if self.settings.STT_BACKEND == "google":
+            return None
+        if self.settings.STT_BACKEND == "vosk":
+            from streaming_stt import VoskRecognizer
+            return VoskRecognizer(self.settings.VOSK_MODEL)
+        raise ValueError(f"Unknown STT_BACKEND: {self.settings.STT_BACKEND}")
+    
+    def _build_speculator(self):
+        # Partial transcripts only come from a streaming recognizer
+        if not self.settings.SPECULATIVE_INTENTS or self._component("voice_input").streaming is None:
+            return None
+        ai_brain = self._component("ai_brain")
+        intent_matcher = self._component("intent_matcher")
+        
+        def resolve(command):
+            # Partials that match locally cost nothing, the rest ask for a plan
+            return (intent_matcher and intent_matcher.match(command)) or ai_brain.process_command(command, speculative=True)
+        # Only plans that are used go into the response cache
+        return Speculator(resolve, keep=ai_brain.cache_plan)
+    
+    def wait_until_ready(self):
+        """
+        Block until every component is built
+        
+        Raises whatever a component raised while building. Returns at once
+        once startup has finished.
+        """
+        with self.startup_lock:
+            if not self.pending:
+                return
+            try:
+                for name, future in self.pending.items():
+                    setattr(self, name, future.result())
+            finally:
+                self.startup_pool.shutdown(wait=False)
+            self.pending = {}
+            self._start_keepalive()
+            self._report_ready()
+    
+    def _start_keepalive(self):
+        if self.settings.LLM_KEEPALIVE > 0:
+            self.keepalive = KeepAlive(self.ai_brain.warm, lambda: self.ai_brain.last_used,
+                                       interval=self.settings.LLM_KEEPALIVE)
+    
+    def _report_ready(self):
+        self.ready_seconds = time.perf_counter() - self.started_at
         print(f"{Fore.GREEN}✓ Voice Input Ready")
         print(f"{Fore.GREEN}✓ Voice Output Ready")
-        print(f"{Fore.GREEN}✓ AI Brain Connected")
-        print(f"{Fore.GREEN}✓ Command Executor Ready\n")
+        print(f"{Fore.GREEN}✓ AI Brain Connected ({self.ai_brain.backend.name})")
+        print(f"{Fore.GREEN}✓ Command Executor Ready ({self.ready_seconds:.2f} s)\n")
         
     def on_hotkey(self):
-        """Handle Shift+Space double press"""
-        current_time = time.time()
+        """Handle Shift+Space on the keyboard hook's thread, which never waits"""
+        self.scheduler.post(self._on_press, time.perf_counter())
+    
+    def on_cancel_hotkey(self):
+        """Handle the cancel hotkey on the keyboard hook's thread"""
+        self.scheduler.post(self.cancel)
+    
+    def _on_press(self, pressed_at):
+        """Double press detection, on the scheduler's dispatcher thread"""
+        if pressed_at - self.last_press_time <= self.double_press_window:
+            # Double press detected! Talking over Goku cuts it off, earlier
+            # commands still finish their actions but say nothing more
+            if self._claim_microphone():
+                try:
+                    if self.warmup is not None:
+                        self.warmup.claim()
+                    self.scheduler.interrupt_all()
+                    self._stop_speaking()
+                    self.scheduler.submit(self._activation, pressed_at)
+                except Exception:
+                    # No activation will run to give the microphone back
+                    self._release_microphone()
+                    raise
+        elif self.warmup is not None:
+            # Probably the first of two presses, open things up meanwhile
+            self.warmup.start()
         
-        # Check if this is a double press
-        if current_time - self.last_press_time <= self.double_press_window:
-            # Double press detected!
-            if not self.is_listening:
-                self.activate_listening()
+        self.last_press_time = pressed_at
+    
+    def cancel(self):
+        """Cancel every command in flight and stop talking"""
+        cancelled = self.scheduler.cancel_all()
+        self._stop_speaking()
+        if cancelled:
+            print(f"\n{Fore.RED}[Cancelled - Press Shift+Space twice to activate]{Style.RESET_ALL}\n")
+    
+    def _stop_speaking(self):
+        """Cut off speech, once there is a voice output (nothing is spoken before)"""
+        if not self.pending:
+            self.voice_output.cancel_all()
+    
+    def _claim_microphone(self):
+        """True if no other activation is listening, which then this one is"""
+        with self.listen_lock:
+            if self.is_listening:
+                return False
+            self.is_listening = True
+            return True
+    
+    def _release_microphone(self):
+        with self.listen_lock:
+            self.is_listening = False
+    
+    def activate_listening(self, pressed_at=None):
+        """
+        Activate listening mode on this thread, bypassing the queue
+        
+        Returns once the reply is queued, it may still be playing.
         
-        self.last_press_time = current_time
+        Args:
+            pressed_at: time.perf_counter() of the hotkey press, for tracing
+        """
+        if self._claim_microphone():
+            self.scheduler.run(self._activation, pressed_at)
     
-    def activate_listening(self):
-        """Activate listening mode"""
-        if self.is_listening:
-            return
+    def _activation(self, pressed_at=None):
+        """One command from prompt to reply, run as a scheduler job"""
+        job = current_job()
+        try:
+            if self.pending:
+                print(f"{Fore.YELLOW}[Still starting up...]{Style.RESET_ALL}")
+            self.wait_until_ready()
+            trace = self.tracer.start_request()
+            if pressed_at is not None:
+                trace.add("hotkey", pressed_at, time.perf_counter() - pressed_at)
+            trace.add("queue", job.enqueued_at, job.started_at - job.enqueued_at)
             
-        self.is_listening = True
-        print(f"\n{Fore.GREEN}🐉 GOKU ACTIVATED!{Style.RESET_ALL}")
-        self.voice_output.speak("I'm listening")
-        
-        # Listen for command
-        print(f"{Fore.YELLOW}[Listening for command...]{Style.RESET_ALL}")
-        command = self.voice_input.listen(timeout=10, phrase_time_limit=15)
+            # The reply may still be playing when this returns, the trace
+            # ends when the job does
+            command = None
+            job.add_done_callback(lambda job: trace.finish(
+                command=command, barged_in=job.interrupted.is_set(), cancelled=job.cancelled.is_set()))
+            job.enter(LISTENING)
+            
+            print(f"\n{Fore.GREEN}🐉 GOKU ACTIVATED!{Style.RESET_ALL}")
+            # Open the microphone while the prompt plays
+            prompt = self.say("I'm listening", priority=URGENT)
+            
+            # Listen for command, resolving stable partial transcripts meanwhile
+            print(f"{Fore.YELLOW}[Listening for command...]{Style.RESET_ALL}")
+            on_partial = None
+            if self.speculator:
+                self.speculator.begin()
+                on_partial = self.speculator.on_partial
+            command = self.voice_input.listen(timeout=10, phrase_time_limit=15, wait_for=prompt,
+                                              on_partial=on_partial, cancel=job.cancelled)
+        finally:
+            # The next activation may listen while this one thinks
+            self._release_microphone()
         
+        job.check()
         if command:
             print(f"{Fore.CYAN}You: {command}{Style.RESET_ALL}")
-            self.process_command(command)
+            self.process_command(command, speculation=self.speculator)
         else:
             print(f"{Fore.RED}No command detected{Style.RESET_ALL}")
-            self.voice_output.speak("I didn't hear anything")
+            self.say("I didn't hear anything")
         
-        self.is_listening = False
+        job.enter(SPEAKING)
         print(f"\n{Fore.CYAN}[Ready - Press Shift+Space twice to activate]{Style.RESET_ALL}\n")
     
     def start(self):
@@ -89,46 +376,223 @@ class Goku:
         print(f"{Fore.CYAN}Press Shift+Space TWICE to activate!")
         print(f"{Fore.MAGENTA}{'='*50}\n")
         
-        self.voice_output.speak("Goku assistant initialized. Press shift space twice to activate me")
-        
-        # Register hotkey
+        # Register the hotkey first, presses during startup wait for it
+        import keyboard
         keyboard.add_hotkey('shift+space', self.on_hotkey, suppress=True)
+        keyboard.add_hotkey(self.settings.CANCEL_HOTKEY, self.on_cancel_hotkey, suppress=True)
+        
+        try:
+            self.wait_until_ready()
+        except Exception:
+            keyboard.unhook_all()
+            raise
+        self.voice_output.speak(GREETING)
         
         try:
             # Keep running
             print(f"{Fore.GREEN}✓ Goku is active and waiting for your command{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}Press Ctrl+C to exit\n{Style.RESET_ALL}")
+            print(f"{Fore.CYAN}Press {self.settings.CANCEL_HOTKEY} to cancel a command, Ctrl+C to exit\n{Style.RESET_ALL}")
             keyboard.wait()  # Wait forever
             
         except KeyboardInterrupt:
             print(f"\n\n{Fore.RED}Shutting down Goku...{Style.RESET_ALL}")
-            self.voice_output.speak("Goodbye! Powering down.")
+            self.report_stats()
+            self.scheduler.cancel_all()
+            self.scheduler.shutdown(wait=False)
+            self.voice_output.cancel_all()
+            self.voice_output.speak("Goodbye! Powering down.").wait()
+            self.system_info.stop_sampler()
+            if self.keepalive is not None:
+                self.keepalive.stop()
+            self.executor.notes.close()
+            self.voice_input.close()
+            self.tracer.close()
             keyboard.unhook_all()
     
-    def process_command(self, command):
-        """Process user command through AI brain"""
+    def report_stats(self):
+        """Print cache hit/miss counts, LLM token usage and pipeline latency"""
+        if self.response_cache:
+            stats = self.response_cache.stats()
+            print(f"{Fore.CYAN}Response cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%} hit rate, {stats['size']} entries){Style.RESET_ALL}")
+        
+        if self.voice_output.phrases:
+            stats = self.voice_output.phrases.stats()
+            print(f"{Fore.CYAN}TTS phrase cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['pinned']} fixed, {stats['repeated']} repeated phrases){Style.RESET_ALL}")
+        
+        if self.speculator:
+            stats = self.speculator.stats()
+            print(f"{Fore.CYAN}Speculation: {stats['attempts']} started, {stats['committed']} used, "
+                  f"{stats['discarded']} discarded{Style.RESET_ALL}")
+        
+        stats = self.scheduler.stats()
+        if stats['completed'] or stats['cancelled']:
+            jobs, events = stats['jobs'], stats['events']
+            print(f"{Fore.CYAN}Scheduler: {stats['completed']} commands, {stats['cancelled']} cancelled, "
+                  f"queue depth max {jobs['max_depth']}, wait p50 {jobs['wait']['p50'] * 1000:.1f} ms / "
+                  f"p95 {jobs['wait']['p95'] * 1000:.1f} ms, hotkey events p95 "
+                  f"{events['wait']['p95'] * 1000:.1f} ms{Style.RESET_ALL}")
+        
+        usage = self.ai_brain.usage.summary()
+        if usage['calls']:
+            speculative = usage['kinds'].get('plan_speculative', 0)
+            speculative = f" ({speculative} speculative)" if speculative else ""
+            print(f"{Fore.CYAN}LLM usage: {usage['calls']} calls{speculative}, {usage['total_tokens']} tokens "
+                  f"({usage['avg_prompt_tokens']:.0f} prompt / {usage['avg_output_tokens']:.0f} output per call, "
+                  f"{usage['avg_latency'] * 1000:.0f} ms avg){Style.RESET_ALL}")
+        
+        if isinstance(self.ai_brain.backend, ResilientBackend):
+            stats = self.ai_brain.backend.stats()
+            print(f"{Fore.CYAN}LLM resilience: {stats['retries']} retries, {stats['hedges']} hedged "
+                  f"({stats['hedge_wins']} won, after {stats['hedge_delay'] * 1000:.0f} ms), "
+                  f"{stats['timeouts']} timed out, {stats['failures']} failed, circuit {stats['circuit']} "
+                  f"({stats['rejected']} failed fast){Style.RESET_ALL}")
+        
+        if self.warmup is not None:
+            stats = self.warmup.stats()
+            print(f"{Fore.CYAN}Warm-up: {stats['started']} started on a first press, {stats['claimed']} used, "
+                  f"{stats['released']} released unused{Style.RESET_ALL}")
+        if self.keepalive is not None:
+            print(f"{Fore.CYAN}LLM keep-alive: {self.keepalive.pings} pings while idle{Style.RESET_ALL}")
+        
+        stages = self.tracer.summary()
+        if stages:
+            print(f"{Fore.CYAN}Pipeline latency:\n{format_summary(stages)}{Style.RESET_ALL}")
+    
+    def say(self, text, priority=NORMAL):
+        """
+        Queue speech for the command running on this thread, which stays
+        in flight until it has been spoken
+        
+        Returns:
+            SpeechHandle, or None if the user has barged in since
+        """
+        job = current_job()
+        if job is not None and job.interrupted.is_set():
+            return None
+        speech = self.voice_output.speak(text, priority)
+        if job is not None:
+            job.wait_for(speech)
+        return speech
+    
+    def process_command(self, command, speculation=None):
+        """
+        Process user command through AI brain
+        
+        Args:
+            command: User's voice command
+            speculation: Optional Speculator that may already have resolved
+                         the command from partial transcripts
+        """
+        job = current_job()
         try:
-            # Get AI interpretation and execution plan
-            print(f"{Fore.MAGENTA}[Processing with AI...]{Style.RESET_ALL}")
-            self.voice_output.speak("Processing")
+            if job is not None:
+                job.enter(THINKING)
+            
+            # Try the local matcher first, only unmatched commands go to Gemini
+            response = None
+            if self.intent_matcher:
+                response = self.intent_matcher.match(command)
+            planned = None
+            if speculation:
+                # A local match is instant, speculation is only kept for Gemini
+                planned = speculation.commit(None if response else command)
             
-            response = self.ai_brain.process_command(command)
+            if response:
+                actions = ", ".join(step["action"] for step in plan_steps(response))
+                print(f"{Fore.MAGENTA}[Matched locally: {actions}]{Style.RESET_ALL}")
+                # Follow-ups to it still go to Gemini, which has to know about it
+                self.ai_brain.remember(command, response)
+            elif planned is not None:
+                print(f"{Fore.MAGENTA}[Resolved while you were speaking]{Style.RESET_ALL}")
+                if not planned.done():
+                    self.say("Processing")
+                with tracing.stage("ai"):
+                    response = planned.result()
+                self.ai_brain.remember(command, response)
+            else:
+                # Get AI interpretation and execution plan
+                print(f"{Fore.MAGENTA}[Processing with AI...]{Style.RESET_ALL}")
+                # Announce while the request is in flight instead of before it
+                self.say("Processing")
+                
+                if self.settings.STREAM_RESPONSES:
+                    self.process_streaming(command)
+                    return
+                
+                with tracing.stage("ai"):
+                    response = self.ai_brain.process_command(command)
+            
+            # Cancelled while thinking: the plan is dropped unexecuted
+            if job is not None:
+                job.check()
             
             # Execute the command
-            result = self.executor.execute(response)
+            with tracing.stage("execute"):
+                result = self.executor.execute(response)
             
             # Always speak the response
             if result['success']:
                 print(f"{Fore.GREEN}Goku: {result['message']}{Style.RESET_ALL}")
-                self.voice_output.speak(result['message'])
+                self.say(result['message'])
             else:
                 print(f"{Fore.RED}Goku: {result['message']}{Style.RESET_ALL}")
-                self.voice_output.speak(f"Sorry, I encountered an issue: {result['message']}")
-                
+                self.say(f"Sorry, I encountered an issue: {result['message']}")
+        
+        except Cancelled:
+            print(f"{Fore.RED}[Cancelled: {command}]{Style.RESET_ALL}")
         except Exception as e:
             error_msg = f"I couldn't process that command: {str(e)}"
             print(f"{Fore.RED}Error: {error_msg}{Style.RESET_ALL}")
-            self.voice_output.speak(error_msg)
+            self.say(error_msg)
+    
+    def process_streaming(self, command):
+        """
+        Process a command with a streamed AI reply
+        
+        The action runs as soon as the plan is parsed, and the response is
+        spoken sentence by sentence while the rest of the reply arrives.
+        
+        Args:
+            command: User's voice command
+        """
+        state = {"result": None, "pending": []}
+        job = current_job()
+        
+        def on_action(command_data):
+            if job is not None and job.cancelled.is_set():
+                return
+            # With response=None the executor returns message None for actions
+            # that only speak the AI response, which then streams in below
+            with tracing.stage("execute"):
+                result = self.executor.execute(dict(command_data, response=None))
+            state["result"] = result
+            
+            if result['message'] is None:
+                for sentence in state["pending"]:
+                    self.say(sentence)
+            elif result['success']:
+                print(f"{Fore.GREEN}Goku: {result['message']}{Style.RESET_ALL}")
+                self.say(result['message'])
+            else:
+                print(f"{Fore.RED}Goku: {result['message']}{Style.RESET_ALL}")
+                self.say(f"Sorry, I encountered an issue: {result['message']}")
+        
+        def on_sentence(sentence):
+            if state["result"] is None:
+                state["pending"].append(sentence)
+            elif state["result"]['message'] is None:
+                self.say(sentence)
+        
+        # Streamed stages overlap: "execute" and "speak" start inside "ai"
+        with tracing.stage("ai"):
+            command_data = self.ai_brain.process_command_stream(command, on_action, on_sentence)
+        if job is not None:
+            job.check()
+        
+        if state["result"]['message'] is None:
+            print(f"{Fore.GREEN}Goku: {command_data.get('response', '')}{Style.RESET_ALL}")
 
 def main():
     """Entry point"""
@@ -0,0 +1,215 @@
+"""
+Metrics History Module
+Bounded, multi-resolution history of system metrics with range queries
+
+Every sample updates per-second, per-minute and per-hour rings of
+pre-aggregated min/max/sum/count, kept in fixed-size typed arrays. Range
+queries read the finest ring that still covers the range, so an hour-long
+question touches at most a few thousand slots and never raw samples.
+"""
+
+import os
+import struct
+import threading
+import time
+from array import array
+from pathlib import Path
+
+METRICS = ("cpu", "memory", "disk")
+
+# (name, seconds per slot, slots kept)
+LEVELS = (
+    ("second", 1, 3600),     # last hour
+    ("minute", 60, 1440),    # last day
+    ("hour", 3600, 720),     # last 30 days
+)
+
+MAGIC = b"GKMH"
+VERSION = 1
+HEADER = struct.Struct("<4sHHH")
+LEVEL_HEADER = struct.Struct("<IIi")
+
+
+class _Ring:
+    """Fixed-size ring of aggregated slots at one resolution"""
+
+    def __init__(self, step, size):
+        self.step = step
+        self.size = size
+        self.head = -1  # index of the newest slot
+        self.times = array("I", [0]) * size
+        self.counts = array("I", [0]) * size
+        self.mins = {metric: array("f", [0.0]) * size for metric in METRICS}
+        self.maxs = {metric: array("f", [0.0]) * size for metric in METRICS}
+        self.sums = {metric: array("f", [0.0]) * size for metric in METRICS}
+
+    def arrays(self):
+        """Every buffer, in file order"""
+        buffers = [self.times, self.counts]
+        for metric in METRICS:
+            buffers += [self.mins[metric], self.maxs[metric], self.sums[metric]]
+        return buffers
+
+    def add(self, timestamp, values):
+        bucket = int(timestamp) // self.step * self.step
+        if self.head >= 0 and bucket < self.times[self.head]:
+            return  # Out of order (clock went back), drop it
+
+        if self.head < 0 or self.times[self.head] != bucket:
+            self.head = (self.head + 1) % self.size
+            self.times[self.head] = bucket
+            self.counts[self.head] = 0
+
+        slot = self.head
+        first = self.counts[slot] == 0
+        self.counts[slot] += 1
+        for metric in METRICS:
+            value = values[metric]
+            if first:
+                self.mins[metric][slot] = self.maxs[metric][slot] = value
+                self.sums[metric][slot] = value
+            else:
+                self.mins[metric][slot] = min(self.mins[metric][slot], value)
+                self.maxs[metric][slot] = max(self.maxs[metric][slot], value)
+                self.sums[metric][slot] += value
+
+    def covers(self, start):
+        """True if no data at or after start has been overwritten yet"""
+        if self.head < 0:
+            return True
+        oldest = (self.head + 1) % self.size
+        if self.counts[oldest] == 0:
+            return True  # Not wrapped yet, everything is still here
+        return self.times[oldest] <= start
+
+    def slots(self, start, end):
+        """Indexes of slots overlapping [start, end], newest first"""
+        if self.head < 0:
+            return
+        for i in range(self.size):
+            slot = (self.head - i) % self.size
+            if self.counts[slot] == 0:
+                break
+            slot_time = self.times[slot]
+            if slot_time + self.step <= start:
+                break
+            if slot_time <= end:
+                yield slot
+
+
+class MetricsHistory:
+    def __init__(self, path=None):
+        """
+        Args:
+            path: Binary file to persist to, None keeps it in memory only
+        """
+        self.path = Path(path) if path else None
+        self.rings = {name: _Ring(step, size) for name, step, size in LEVELS}
+        self.lock = threading.Lock()
+        if self.path:
+            self.load()
+
+    def add(self, timestamp, values):
+        """
+        Record one sample
+
+        Args:
+            timestamp: Epoch seconds
+            values: Dict with a percentage for every metric in METRICS
+        """
+        with self.lock:
+            for ring in self.rings.values():
+                ring.add(timestamp, values)
+
+    def query(self, metric, start, end=None):
+        """
+        Min/max/average of a metric over a time range
+
+        Args:
+            metric: One of METRICS
+            start: Range start, epoch seconds
+            end: Range end, epoch seconds (default now)
+
+        Returns:
+            dict: min, max, avg, peak_time (start of the slot holding the
+                  max), samples and resolution, or None without data
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        end = end if end is not None else time.time()
+
+        with self.lock:
+            # Finest resolution that still reaches back to start
+            ring_name = LEVELS[-1][0]
+            for name, _, _ in LEVELS:
+                if self.rings[name].covers(start):
+                    ring_name = name
+                    break
+            ring = self.rings[ring_name]
+
+            count, total = 0, 0.0
+            low, high, peak_time = None, None, None
+            for slot in ring.slots(start, end):
+                count += ring.counts[slot]
+                total += ring.sums[metric][slot]
+                if low is None or ring.mins[metric][slot] < low:
+                    low = ring.mins[metric][slot]
+                if high is None or ring.maxs[metric][slot] > high:
+                    high, peak_time = ring.maxs[metric][slot], ring.times[slot]
+
+        if not count:
+            return None
+        return {
+            "min": round(low, 1),
+            "max": round(high, 1),
+            "avg": round(total / count, 1),
+            "peak_time": peak_time,
+            "samples": count,
+            "resolution": ring_name,
+        }
+
+    def save(self):
+        """Write every ring to the binary file atomically"""
+        if not self.path:
+            return
+        with self.lock:
+            chunks = [HEADER.pack(MAGIC, VERSION, len(LEVELS), len(METRICS))]
+            for name, step, size in LEVELS:
+                ring = self.rings[name]
+                chunks.append(LEVEL_HEADER.pack(step, size, ring.head))
+                chunks.extend(buffer.tobytes() for buffer in ring.arrays())
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.path.with_suffix(".tmp")
+            tmp_file.write_bytes(b"".join(chunks))
+            os.replace(tmp_file, self.path)
+        except OSError as e:
+            print(f"Could not save metrics history: {e}")
+
+    def load(self):
+        """Load rings from the binary file, ignoring it if the layout changed"""
+        try:
+            data = self.path.read_bytes()
+            magic, version, levels, metrics = HEADER.unpack_from(data, 0)
+            if (magic, version, levels, metrics) != (MAGIC, VERSION, len(LEVELS), len(METRICS)):
+                return
+
+            offset = HEADER.size
+            rings = {}
+            for name, step, size in LEVELS:
+                saved_step, saved_size, head = LEVEL_HEADER.unpack_from(data, offset)
+                offset += LEVEL_HEADER.size
+                if (saved_step, saved_size) != (step, size):
+                    return
+                ring = _Ring(step, size)
+                ring.head = head
+                for buffer in ring.arrays():
+                    length = size * buffer.itemsize
+                    buffer[:] = array(buffer.typecode, data[offset:offset + length])
+                    offset += length
+                rings[name] = ring
+        except (OSError, struct.error, ValueError):
+            return
+
+        with self.lock:
+            self.rings = rings
@@ -0,0 +1,204 @@
+"""
+Note Store Module
+Notes in SQLite with a full-text index, searchable by keyword and date
+
+Notes are appended to a table keyed by time and indexed incrementally in an
+FTS5 table as they are written, so a keyword search or "my last five notes"
+reads a handful of index pages however many notes there are. Writes are
+grouped: notes added within flush_delay of each other are committed in one
+transaction, and every read commits what is pending first.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_created ON notes (created);
+"""
+
+# External-content index over notes.text; prefix indexes make "meet*" cheap
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    text, content='notes', content_rowid='id', prefix='2 3'
+);
+"""
+
+# Lines of the notes.txt the executor used to append to
+_LEGACY_LINE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] (.*)$")
+_WORD = re.compile(r"\w+")
+
+
+class NoteStore:
+    def __init__(self, path, legacy_file=None, flush_delay=0.5, batch_size=256):
+        """
+        Args:
+            path: SQLite database file, ":memory:" for a throwaway store
+            legacy_file: notes.txt to import when the store is still empty
+            flush_delay: Seconds a note may wait to be committed with others
+            batch_size: Pending notes that are committed without waiting
+        """
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.flush_delay = flush_delay
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+        self.pending = []  # (created, text) not committed yet
+        self.timer = None
+
+        self.db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        try:
+            self.db.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5, searches scan the notes instead
+            print(f"Full-text note search unavailable: {e}")
+            self.fts = False
+
+        if legacy_file is not None and len(self) == 0:
+            self._import(Path(legacy_file))
+
+    def _import(self, legacy_file):
+        if not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, encoding="utf-8") as f:
+                for line in f:
+                    found = _LEGACY_LINE.match(line.rstrip("\n"))
+                    if found:
+                        created = datetime.strptime(found.group(1), "%Y-%m-%d %H:%M:%S").timestamp()
+                        self.add(found.group(2), created=created)
+            self.flush()
+        except (OSError, ValueError) as e:
+            print(f"Could not import {legacy_file}: {e}")
+
+    def add(self, text, created=None):
+        """
+        Save a note, committed within flush_delay
+
+        Args:
+            text: The note
+            created: Unix time, defaults to now
+
+        Returns:
+            float: The note's time
+        """
+        created = time.time() if created is None else created
+        with self.lock:
+            self.pending.append((created, text))
+            if len(self.pending) >= self.batch_size:
+                self._flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.flush_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        return created
+
+    def flush(self):
+        """Commit pending notes in one transaction"""
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        try:
+            self.db.execute("BEGIN")
+            last_id = self.db.execute("SELECT coalesce(max(id), 0) FROM notes").fetchone()[0]
+            self.db.executemany("INSERT INTO notes (created, text) VALUES (?, ?)", pending)
+            if self.fts:
+                self.db.execute("INSERT INTO notes_fts (rowid, text) SELECT id, text FROM notes WHERE id > ?",
+                                (last_id,))
+            self.db.execute("COMMIT")
+        except sqlite3.Error as e:
+            self.db.execute("ROLLBACK")
+            self.pending = pending + self.pending
+            print(f"Could not save notes: {e}")
+
+    def recent(self, count=5, since=None, until=None):
+        """
+        The latest notes, newest first
+
+        Args:
+            count: Notes returned at most
+            since: Only notes from this Unix time on
+            until: Only notes before this Unix time
+
+        Returns:
+            list: {"id", "created", "text"} dicts
+        """
+        where, args = self._range(since, until)
+        sql = f"SELECT id, created, text FROM notes {'WHERE ' + where if where else ''} ORDER BY id DESC LIMIT ?"
+        return self._query(sql, args + [count])
+
+    def search(self, query, since=None, until=None, limit=10):
+        """
+        Notes containing every word of query (as a word or word prefix),
+        newest first
+
+        Args:
+            query: e.g. "dentist", "meeting alex"
+            since: Only notes from this Unix time on
+            until: Only notes before this Unix time
+            limit: Notes returned at most
+
+        Returns:
+            list: {"id", "created", "text"} dicts
+        """
+        words = _WORD.findall(str(query).lower())
+        if not words:
+            return self.recent(limit, since, until)
+        where, args = self._range(since, until, column="notes.created")
+        if self.fts:
+            match = " ".join(f'"{word}"*' for word in words)
+            sql = ("SELECT notes.id, notes.created, notes.text FROM notes_fts "
+                   "JOIN notes ON notes.id = notes_fts.rowid WHERE notes_fts MATCH ?"
+                   f"{' AND ' + where if where else ''} ORDER BY notes_fts.rowid DESC LIMIT ?")
+            return self._query(sql, [match] + args + [limit])
+        likes = " AND ".join("lower(text) LIKE ?" for _ in words)
+        sql = (f"SELECT id, created, text FROM notes WHERE {likes}{' AND ' + where if where else ''} "
+               "ORDER BY id DESC LIMIT ?")
+        return self._query(sql, [f"%{word}%" for word in words] + args + [limit])
+
+    @staticmethod
+    def _range(since, until, column="created"):
+        conditions, args = [], []
+        if since is not None:
+            conditions.append(f"{column} >= ?")
+            args.append(since)
+        if until is not None:
+            conditions.append(f"{column} < ?")
+            args.append(until)
+        return " AND ".join(conditions), args
+
+    def _query(self, sql, args):
+        with self.lock:
+            self._flush()
+            rows = self.db.execute(sql, args).fetchall()
+        return [{"id": row[0], "created": row[1], "text": row[2]} for row in rows]
+
+    def __len__(self):
+        with self.lock:
+            committed = self.db.execute("SELECT count(*) FROM notes").fetchone()[0]
+            return committed + len(self.pending)
+
+    def close(self):
+        """Commit what is pending and close the database"""
+        with self.lock:
+            self._flush()
+            self.db.close()
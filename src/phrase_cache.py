@@ -0,0 +1,229 @@
+"""
+Phrase Cache Module
+Pre-rendered audio for fixed and frequently repeated TTS phrases
+
+Phrases are rendered to WAV once per voice/rate/volume setting and played
+straight from disk, skipping speech synthesis. Each setting gets its own
+directory, so changing the voice invalidates every rendered phrase.
+"""
+
+import hashlib
+import queue
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def find_player():
+    """
+    Low-latency WAV playback for this platform
+
+    Returns:
+        callable: path -> None, blocks until playback ends, or None when no
+                  player is available
+    """
+    try:
+        import winsound
+        return lambda path: winsound.PlaySound(str(path), winsound.SND_FILENAME | winsound.SND_NODEFAULT)
+    except ImportError:
+        pass
+    for command in (["afplay"], ["aplay", "-q"], ["paplay"]):
+        if shutil.which(command[0]):
+            return lambda path, command=command: subprocess.run(command + [str(path)], check=False)
+    return None
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class PhraseCache:
+    def __init__(self, cache_dir, render, signature, max_entries=200, repeat_threshold=2, max_chars=120):
+        """
+        Args:
+            cache_dir: Directory holding one subdirectory per voice setting
+            render: Function (text, path) that writes text as a WAV file
+            signature: Current voice/rate/volume, any repr-able value
+            max_entries: Repeated phrases kept, least recently used evicted
+                         (pinned phrases don't count)
+            repeat_threshold: Times a phrase is spoken before it is rendered
+            max_chars: Longer phrases are never cached
+        """
+        self.cache_dir = Path(cache_dir)
+        self.render = render
+        self.max_entries = max_entries
+        self.repeat_threshold = repeat_threshold
+        self.max_chars = max_chars
+
+        self.pinned = {}  # digest -> text, rendered for every setting
+        self.entries = OrderedDict()  # digest -> path of a repeated phrase
+        self.counts = {}  # digest -> times spoken while uncached
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # Rendering shares the TTS engine, so one phrase at a time
+        self.queue = queue.Queue()
+        self.worker = None
+        self.set_signature(signature)
+
+    def set_signature(self, signature):
+        """Switch to a new voice setting, dropping audio rendered for the old one"""
+        directory = self.cache_dir / _digest(repr(signature))
+        with self.lock:
+            self.directory = directory
+            self.entries.clear()
+            self.counts.clear()
+            pinned = list(self.pinned.values())
+
+        directory.mkdir(parents=True, exist_ok=True)
+        for other in self.cache_dir.iterdir():
+            if other.is_dir() and other != directory:
+                shutil.rmtree(other, ignore_errors=True)
+
+        # Audio kept from an earlier run with the same setting
+        kept = sorted(directory.glob("*.wav"), key=lambda path: path.stat().st_mtime)
+        with self.lock:
+            for path in kept:
+                if path.stem.endswith(".tmp"):
+                    path.unlink(missing_ok=True)
+                elif path.stem not in self.pinned:
+                    self.entries[path.stem] = path
+        self._trim()
+
+        for text in pinned:
+            self._schedule(text)
+
+    def pin(self, phrases):
+        """
+        Render phrases ahead of time and keep them for every setting
+
+        Args:
+            phrases: Texts such as "I'm listening" or "Processing"
+        """
+        for text in phrases:
+            digest = _digest(text)
+            with self.lock:
+                self.pinned[digest] = text
+                self.entries.pop(digest, None)
+            self._schedule(text)
+
+    def has(self, text):
+        """True if text is pinned or already rendered, without counting a lookup"""
+        digest = _digest(text)
+        with self.lock:
+            return digest in self.pinned or digest in self.entries
+
+    def lookup(self, text):
+        """
+        Rendered audio for text
+
+        Returns:
+            Path: WAV file, or None when text has not been rendered yet
+        """
+        digest = _digest(text)
+        with self.lock:
+            path = self.directory / f"{digest}.wav"
+            if digest in self.entries:
+                self.entries.move_to_end(digest)
+            elif digest not in self.pinned:
+                path = None
+            if path is not None and path.exists():
+                self.hits += 1
+                return path
+            self.misses += 1
+            return None
+
+    def preload(self, phrases):
+        """
+        Read rendered phrases back into the OS file cache, so after a long
+        idle spell playing them doesn't wait for the disk (not counted as
+        lookups)
+        """
+        for text in phrases:
+            digest = _digest(text)
+            with self.lock:
+                path = self.directory / f"{digest}.wav"
+                known = digest in self.pinned or digest in self.entries
+            if known:
+                try:
+                    path.read_bytes()
+                except OSError:
+                    pass
+
+    def note(self, text):
+        """Count a live utterance, rendering it once it repeats often enough"""
+        if len(text) > self.max_chars:
+            return
+        digest = _digest(text)
+        with self.lock:
+            if digest in self.entries or digest in self.pinned:
+                return
+            if len(self.counts) >= 1000:
+                self.counts.clear()
+            self.counts[digest] = self.counts.get(digest, 0) + 1
+            if self.counts[digest] < self.repeat_threshold:
+                return
+            del self.counts[digest]
+        self._schedule(text)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "pinned": len(self.pinned),
+                "repeated": len(self.entries),
+            }
+
+    def _schedule(self, text):
+        self.queue.put(text)
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._render_loop, daemon=True)
+                self.worker.start()
+
+    def flush(self):
+        """Wait until every scheduled phrase has been rendered"""
+        self.queue.join()
+
+    def _render_loop(self):
+        while True:
+            text = self.queue.get()
+            try:
+                self._render_one(text)
+            finally:
+                self.queue.task_done()
+
+    def _render_one(self, text):
+        digest = _digest(text)
+        with self.lock:
+            directory = self.directory
+        path = directory / f"{digest}.wav"
+        if not path.exists():
+            # Render beside the target so a half-written file is never played
+            tmp_path = directory / f"{digest}.tmp.wav"
+            try:
+                self.render(text, tmp_path)
+                tmp_path.replace(path)
+            except Exception as e:
+                print(f"Could not pre-render phrase: {e}")
+                return
+
+        with self.lock:
+            if directory != self.directory:
+                return  # The voice changed while rendering
+            if digest not in self.pinned:
+                self.entries[digest] = path
+        self._trim()
+
+    def _trim(self):
+        with self.lock:
+            evicted = []
+            while len(self.entries) > self.max_entries:
+                _, path = self.entries.popitem(last=False)
+                evicted.append(path)
+        for path in evicted:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,289 @@
+"""
+Resilience Module
+Deadlines, retries, hedged requests and a circuit breaker around an LLM
+backend, so a slow or failing API costs the user seconds, not minutes
+
+ResilientBackend wraps any LLMBackend. Each request has a deadline for its
+reply (for streams: for the first chunk and for every chunk after it).
+Attempts that fail or get stuck are retried with jittered exponential
+backoff within the deadline. A request that has not answered by the p95 of recent latencies
+gets one duplicate, and whichever answers first is used. After several
+calls in a row fail, the circuit opens and requests fail at once (AIBrain
+answers with a local fallback) until a trial request gets through.
+"""
+
+import queue
+import random
+import threading
+import time
+from collections import deque
+from llm_backends import BackendError, LLMBackend
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class BackendTimeout(BackendError):
+    """No reply before the deadline"""
+
+
+class CircuitOpen(BackendError):
+    """Not sent: the backend has been failing, the circuit is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=5, reset_after=30.0):
+        """
+        Args:
+            threshold: Failed calls in a row that open the circuit
+            reset_after: Seconds before an open circuit lets a trial call through
+        """
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial = False  # a half-open trial call is in flight
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self):
+        """
+        Returns:
+            bool: False if the call should fail fast
+        """
+        with self.lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.trial:
+                self.trial = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success):
+        with self.lock:
+            self.trial = False
+            if success:
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class _Attempt:
+    """One request to the wrapped backend, on its own thread"""
+
+    def __init__(self, backend, prompt, system, streaming, arrivals):
+        self.usage = {}
+        self.chunks = queue.Queue()
+        self.abandoned = False
+        self.started = time.perf_counter()
+        self.arrivals = arrivals  # shared by the attempts of one call, gets the first event of each
+        self.first = True
+        thread = threading.Thread(target=self._run, args=(backend, prompt, system, streaming),
+                                  name="llm-attempt", daemon=True)
+        thread.start()
+
+    def _put(self, kind, value):
+        if self.first:
+            self.first = False
+            self.arrivals.put((self, kind, value))
+        else:
+            self.chunks.put((kind, value))
+
+    def _run(self, backend, prompt, system, streaming):
+        try:
+            if streaming:
+                for chunk in backend.stream(prompt, system, self.usage):
+                    if self.abandoned:
+                        return
+                    self._put("chunk", chunk)
+            else:
+                self._put("chunk", backend.generate(prompt, system, self.usage))
+            self._put("done", None)
+        except Exception as e:
+            self._put("error", e)
+
+
+class ResilientBackend(LLMBackend):
+    def __init__(self, backend, timeout=8.0, attempt_timeout=None, retries=2, backoff=0.25, hedge=True,
+                 hedge_percentile=0.95, hedge_initial=2.0, hedge_budget=0.1, breaker=None, seed=None):
+        """
+        Args:
+            backend: LLMBackend to wrap
+            timeout: Seconds a call may wait for its reply, or a stream for
+                     its next chunk, retries included
+            attempt_timeout: Seconds one attempt gets before it is given up
+                             and retried, defaults to half of timeout
+            retries: Extra attempts after a failed or stuck one
+            backoff: Base seconds between attempts, doubled each time and
+                     jittered
+            hedge: Send a duplicate of a request that is slower than usual
+            hedge_percentile: Latency percentile (of recent replies) after
+                              which the duplicate is sent
+            hedge_initial: Seconds to hedge after until enough latencies
+                           are known
+            hedge_budget: Fraction of calls that may be hedged, so a slow
+                          backend isn't sent twice the load
+            breaker: CircuitBreaker, defaults to 5 failures / 30 s
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self.attempt_timeout = attempt_timeout or timeout / 2
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_initial = hedge_initial
+        self.hedge_budget = hedge_budget
+        self.breaker = breaker or CircuitBreaker()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.latencies = deque(maxlen=200)  # seconds to the first reply of winning attempts
+        self.counts = {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "timeouts": 0, "failures": 0}
+
+    @property
+    def name(self):
+        return self.backend.name
+
+    def hedge_delay(self):
+        """Seconds after which a duplicate is sent"""
+        with self.lock:
+            if len(self.latencies) < 20:
+                return self.hedge_initial
+            ordered = sorted(self.latencies)
+        return ordered[int(self.hedge_percentile * (len(ordered) - 1))]
+
+    def generate(self, prompt, system=None, usage=None):
+        attempt, kind, value = self._call(prompt, system, streaming=False)
+        if usage is not None:
+            usage.update(attempt.usage)
+        return value
+
+    def stream(self, prompt, system=None, usage=None):
+        attempt, kind, value = self._call(prompt, system, streaming=True)
+        try:
+            while kind != "done":
+                yield value
+                try:
+                    kind, value = attempt.chunks.get(timeout=self.timeout)
+                except queue.Empty:
+                    self._count("timeouts")
+                    raise BackendTimeout(f"Reply stalled for {self.timeout:g} s")
+                if kind == "error":
+                    raise BackendError(f"Reply broke off: {value}")
+        finally:
+            attempt.abandoned = True
+        if usage is not None:
+            usage.update(attempt.usage)
+
+    def warm(self, system=None):
+        # Not counted as a call, and a failing backend isn't woken up
+        if self.breaker.state == CLOSED:
+            self.backend.warm(system)
+
+    def _call(self, prompt, system, streaming):
+        """
+        Run attempts until one replies (its first chunk, for streams)
+
+        Returns:
+            tuple: (winning _Attempt, "chunk" or "done", first chunk)
+
+        Raises:
+            CircuitOpen, BackendTimeout or the last attempt's error
+        """
+        if not self.breaker.allow():
+            raise CircuitOpen("Backend unavailable, failing fast")
+        self._count("calls")
+        deadline = time.perf_counter() + self.timeout
+        error = None
+        for retry in range(self.retries + 1):
+            if retry:
+                # Full jitter keeps retries of many clients from lining up
+                pause = self.random.uniform(0, self.backoff * 2 ** (retry - 1))
+                if time.perf_counter() + pause >= deadline:
+                    break
+                self._count("retries")
+                time.sleep(pause)
+            try:
+                attempt, kind, value = self._race(
+                    prompt, system, streaming, min(deadline, time.perf_counter() + self.attempt_timeout))
+            except Exception as e:
+                error = e
+                continue
+            self.breaker.record(True)
+            return attempt, kind, value
+        self.breaker.record(False)
+        if isinstance(error, BackendTimeout):
+            self._count("timeouts")
+            raise BackendTimeout(f"No reply within {self.timeout:g} s")
+        self._count("failures")
+        raise error if isinstance(error, BackendError) else BackendError(str(error))
+
+    def _race(self, prompt, system, streaming, deadline):
+        """One attempt, plus a duplicate if it is slow; first reply by deadline wins"""
+        arrivals = queue.Queue()
+        running = [_Attempt(self.backend, prompt, system, streaming, arrivals)]
+        hedge_at = running[0].started + self.hedge_delay() if self._may_hedge() else None
+        failed = 0
+        while True:
+            now = time.perf_counter()
+            until = min(deadline, hedge_at) if hedge_at is not None else deadline
+            try:
+                attempt, kind, value = arrivals.get(timeout=max(0.0, until - now))
+            except queue.Empty:
+                if hedge_at is not None and time.perf_counter() < deadline:
+                    hedge_at = None
+                    self._count("hedges")
+                    running.append(_Attempt(self.backend, prompt, system, streaming, arrivals))
+                    continue
+                for attempt in running:
+                    attempt.abandoned = True
+                raise BackendTimeout("Attempt timed out")
+
+            if kind == "error":
+                failed += 1
+                if failed == len(running):
+                    raise value
+                continue
+
+            for other in running:
+                if other is not attempt:
+                    other.abandoned = True
+            if attempt is not running[0]:
+                self._count("hedge_wins")
+            with self.lock:
+                self.latencies.append(time.perf_counter() - attempt.started)
+            return attempt, kind, value
+
+    def _may_hedge(self):
+        if not self.hedge:
+            return False
+        with self.lock:
+            return self.counts["hedges"] < self.hedge_budget * self.counts["calls"] + 1
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Call, retry, hedge, timeout and failure counts, the
+                  current hedge delay and the circuit state
+        """
+        with self.lock:
+            counts = dict(self.counts)
+        return dict(counts, hedge_delay=self.hedge_delay(), circuit=self.breaker.state,
+                    rejected=self.breaker.rejected, opened=self.breaker.opened)
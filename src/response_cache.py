@@ -0,0 +1,148 @@
+"""
+Response Cache Module
+Persistent LRU + TTL cache for AI responses keyed on normalized commands
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# Words that don't change what the user is asking for
+FILLER_WORDS = {
+    "please", "hey", "ok", "okay", "goku", "um", "uh", "umm", "hmm",
+    "kindly", "just", "now",
+}
+
+PUNCTUATION = re.compile(r"[^\w\s.'-]|(?<!\w)[.'-]|[.'-](?!\w)")
+
+
+def normalize_command(text):
+    """
+    Build the cache key for a command
+
+    Lowercases, drops punctuation (dots inside words like "test.txt" are kept)
+    and removes filler words, so "Play lofi on YouTube Music, please!" and
+    "play lofi on youtube music" share one entry.
+    """
+    text = PUNCTUATION.sub(" ", text.lower())
+    words = [word for word in text.split() if word not in FILLER_WORDS]
+    return " ".join(words)
+
+
+class ResponseCache:
+    def __init__(self, cache_file, max_entries=500, plan_ttl=86400, chat_ttl=600):
+        """
+        Args:
+            cache_file: JSON file the cache is persisted to
+            max_entries: Size cap, least recently used entries are evicted
+            plan_ttl: Seconds an action plan stays valid
+            chat_ttl: Seconds a conversational answer stays valid
+        """
+        self.cache_file = Path(cache_file)
+        self.max_entries = max_entries
+        self.plan_ttl = plan_ttl
+        self.chat_ttl = chat_ttl
+
+        self.entries = OrderedDict()  # key -> {"value", "expires"}
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.load()
+
+    def _key(self, namespace, command):
+        return f"{namespace}:{normalize_command(command)}"
+
+    def get(self, namespace, command):
+        """
+        Look up a cached response
+
+        Args:
+            namespace: "plan" for process_command results, "chat" for chat answers
+            command: The raw user command
+
+        Returns:
+            Cached value or None
+        """
+        key = self._key(namespace, command)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry["expires"] < time.time():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, namespace, command, value, conversational=False):
+        """
+        Store a response and persist the cache
+
+        Args:
+            namespace: "plan" or "chat", see get()
+            command: The raw user command
+            value: JSON-serializable response
+            conversational: Use the shorter chat TTL (answers can go stale,
+                            action plans don't)
+        """
+        ttl = self.chat_ttl if conversational else self.plan_ttl
+        key = self._key(namespace, command)
+        with self.lock:
+            self.entries[key] = {"value": value, "expires": time.time() + ttl}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.save()
+
+    def clear(self):
+        """Drop every entry"""
+        with self.lock:
+            self.entries.clear()
+        self.save()
+
+    def load(self):
+        """Load unexpired entries from disk"""
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        with self.lock:
+            # Saved oldest first, so insertion order restores the LRU order
+            for key, entry in data.get("entries", []):
+                if entry.get("expires", 0) >= now:
+                    self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache to disk atomically"""
+        with self.lock:
+            data = {"entries": list(self.entries.items())}
+        try:
+            with self.save_lock:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(".tmp")
+                tmp_file.write_text(json.dumps(data), encoding="utf-8")
+                os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            print(f"Could not save response cache: {e}")
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self.entries),
+        }
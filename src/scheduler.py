@@ -0,0 +1,323 @@
+"""
+Scheduler Module
+Runs voice commands on a pool of worker threads, so the keyboard hook only
+ever enqueues and is free for the next press at once
+
+Hotkey events are posted to a dispatcher thread and handled in order there
+(handlers must not block). Commands are submitted as jobs and run by the
+worker pool; each one moves through explicit states (listening, thinking,
+speaking) and can be cancelled between stages. Queue depth and the time
+spent waiting in each queue are recorded for report_stats().
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from tracing import summarize
+
+# Job states
+QUEUED = "queued"
+LISTENING = "listening"
+THINKING = "thinking"
+SPEAKING = "speaking"
+DONE = "done"
+CANCELLED = "cancelled"
+
+# What the assistant as a whole is doing: the first of these any job is in
+IDLE = "idle"
+ACTIVITY = (LISTENING, THINKING, SPEAKING)
+
+_local = threading.local()
+
+
+def current_job():
+    """The job running on this thread, or None"""
+    return getattr(_local, "job", None)
+
+
+class Cancelled(Exception):
+    """Raised by Job.check() once the job has been cancelled"""
+
+
+class Job:
+    """A command submitted to the scheduler"""
+
+    def __init__(self, scheduler, name):
+        self.scheduler = scheduler
+        self.id = next(scheduler.ids)
+        self.name = name
+        self.state = QUEUED
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.cancelled = threading.Event()  # stop at the next stage
+        self.interrupted = threading.Event()  # stop talking, keep working
+        self.finished = threading.Event()
+        self.holds = 1  # the job function itself, plus wait_for() handles
+        self.callbacks = []
+        self.lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.finished.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Block until the job and everything it waits for are finished
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        return self.finished.wait(timeout)
+
+    def enter(self, state):
+        """
+        Move on to the next stage
+
+        Raises:
+            Cancelled: If the job was cancelled meanwhile
+        """
+        self.check()
+        self.state = state
+
+    def check(self):
+        """Raise Cancelled if the job has been cancelled"""
+        if self.cancelled.is_set():
+            raise Cancelled(f"{self.name} {self.id} cancelled")
+
+    def cancel(self):
+        """Stop the job before its next stage, and its speech with it"""
+        self.cancelled.set()
+        self.interrupted.set()
+
+    def interrupt(self):
+        """The user talked over it: it says nothing more but keeps working"""
+        self.interrupted.set()
+
+    def wait_for(self, handle):
+        """
+        Keep the job open until handle (e.g. a SpeechHandle) is done too
+
+        Args:
+            handle: Anything with add_done_callback(callback)
+        """
+        with self.lock:
+            if self.finished.is_set():
+                return
+            self.holds += 1
+        handle.add_done_callback(lambda _: self._release())
+
+    def add_done_callback(self, callback):
+        """Call callback(job) once finished, immediately if it already is"""
+        with self.lock:
+            if not self.finished.is_set():
+                self.callbacks.append(callback)
+                return
+        callback(self)
+
+    def _release(self):
+        with self.lock:
+            self.holds -= 1
+            if self.holds > 0 or self.finished.is_set():
+                return
+            self.state = CANCELLED if self.cancelled.is_set() else DONE
+            self.finished.set()
+            callbacks, self.callbacks = self.callbacks, []
+        self.scheduler._finished(self)
+        for callback in callbacks:
+            callback(self)
+
+
+class QueueStats:
+    """Depth of a queue and how long items waited in it"""
+
+    def __init__(self, window=1000):
+        self.lock = threading.Lock()
+        self.depth = 0
+        self.max_depth = 0
+        self.handled = 0
+        self.waits = deque(maxlen=window)
+
+    def put(self):
+        with self.lock:
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+
+    def got(self, enqueued_at):
+        """An item queued at perf_counter() enqueued_at was taken off"""
+        with self.lock:
+            self.depth -= 1
+            self.handled += 1
+            self.waits.append(time.perf_counter() - enqueued_at)
+
+    def summary(self):
+        with self.lock:
+            return {
+                "depth": self.depth,
+                "max_depth": self.max_depth,
+                "handled": self.handled,
+                "wait": summarize(self.waits),
+            }
+
+
+class CommandScheduler:
+    def __init__(self, workers=4):
+        """
+        Args:
+            workers: Jobs run at the same time at most, e.g. one listening
+                     while earlier commands are still thinking or speaking
+        """
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.active = {}  # id -> Job, started or queued and not finished
+        self.completed = 0
+        self.cancelled = 0
+
+        self.events = queue.Queue()  # (enqueued_at, handler, args)
+        self.event_stats = QueueStats()
+        self.jobs = queue.Queue()  # (job, fn, args) or None to stop a worker
+        self.job_stats = QueueStats()
+
+        self.dispatcher = threading.Thread(target=self._dispatch_loop, name="dispatcher", daemon=True)
+        self.dispatcher.start()
+        self.workers = [
+            threading.Thread(target=self._work_loop, name=f"worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def post(self, handler, *args):
+        """
+        Handle an event on the dispatcher thread, in the order posted
+
+        Safe to call from the keyboard hook: it only enqueues. handler(*args)
+        must return quickly, anything slow is submit()ted from it.
+        """
+        self.event_stats.put()
+        self.events.put((time.perf_counter(), handler, args))
+
+    def submit(self, fn, *args, name="command"):
+        """
+        Run fn(*args) on a worker thread as a job
+
+        fn sees the job as current_job() and reports its stages with
+        job.enter(). The job is done when fn returns and everything passed
+        to job.wait_for() has finished.
+
+        Returns:
+            Job
+        """
+        job = self._add(name)
+        self.job_stats.put()
+        self.jobs.put((job, fn, args))
+        return job
+
+    def run(self, fn, *args, name="command"):
+        """
+        Run fn(*args) as a job on the calling thread, without queueing
+
+        Returns:
+            Job: Returned once fn has (its speech may still be playing)
+        """
+        job = self._add(name)
+        self._run(job, fn, args)
+        return job
+
+    @property
+    def state(self):
+        """IDLE, or the busiest of LISTENING, THINKING and SPEAKING any job is in"""
+        with self.lock:
+            states = {job.state for job in self.active.values()}
+        return next((state for state in ACTIVITY if state in states), IDLE)
+
+    def in_flight(self):
+        """Jobs queued or running, oldest first"""
+        with self.lock:
+            return list(self.active.values())
+
+    def interrupt_all(self):
+        """Silence every job in flight, letting its work finish"""
+        for job in self.in_flight():
+            job.interrupt()
+
+    def cancel_all(self):
+        """
+        Cancel every job in flight
+
+        Returns:
+            int: Jobs cancelled
+        """
+        jobs = self.in_flight()
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Job counts, and depth and wait-time percentiles (seconds)
+                  of the event and job queues
+        """
+        with self.lock:
+            counts = {"in_flight": len(self.active), "completed": self.completed, "cancelled": self.cancelled}
+        return dict(counts, events=self.event_stats.summary(), jobs=self.job_stats.summary())
+
+    def shutdown(self, wait=True):
+        """Stop the workers once the jobs already queued have run"""
+        self.events.put(None)
+        for _ in self.workers:
+            self.jobs.put(None)
+        if wait:
+            for worker in self.workers:
+                worker.join()
+
+    def _add(self, name):
+        job = Job(self, name)
+        with self.lock:
+            self.active[job.id] = job
+        return job
+
+    def _finished(self, job):
+        with self.lock:
+            self.active.pop(job.id, None)
+            if job.state == CANCELLED:
+                self.cancelled += 1
+            else:
+                self.completed += 1
+
+    def _run(self, job, fn, args):
+        job.started_at = time.perf_counter()
+        outer, _local.job = current_job(), job
+        try:
+            if not job.cancelled.is_set():
+                fn(*args)
+        except Cancelled:
+            pass
+        except Exception as e:
+            print(f"Error in {job.name} {job.id}: {e}")
+        finally:
+            _local.job = outer
+            job._release()
+
+    def _dispatch_loop(self):
+        while True:
+            event = self.events.get()
+            if event is None:
+                break
+            enqueued_at, handler, args = event
+            self.event_stats.got(enqueued_at)
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"Error handling event: {e}")
+
+    def _work_loop(self):
+        while True:
+            item = self.jobs.get()
+            if item is None:
+                break
+            job, fn, args = item
+            self.job_stats.got(job.enqueued_at)
+            self._run(job, fn, args)
@@ -0,0 +1,106 @@
+"""
+Speculation Module
+Starts resolving a command from the partial transcript as soon as the user
+pauses, while the endpointer is still waiting to be sure the phrase is over
+
+Resolution must be free of side effects (a plan, not its execution, and
+not cached). When the final transcript arrives the matching speculative
+result is committed and handed to keep, anything else is discarded.
+"""
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_NOT_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize(text):
+    """Lowercase words only, so punctuation and case don't break a match"""
+    return " ".join(_NOT_WORD.sub("", text.lower()).split())
+
+
+class Speculator:
+    def __init__(self, resolve, keep=None, min_pause=0.2, max_attempts=2):
+        """
+        Args:
+            resolve: Function command -> result without side effects, e.g.
+                     AIBrain.process_command with speculative=True
+            keep: Optional function (command, result) called with each
+                  committed result once it is ready, for what resolve must
+                  not do itself (e.g. AIBrain.cache_plan)
+            min_pause: Seconds of silence after speech before the partial
+                       transcript is resolved, well short of the silence
+                       that ends the phrase
+            max_attempts: Speculative resolutions per phrase at most
+        """
+        self.resolve = resolve
+        self.keep = keep
+        self.min_pause = min_pause
+        self.max_attempts = max_attempts
+        self.pool = ThreadPoolExecutor(max_workers=max_attempts, thread_name_prefix="speculate")
+        self.lock = threading.Lock()
+        self.attempts = 0
+        self.committed = 0
+        self.discarded = 0
+        self.begin()
+
+    def begin(self):
+        """Start a new phrase, forgetting the speculation of the last one"""
+        with self.lock:
+            self.started = {}  # normalized text -> Future
+
+    def on_partial(self, text, pause=0.0):
+        """
+        Feed a partial transcript, VoiceInput's on_partial callback
+
+        Args:
+            text: Partial transcript
+            pause: Seconds of silence since the last speech
+        """
+        key = normalize(text)
+        with self.lock:
+            if (not key or pause < self.min_pause or key in self.started
+                    or len(self.started) >= self.max_attempts):
+                return
+            self.attempts += 1
+            self.started[key] = self.pool.submit(self.resolve, text)
+
+    def commit(self, final):
+        """
+        Settle the phrase on its final transcript
+
+        Args:
+            final: Final transcript, None to discard every speculation
+
+        Returns:
+            Future: Speculative result for final (may still be running), or
+                    None if nothing matched and the caller resolves it now
+        """
+        with self.lock:
+            future = self.started.pop(normalize(final), None) if final is not None else None
+            # Still-running guesses finish in the background and are dropped
+            self.discarded += len(self.started)
+            self.started = {}
+            if future is None:
+                return None
+            self.committed += 1
+        if self.keep is not None:
+            future.add_done_callback(lambda done: self._keep(final, done))
+        return future
+
+    def _keep(self, final, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        try:
+            self.keep(final, future.result())
+        except Exception as e:
+            print(f"Could not keep speculative result: {e}")
+
+    def stats(self):
+        with self.lock:
+            return {
+                "attempts": self.attempts,
+                "committed": self.committed,
+                "discarded": self.discarded,
+            }
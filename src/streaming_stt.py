@@ -0,0 +1,146 @@
+"""
+Streaming STT Module
+Recognizers that transcribe while the user is still speaking: Vosk (offline)
+and a stand-in that replays timed transcripts for benchmarks
+
+VoiceInput feeds a recognizer the phrase chunk by chunk as it is captured,
+reports partial transcripts along the way and asks for the final one once
+the phrase has ended, so most of the recognition work is already done.
+"""
+
+import json
+import time
+
+
+class StreamingRecognizer:
+    """
+    Interface VoiceInput talks to
+
+    One phrase at a time: start(), feed() every chunk, then finish().
+    """
+
+    name = "base"
+
+    def start(self, sample_rate, sample_width):
+        """Begin a phrase of mono PCM audio in this format"""
+        raise NotImplementedError
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk: The next bytes of the phrase
+
+        Returns:
+            str: Partial transcript so far, or None if there is none yet
+        """
+        raise NotImplementedError
+
+    def finish(self):
+        """
+        Returns:
+            str: Final transcript of the phrase, or None if nothing was
+                 recognized
+        """
+        raise NotImplementedError
+
+
+class VoskRecognizer(StreamingRecognizer):
+    """Offline recognition with a Vosk model directory (pip install vosk)"""
+
+    name = "vosk"
+
+    def __init__(self, model_path):
+        # Imported here so the dependency is only needed when selected
+        from vosk import KaldiRecognizer, Model, SetLogLevel
+
+        SetLogLevel(-1)
+        self.model = Model(str(model_path))
+        self.KaldiRecognizer = KaldiRecognizer
+        self.recognizer = None
+        self.sample_rate = None
+
+    def start(self, sample_rate, sample_width):
+        if sample_width != 2:
+            raise ValueError("Vosk needs 16-bit audio")
+        if self.recognizer is None or sample_rate != self.sample_rate:
+            self.recognizer = self.KaldiRecognizer(self.model, sample_rate)
+            self.sample_rate = sample_rate
+        self.recognizer.Reset()
+        self.utterances = []
+
+    def feed(self, chunk):
+        if self.recognizer.AcceptWaveform(bytes(chunk)):
+            # Vosk found a pause of its own, keep what it settled on
+            self.utterances.append(json.loads(self.recognizer.Result()).get("text", ""))
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        text = " ".join(part for part in self.utterances + [partial] if part)
+        return text or None
+
+    def finish(self):
+        self.utterances.append(json.loads(self.recognizer.FinalResult()).get("text", ""))
+        text = " ".join(part for part in self.utterances if part)
+        return text or None
+
+
+class TimedTranscriptRecognizer(StreamingRecognizer):
+    """
+    Stand-in that replays a timeline of partial transcripts against the
+    amount of audio fed, ignoring its content
+    """
+
+    name = "timed"
+
+    def __init__(self, timeline=(), final_latency=0.1):
+        """
+        Args:
+            timeline: (seconds of audio, partial transcript) pairs in order,
+                      the last one is the final transcript
+            final_latency: Seconds finish() takes, like a service settling
+                           on its result
+        """
+        self.timeline = list(timeline)
+        self.final_latency = final_latency
+        self.bytes_per_second = 32000
+        self.fed = 0
+
+    @staticmethod
+    def timeline_for(transcript, seconds_per_word, delay=0.0):
+        """
+        Timeline of a transcript spoken at an even pace: each word first
+        shows up cut in half mid-word, then whole once it has been spoken
+
+        Args:
+            transcript: Final text
+            seconds_per_word: Audio per word
+            delay: Audio before the first word, plus recognizer lag
+
+        Returns:
+            list: (seconds, partial transcript) pairs
+        """
+        timeline = []
+        words = transcript.split()
+        for index, word in enumerate(words):
+            spoken = words[:index]
+            at = delay + index * seconds_per_word
+            if len(word) > 3:
+                timeline.append((at + seconds_per_word / 2, " ".join(spoken + [word[:len(word) // 2]])))
+            timeline.append((at + seconds_per_word, " ".join(spoken + [word])))
+        return timeline
+
+    def start(self, sample_rate, sample_width):
+        self.bytes_per_second = sample_rate * sample_width
+        self.fed = 0
+
+    def feed(self, chunk):
+        self.fed += len(chunk)
+        heard = self.fed / self.bytes_per_second
+        partial = None
+        for at, text in self.timeline:
+            if at > heard:
+                break
+            partial = text
+        return partial
+
+    def finish(self):
+        time.sleep(self.final_latency)
+        return self.timeline[-1][1] if self.timeline else None
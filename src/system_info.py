@@ -5,10 +5,121 @@ Retrieves CPU, GPU, RAM, and Storage statistics
 
 import psutil
 import platform
+import threading
+import time
+from collections import deque
+
+# Drive reported by the storage stats
+DISK_PATH = 'C:/' if platform.system() == 'Windows' else '/'
 
 class SystemInfo:
-    def __init__(self):
-        pass
+    def __init__(self, history_seconds=60, history=None):
+        """
+        Args:
+            history_seconds: How much sampler history to keep for averages
+            history: MetricsHistory the sampler records into, or None
+        """
+        self.history_seconds = history_seconds
+        self.history = history
+        self.history_save_interval = 300  # seconds between history writes
+        self.samples = deque()  # ring buffer, sized when the sampler starts
+        self.lock = threading.Lock()
+        self.sampler = None
+        self.stop_event = threading.Event()
+        self.disk_refresh = 30  # seconds, storage changes slowly
+    
+    def start_sampler(self, interval=1.0):
+        """
+        Sample CPU, memory and disk in the background
+        
+        get_all_stats() then returns the latest sample instantly instead of
+        blocking for a second on the CPU measurement.
+        
+        Args:
+            interval: Seconds between samples
+        """
+        if self.sampler is not None:
+            return
+        with self.lock:
+            self.samples = deque(self.samples, maxlen=max(2, int(self.history_seconds / interval) + 1))
+        self.stop_event.clear()
+        # Prime the counter so the first sample covers one interval
+        psutil.cpu_percent(interval=None)
+        self.sampler = threading.Thread(target=self._sample_loop, args=(interval,), daemon=True)
+        self.sampler.start()
+    
+    def stop_sampler(self):
+        """Stop the background sampler and wait for it to exit"""
+        if self.sampler is None:
+            return
+        self.stop_event.set()
+        self.sampler.join(timeout=2)
+        self.sampler = None
+        if self.history is not None:
+            self.history.save()
+    
+    def _sample_loop(self, interval):
+        disk, disk_time = None, 0
+        saved_at = time.time()
+        # Event.wait sleeps without polling and wakes at once on stop
+        while not self.stop_event.wait(interval):
+            try:
+                now = time.time()
+                if disk is None or now - disk_time >= self.disk_refresh:
+                    disk, disk_time = self.get_disk_usage(), now
+                memory = psutil.virtual_memory()
+                sample = {
+                    "time": now,
+                    "cpu": psutil.cpu_percent(interval=None),
+                    "memory": memory.percent,
+                    "memory_used": round(memory.used / (1024**3), 2),
+                    "memory_total": round(memory.total / (1024**3), 2),
+                    "disk_used": disk["used"],
+                    "disk_free": disk["free"],
+                    "disk_total": disk["total"],
+                    "disk_percent": disk["percent"],
+                }
+            except Exception as e:
+                print(f"System sampler error: {e}")
+                continue
+            with self.lock:
+                self.samples.append(sample)
+            
+            if self.history is not None:
+                self.history.add(now, {
+                    "cpu": sample["cpu"],
+                    "memory": sample["memory"],
+                    "disk": sample["disk_percent"],
+                })
+                if now - saved_at >= self.history_save_interval:
+                    self.history.save()
+                    saved_at = now
+    
+    def latest_sample(self):
+        """Most recent background sample, or None"""
+        with self.lock:
+            return dict(self.samples[-1]) if self.samples else None
+    
+    def get_average(self, seconds=10):
+        """
+        Smoothed CPU and memory usage from the sampler history
+        
+        Args:
+            seconds: Window to average over
+            
+        Returns:
+            dict: cpu and memory averages in percent, or None without samples
+        """
+        cutoff = time.time() - seconds
+        with self.lock:
+            window = [sample for sample in self.samples if sample["time"] >= cutoff]
+        if not window:
+            return None
+        return {
+            "cpu": round(sum(sample["cpu"] for sample in window) / len(window), 1),
+            "memory": round(sum(sample["memory"] for sample in window) / len(window), 1),
+            "samples": len(window),
+        }
     
     def get_cpu_usage(self):
         """Get CPU usage percentage"""
@@ -30,8 +141,8 @@ class SystemInfo:
         }
     
     def get_disk_usage(self):
-        """Get disk usage for C: drive"""
-        disk = psutil.disk_usage('C:/')
+        """Get disk usage for the system drive (C: on Windows)"""
+        disk = psutil.disk_usage(DISK_PATH)
         return {
             "total": round(disk.total / (1024**3), 2),  # GB
             "used": round(disk.used / (1024**3), 2),  # GB
@@ -82,6 +193,13 @@ class SystemInfo:
     
     def get_all_stats(self):
         """Get all system statistics in one call"""
+        # Instant answer from the background sampler when it is running
+        sample = self.latest_sample() if self.sampler is not None else None
+        if sample is not None:
+            del sample["time"]
+            del sample["disk_percent"]
+            return sample
+        
         disk = self.get_disk_usage()
         memory = self.get_memory_info()
         
@@ -0,0 +1,259 @@
+"""
+Tracing Module
+Per-request stage timing for the hotkey-to-speech pipeline, written to
+LOGS_DIR as JSON lines by a background thread, with rolling percentiles
+
+Summarize recorded traces:
+    python src/tracing.py summary [--last N] [--logs-dir DIR]
+"""
+
+import argparse
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+# Pipeline order, used to sort summaries
+STAGES = ("hotkey", "queue", "mic_wait", "capture", "stt", "ai", "execute", "speak", "total")
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))
+    return sorted_samples[index]
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50": percentile(ordered, 0.50),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+    }
+
+
+class RequestTrace:
+    """Stage timings of one activation, safe to add to from any thread"""
+
+    def __init__(self, tracer, request_id):
+        self.tracer = tracer
+        self.request_id = request_id
+        self.started_at = time.time()
+        self.t0 = time.perf_counter()
+        self.stages = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter() - start)
+
+    def add(self, name, start, duration):
+        """
+        Record a stage measured elsewhere
+
+        Args:
+            name: Stage name
+            start: time.perf_counter() value when the stage began
+            duration: Seconds the stage took
+        """
+        with self.lock:
+            self.stages.append({
+                "stage": name,
+                "offset": round(start - self.t0, 6),
+                "duration": round(duration, 6),
+            })
+
+    def finish(self, **fields):
+        """Close the trace and hand it to the background writer"""
+        self.tracer._submit(self, time.perf_counter() - self.t0, fields)
+
+
+class _NullTrace:
+    """Used when no request is being traced"""
+
+    def stage(self, name):
+        return nullcontext()
+
+    def add(self, name, start, duration):
+        pass
+
+    def finish(self, **fields):
+        pass
+
+
+_NULL_TRACE = _NullTrace()
+# Requests overlap on scheduler workers, each thread has its own in flight
+_local = threading.local()
+
+
+def current():
+    """The trace of the request in flight on this thread, or a no-op trace"""
+    return getattr(_local, "trace", _NULL_TRACE)
+
+
+def stage(name):
+    """Time a block as a stage of the request in flight"""
+    return current().stage(name)
+
+
+def add(name, start, duration):
+    """Record a stage measured elsewhere on the request in flight"""
+    current().add(name, start, duration)
+
+
+class Tracer:
+    def __init__(self, logs_dir, window=1000, enabled=True):
+        """
+        Args:
+            logs_dir: Directory for trace-YYYYMMDD.jsonl files
+            window: Samples per stage kept for rolling percentiles
+            enabled: When False every trace is a no-op
+        """
+        self.logs_dir = Path(logs_dir)
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}  # stage -> deque of durations
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+        # Writes happen on a daemon thread so the pipeline never waits on disk
+        self.queue = queue.Queue(maxsize=1000)
+        self.writer = None
+
+    def start_request(self):
+        """
+        Begin tracing an activation and make it this thread's current trace
+
+        Returns:
+            RequestTrace
+        """
+        if not self.enabled:
+            _local.trace = _NULL_TRACE
+            return _NULL_TRACE
+        trace = RequestTrace(self, f"{int(time.time())}-{next(self.ids)}")
+        _local.trace = trace
+        return trace
+
+    def _submit(self, trace, total, fields):
+        # Finished on the speech thread, the requesting thread lets go of it
+        # when it starts its next request
+        if current() is trace:
+            _local.trace = _NULL_TRACE
+
+        with trace.lock:
+            stages = list(trace.stages)
+        with self.lock:
+            for entry in stages + [{"stage": "total", "duration": total}]:
+                self.samples.setdefault(entry["stage"], deque(maxlen=self.window)).append(entry["duration"])
+
+        record = {
+            "id": trace.request_id,
+            "time": datetime.fromtimestamp(trace.started_at).isoformat(timespec="milliseconds"),
+            "total": round(total, 6),
+            "stages": stages,
+            **fields,
+        }
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass  # Dropping a trace beats stalling the pipeline
+
+    def _ensure_writer(self):
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer.start()
+
+    def _write_loop(self):
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+            log_file = self.logs_dir / f"trace-{record['time'][:10].replace('-', '')}.jsonl"
+            try:
+                with open(log_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"Could not write trace: {e}")
+
+    def summary(self):
+        """
+        Rolling percentiles per stage
+
+        Returns:
+            dict: stage -> {"count", "p50", "p95", "p99"} in seconds
+        """
+        with self.lock:
+            return {name: summarize(samples) for name, samples in self.samples.items()}
+
+    def close(self):
+        """Flush pending traces and stop the writer"""
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join(timeout=2)
+            self.writer = None
+
+
+def format_summary(summary):
+    """Render a stage -> percentiles dict as a table"""
+    lines = [f"{'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+    order = {name: i for i, name in enumerate(STAGES)}
+    for name, stats in sorted(summary.items(), key=lambda item: (order.get(item[0], len(STAGES) - 1), item[0])):
+        lines.append(
+            f"{name:<12}{stats['count']:>7}{stats['p50'] * 1000:>10.1f}"
+            f"{stats['p95'] * 1000:>10.1f}{stats['p99'] * 1000:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def load_traces(logs_dir, last=None):
+    """Read trace records from logs_dir, oldest first"""
+    records = []
+    for log_file in sorted(Path(logs_dir).glob("trace-*.jsonl")):
+        with open(log_file, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    return records[-last:] if last else records
+
+
+def summarize_traces(records):
+    samples = {}
+    for record in records:
+        for entry in record["stages"]:
+            samples.setdefault(entry["stage"], []).append(entry["duration"])
+        samples.setdefault("total", []).append(record["total"])
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def main():
+    default_logs = Path(__file__).resolve().parent.parent / "logs"
+    parser = argparse.ArgumentParser(description="Goku pipeline traces")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subcommands.add_parser("summary", help="p50/p95/p99 per stage")
+    summary_parser.add_argument("--last", type=int, help="Only the last N requests")
+    summary_parser.add_argument("--logs-dir", default=str(default_logs))
+    args = parser.parse_args()
+
+    records = load_traces(args.logs_dir, args.last)
+    if not records:
+        print(f"No traces found in {args.logs_dir}")
+        return
+    print(f"{len(records)} requests")
+    print(format_summary(summarize_traces(records)))
+
+
+if __name__ == "__main__":
+    main()
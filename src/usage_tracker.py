@@ -0,0 +1,69 @@
+"""
+Usage Tracker Module
+Records token counts and latency of every LLM call
+"""
+
+import threading
+import time
+from collections import Counter, deque
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) for backends that don't report one"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class UsageTracker:
+    def __init__(self, max_records=1000):
+        """
+        Args:
+            max_records: How many recent calls to keep individually,
+                         totals cover every call
+        """
+        self.records = deque(maxlen=max_records)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.kinds = Counter()  # calls per kind
+        self.totals = {"prompt_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cached_tokens": 0}
+        self.total_latency = 0.0
+
+    def record(self, kind, usage, latency):
+        """
+        Record one call
+
+        Args:
+            kind: What the call was for ("plan", "plan_stream",
+                  "plan_speculative", "chat")
+            usage: Dict filled by the backend with prompt_tokens, output_tokens,
+                   total_tokens and optionally cached_tokens
+            latency: Seconds the call took
+        """
+        record = {
+            "time": time.time(),
+            "kind": kind,
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+            "cached_tokens": usage.get("cached_tokens", 0),
+            "latency": latency,
+        }
+        with self.lock:
+            self.records.append(record)
+            self.calls += 1
+            self.kinds[kind] += 1
+            for key in self.totals:
+                self.totals[key] += record[key]
+            self.total_latency += latency
+
+    def summary(self):
+        """Totals, calls per kind and per-call averages"""
+        with self.lock:
+            calls = self.calls or 1
+            return {
+                "calls": self.calls,
+                "kinds": dict(self.kinds),
+                **self.totals,
+                "avg_prompt_tokens": self.totals["prompt_tokens"] / calls,
+                "avg_output_tokens": self.totals["output_tokens"] / calls,
+                "avg_latency": self.total_latency / calls,
+            }
@@ -3,52 +3,298 @@ Voice Input Module
 Handles speech-to-text conversion using Google Speech Recognition
 """
 
-import speech_recognition as sr
+import contextlib
+import threading
+import time
+import tracing
 
 class VoiceInput:
-    def __init__(self):
+    def __init__(self, source=None, recognize=None, calibrate=True, capture_seconds=0, preroll=0.3,
+                 vad_aggressiveness=None, streaming=None, track_noise=True):
+        """
+        Args:
+            source: Audio source to listen on, defaults to the microphone
+                    (an sr.AudioFile plays back a WAV fixture instead)
+            recognize: Function AudioData -> text, defaults to Google
+                       Speech Recognition
+            calibrate: Adjust for ambient noise at startup, not needed
+                       (and skipped) when the noise floor is tracked
+            capture_seconds: Keep the source open and capture into a ring
+                             buffer this many seconds long, 0 opens the
+                             source on every listen() instead
+            preroll: Seconds of audio from before listen() is called that
+                     are included when capturing continuously
+            vad_aggressiveness: End phrases with the NumPy endpointer at
+                                this aggressiveness (0-3), None keeps
+                                SpeechRecognition's pause threshold
+            streaming: Optional StreamingRecognizer that transcribes while
+                       the phrase is captured, used instead of recognize
+            track_noise: Keep estimating the background noise level from
+                         captured audio and set the speech threshold from
+                         it (with continuous capture or the endpointer)
+        """
+        # Imported here so importing this module stays cheap at startup
+        import speech_recognition as sr
+        
+        self.sr = sr
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = source or sr.Microphone()
+        self.recognize = recognize or self.recognizer.recognize_google
+        self.preroll = preroll
+        self.streaming = streaming
+        
+        self.endpointer = None
+        if vad_aggressiveness is not None:
+            from endpointer import Endpointer
+            self.endpointer = Endpointer(aggressiveness=vad_aggressiveness)
+        
+        # Fed by the capture thread, or by listen() itself without one
+        self.noise = None
+        if track_noise and (self.endpointer is not None or capture_seconds > 0):
+            from endpointer import NoiseFloorTracker
+            self.noise = NoiseFloorTracker()
+        
+        # Microphone opened by warm() for the next listen() to take over
+        self.warm_lock = threading.Lock()
+        self.warm_source = None
+        self.in_use = False
+        
+        self.capture = None
+        if capture_seconds > 0:
+            from audio_capture import AudioCapture
+            self.capture = AudioCapture(
+                self.microphone,
+                buffer_seconds=max(capture_seconds, preroll + 1),
+                on_audio=self.noise.feed if self.noise else None,
+            )
+            self.capture.start()
+        
+        # One-off ambient noise calibration, blocks for a second
+        if calibrate and self.noise is None:
+            with self._open() as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=1)
+    
+    def _open(self, since=None, wait_for=None):
+        """
+        The source to listen on: the microphone itself, or when capturing
+        continuously a view of the ring buffer from since onward
+        """
+        if self.capture is None:
+            return self._microphone()
+        since = time.perf_counter() if since is None else since
+        skip = None
+        if wait_for is not None:
+            # Leave out our own prompt coming back through the microphone
+            started = getattr(wait_for, "started", None) or since
+            skip = (started, getattr(wait_for, "ended", None) or time.perf_counter())
+        return self.capture.reader(since - self.preroll, skip=skip)
+    
+    @contextlib.contextmanager
+    def _microphone(self):
+        """The microphone, opened now or taken over from warm()"""
+        with self.warm_lock:
+            source, self.warm_source = self.warm_source, None
+            self.in_use = True
+        try:
+            if source is None:
+                with self.microphone as source:
+                    yield source
+            else:
+                try:
+                    yield source
+                finally:
+                    source.__exit__(None, None, None)
+        finally:
+            with self.warm_lock:
+                self.in_use = False
+    
+    def warm(self):
+        """
+        Open the microphone ahead of listen() without recording, so opening
+        the device is out of the way by the time the user speaks; a no-op
+        when capturing continuously (it is always open then)
+        """
+        if self.capture is not None:
+            return
+        with self.warm_lock:
+            if self.warm_source is None and not self.in_use:
+                self.warm_source = self.microphone.__enter__()
+    
+    def release(self):
+        """Close the microphone warm() opened if no listen() has taken it"""
+        with self.warm_lock:
+            source, self.warm_source = self.warm_source, None
+        if source is not None:
+            source.__exit__(None, None, None)
+    
+    def close(self):
+        """Stop continuous capture and release the microphone"""
+        self.release()
+        if self.capture is not None:
+            self.capture.stop()
+    
+    def _record_phrase(self, source, timeout=None, phrase_time_limit=None, on_partial=None, cancel=None):
+        """
+        Record one phrase from an open source, feeding the streaming
+        recognizer from the start of speech onward as audio comes in (all at
+        once at the end without the endpointer)
+        
+        Args:
+            on_partial: Optional function (text, pause) called with partial
+                        transcripts
+            cancel: Optional threading.Event that stops recording between
+                    chunks (only with the endpointer)
+        
+        Returns:
+            sr.AudioData: The phrase, raises sr.WaitTimeoutError if no
+                          speech starts within timeout seconds of audio or
+                          recording is cancelled
+        """
+        floor = None
+        if self.noise is not None:
+            floor = self.noise.estimate(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        
+        on_audio = None
+        if self.streaming is not None:
+            self.streaming.start(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+            on_audio = lambda chunk: self._stream_chunk(chunk, on_partial)
+        
+        if self.endpointer is None or source.SAMPLE_WIDTH not in (1, 2, 4):
+            if floor is not None:
+                # Where adjust_for_ambient_noise would settle, kept current,
+                # but never below what the endpointer counts as silence
+                from endpointer import MIN_ENERGY
+                full_scale = 2 ** (8 * source.SAMPLE_WIDTH - 1)
+                self.recognizer.energy_threshold = max(floor, MIN_ENERGY) * full_scale * self.recognizer.dynamic_energy_ratio
+            audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+            if on_audio is not None:
+                on_audio(audio.frame_data)
+            return audio
         
-        # Adjust for ambient noise
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        endpointer = self.endpointer
+        endpointer.reset(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        if floor is not None:
+            endpointer.noise_floor = floor
+        # The capture thread feeds the tracker, otherwise it learns from here
+        track = self.noise is not None and self.capture is None
+        bytes_per_second = source.SAMPLE_RATE * source.SAMPLE_WIDTH
+        # Speech may have started a little before the chunk that confirmed it
+        keep = int((endpointer.padding + endpointer.min_speech) * bytes_per_second) + source.CHUNK * source.SAMPLE_WIDTH
+        audio = bytearray()
+        offset = 0  # stream position of audio[0]
+        streamed = None  # stream position handed to on_audio so far
+        
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise self.sr.WaitTimeoutError("listening cancelled")
+            chunk = source.stream.read(source.CHUNK)
+            if not chunk:
+                break  # File sources run out
+            audio += chunk
+            ended = endpointer.feed(chunk)
+            if track:
+                self.noise.feed(chunk, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+            
+            if on_audio is not None and endpointer.started is not None:
+                if streamed is None:
+                    streamed = max(offset, endpointer.span()[0])
+                end = offset + len(audio)
+                on_audio(bytes(audio[streamed - offset:end - offset]))
+                streamed = end
+            if ended:
+                break
+            
+            if endpointer.started is None:
+                if timeout and endpointer.position > timeout * bytes_per_second:
+                    raise self.sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                # Only the padding before speech is ever returned
+                if len(audio) > 2 * keep:
+                    drop = len(audio) - keep
+                    del audio[:drop]
+                    offset += drop
+            elif phrase_time_limit:
+                if endpointer.position - endpointer.started * endpointer.frame_bytes > phrase_time_limit * bytes_per_second:
+                    break
+        
+        span = endpointer.span()
+        if span is None:
+            raise self.sr.WaitTimeoutError("no speech before the audio ended")
+        start, end = span
+        return self.sr.AudioData(bytes(audio[max(0, start - offset):end - offset]), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
     
-    def listen(self, timeout=5, phrase_time_limit=10):
+    def listen(self, timeout=5, phrase_time_limit=10, wait_for=None, on_partial=None, cancel=None):
         """
         Listen for voice input and convert to text
         
         Args:
             timeout: Seconds to wait for speech to start
             phrase_time_limit: Maximum seconds for phrase
+            wait_for: Optional speech handle or thread (e.g. a spoken
+                      prompt) to join after the microphone is opened but
+                      before capture starts, so opening the device overlaps
+                      with it. When capturing continuously, audio from while
+                      it played is left out instead.
+            on_partial: Optional function (text, pause) called with each
+                        partial transcript while the user is still speaking
+                        and the seconds of silence since they last spoke
+                        (only with a streaming recognizer)
+            cancel: Optional threading.Event, once set listening stops and
+                    returns None (checked every chunk with the endpointer,
+                    only once the phrase is recorded without it)
             
         Returns:
             str: Recognized text or None
         """
         try:
-            with self.microphone as source:
-                # Listen for audio
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=timeout,
-                    phrase_time_limit=phrase_time_limit
-                )
+            listen_start = time.perf_counter()
+            if self.capture is not None and wait_for is not None:
+                # What to leave out is only known once the prompt has played
+                wait_for.join()
+            with self._open(listen_start, wait_for) as source:
+                # Don't capture our own prompt
+                if wait_for is not None:
+                    wait_for.join()
                 
-            # Convert speech to text using Google
-            text = self.recognizer.recognize_google(audio)
+                # Listen for audio, transcribing along the way when streaming
+                audio = self._record_phrase(source, timeout, phrase_time_limit, on_partial, cancel)
+            if cancel is not None and cancel.is_set():
+                return None
+            
+            # Split the time into waiting for speech and the phrase itself
+            listened = time.perf_counter() - listen_start
+            captured = min(listened, len(audio.frame_data) / (audio.sample_rate * audio.sample_width))
+            tracing.add("mic_wait", listen_start, listened - captured)
+            tracing.add("capture", listen_start + listened - captured, captured)
+                
+            # Convert speech to text using Google, or collect the streamed result
+            with tracing.stage("stt"):
+                text = self._recognize(audio)
             return text
             
-        except sr.WaitTimeoutError:
+        except self.sr.WaitTimeoutError:
             return None
-        except sr.UnknownValueError:
+        except self.sr.UnknownValueError:
             return None
-        except sr.RequestError as e:
+        except self.sr.RequestError as e:
             print(f"Speech recognition service error: {e}")
             return None
         except Exception as e:
             print(f"Error in voice input: {e}")
             return None
     
+    def _recognize(self, audio):
+        if self.streaming is not None:
+            return self.streaming.finish()
+        return self.recognize(audio)
+    
+    def _stream_chunk(self, chunk, on_partial):
+        partial = self.streaming.feed(chunk)
+        if partial and on_partial is not None:
+            pause = 0.0
+            if self.endpointer is not None and self.endpointer.started is not None:
+                pause = self.endpointer.silence_run * self.endpointer.frame_ms / 1000
+            on_partial(partial, pause)
+    
     def listen_continuous(self, callback, stop_event=None):
         """
         Continuously listen and pass recognized text to callback
@@ -57,14 +303,14 @@ class VoiceInput:
             callback: Function to call with recognized text
             stop_event: Threading event to stop listening
         """
-        with self.microphone as source:
+        with self._open() as source:
             while True:
                 if stop_event and stop_event.is_set():
                     break
                     
                 try:
-                    audio = self.recognizer.listen(source, timeout=3)
-                    text = self.recognizer.recognize_google(audio)
+                    audio = self._record_phrase(source, timeout=3)
+                    text = self._recognize(audio)
                     callback(text)
                 except:
                     continue
\ No newline at end of file
@@ -3,12 +3,135 @@ Voice Output Module
 Handles text-to-speech conversion using pyttsx3
 """
 
-import pyttsx3
+import itertools
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+import tracing
+from phrase_cache import PhraseCache, find_player
+
+# Speech queue priorities, lower numbers are spoken first
+URGENT = 0  # prompts the user is waiting on, e.g. "I'm listening"
+NORMAL = 1
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_sentences(text, max_chars=200):
+    """
+    Break text into sentences, splitting overly long ones at the last
+    comma or space that fits
+    """
+    chunks = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        while len(sentence) > max_chars:
+            cut = max(sentence.rfind(", ", 0, max_chars), sentence.rfind(" ", 0, max_chars))
+            cut = cut + 1 if cut > 0 else max_chars
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+class SpeechHandle:
+    """A queued speak() request"""
+    
+    def __init__(self, output, text, chunks, trace):
+        self.output = output
+        self.text = text
+        self.remaining = chunks
+        self.trace = trace  # request that asked for the speech
+        self.started = None  # perf_counter() when the first sentence began
+        self.ended = None
+        self.cancelled = False
+        self.finished = threading.Event()
+        self.callbacks = []
+        self.lock = threading.Lock()
+    
+    @property
+    def done(self):
+        return self.finished.is_set()
+    
+    def wait(self, timeout=None):
+        """
+        Block until every sentence is spoken or the speech is cancelled
+        
+        Returns:
+            bool: False if the timeout expired first
+        """
+        return self.finished.wait(timeout)
+    
+    # Lets a handle stand in wherever a thread was joined before
+    join = wait
+    
+    def cancel(self):
+        """Drop the remaining sentences and cut off the one playing"""
+        self.cancelled = True
+        self.output._interrupt(self)
+    
+    def add_done_callback(self, callback):
+        """Call callback(handle) once finished, immediately if it already is"""
+        with self.lock:
+            if not self.finished.is_set():
+                self.callbacks.append(callback)
+                return
+        callback(self)
+    
+    def _chunk_done(self):
+        with self.lock:
+            self.remaining -= 1
+            if self.remaining > 0:
+                return
+        self._finish()
+    
+    def _finish(self):
+        self.ended = time.perf_counter()
+        if self.started is not None:
+            self.trace.add("speak", self.started, self.ended - self.started)
+        with self.lock:
+            self.finished.set()
+            callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(self)
 
 class VoiceOutput:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self._configure_voice()
+    def __init__(self, sink="speakers", seconds_per_char=0.0, phrase_cache_dir=None):
+        """
+        Args:
+            sink: "speakers" to talk through pyttsx3, "null" to discard
+                  speech without loading a TTS engine (headless runs), or a
+                  directory path to render each utterance to a WAV file
+            seconds_per_char: Simulated speaking time for the null sink
+            phrase_cache_dir: Where to keep pre-rendered phrases, None
+                              synthesizes everything live
+        """
+        self.sink = sink
+        self.seconds_per_char = seconds_per_char
+        self.utterances = 0
+        # pyttsx3 engines are not thread safe, only one utterance at a time
+        self.lock = threading.Lock()
+        
+        # Speech plays on one worker thread, callers never wait for it
+        self.queue = queue.PriorityQueue()  # (priority, sequence, handle, sentence)
+        self.queue_lock = threading.Lock()
+        self.sequence = itertools.count()
+        self.worker = None
+        self.current = None  # handle being spoken
+        self.interrupted = threading.Event()
+        
+        self.engine = None
+        if sink != "null":
+            # Loaded on demand: slow to import, and the null sink never needs it
+            import pyttsx3
+            self.engine = pyttsx3.init()
+            self._configure_voice()
+        
+        # Fixed and repeated phrases play from disk (speakers only)
+        self.phrases = None
+        self.play = find_player() if sink == "speakers" and phrase_cache_dir else None
+        if self.play is not None:
+            self.phrases = PhraseCache(phrase_cache_dir, self._render, self._voice_signature())
     
     def _configure_voice(self):
         """Configure voice properties"""
@@ -26,26 +149,162 @@ class VoiceOutput:
         # Set volume (0.0 to 1.0)
         self.engine.setProperty('volume', 0.9)
     
-    def speak(self, text):
+    def _voice_signature(self):
+        return tuple(self.engine.getProperty(name) for name in ('voice', 'rate', 'volume'))
+    
+    def _render(self, text, path):
+        """Synthesize text to a WAV file for the phrase cache"""
+        with self.lock:
+            self.engine.save_to_file(text, str(path))
+            self.engine.runAndWait()
+    
+    def _voice_changed(self):
+        if self.phrases:
+            self.phrases.set_signature(self._voice_signature())
+    
+    def prerender(self, phrases):
+        """
+        Render fixed phrases in the background so they play without synthesis
+        
+        Args:
+            phrases: Texts such as "I'm listening" or "Processing"
+        """
+        if self.phrases:
+            self.phrases.pin(phrases)
+    
+    def speak(self, text, priority=NORMAL):
         """
-        Convert text to speech and play it
+        Queue text to be spoken and return at once
+        
+        Long text is split into sentences and the first one starts playing
+        while the rest wait in the queue. Higher priority speech (lower
+        number) goes ahead of anything still queued, between sentences.
         
         Args:
             text: Text to speak
+            priority: URGENT or NORMAL
+            
+        Returns:
+            SpeechHandle: Wait on it to block until spoken, or cancel it
+        """
+        # A pre-rendered phrase plays whole, splitting it would miss the cache
+        if self.phrases and self.phrases.has(text):
+            chunks = [text]
+        else:
+            chunks = split_sentences(text)
+        handle = SpeechHandle(self, text, len(chunks), tracing.current())
+        if not chunks:
+            handle._finish()
+            return handle
+        
+        with self.queue_lock:
+            for chunk in chunks:
+                self.queue.put((priority, next(self.sequence), handle, chunk))
+            self._start_worker()
+        return handle
+    
+    def _start_worker(self):
+        """Start the speech thread, with queue_lock held"""
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._speech_loop, daemon=True)
+            self.worker.start()
+    
+    def warm(self, phrases=()):
         """
+        Get ready to speak at once: the speech thread running and the audio
+        of pre-rendered phrases back in memory
+        
+        Args:
+            phrases: Texts about to be spoken, e.g. "I'm listening"
+        """
+        with self.queue_lock:
+            self._start_worker()
+        if self.phrases:
+            self.phrases.preload(phrases)
+    
+    def cancel_all(self):
+        """Stop the current utterance and drop everything queued (barge-in)"""
+        with self.queue_lock:
+            while True:
+                try:
+                    _, _, handle, _ = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                handle.cancelled = True
+                handle._chunk_done()
+                self.queue.task_done()
+            current = self.current
+        if current is not None:
+            current.cancel()
+    
+    def busy(self):
+        """True while something is being spoken or waiting to be"""
+        return self.current is not None or not self.queue.empty()
+    
+    def wait_idle(self):
+        """Block until everything queued has been spoken or cancelled"""
+        self.queue.join()
+    
+    def _interrupt(self, handle):
+        """Cut off handle if it is the one speaking now"""
+        if self.current is handle:
+            self.interrupted.set()
+            if self.engine is not None and self.sink == "speakers":
+                self.engine.stop()
+    
+    def _speech_loop(self):
+        while True:
+            _, _, handle, chunk = self.queue.get()
+            try:
+                if not handle.cancelled:
+                    self.current = handle
+                    self.interrupted.clear()
+                    if handle.started is None:
+                        handle.started = time.perf_counter()
+                    self._say(chunk)
+            finally:
+                self.current = None
+                handle._chunk_done()
+                self.queue.task_done()
+    
+    def _say(self, text):
+        """Speak one sentence on the worker thread, blocking until it ends"""
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
+            with self.lock:
+                self.utterances += 1
+                if self.engine is None:
+                    self.interrupted.wait(len(text) * self.seconds_per_char)
+                elif self.sink == "speakers":
+                    cached = self.phrases.lookup(text) if self.phrases else None
+                    if cached is not None:
+                        # Short and not interruptible, barge-in waits for it
+                        self.play(cached)
+                    else:
+                        self.engine.say(text)
+                        self.engine.runAndWait()
+                else:
+                    out_dir = Path(self.sink)
+                    out_dir.mkdir(parents=True, exist_ok=True)
+                    self.engine.save_to_file(text, str(out_dir / f"utterance_{self.utterances:04d}.wav"))
+                    self.engine.runAndWait()
         except Exception as e:
             print(f"Error in voice output: {e}")
+            return
+        
+        if self.phrases and not self.interrupted.is_set():
+            self.phrases.note(text)
     
     def set_rate(self, rate):
         """Set speech rate (words per minute)"""
-        self.engine.setProperty('rate', rate)
+        if self.engine:
+            self.engine.setProperty('rate', rate)
+            self._voice_changed()
     
     def set_volume(self, volume):
         """Set volume (0.0 to 1.0)"""
-        self.engine.setProperty('volume', volume)
+        if self.engine:
+            self.engine.setProperty('volume', volume)
+            self._voice_changed()
     
     def set_voice(self, voice_index=0):
         """
@@ -54,6 +313,9 @@ class VoiceOutput:
         Args:
             voice_index: Index of voice to use
         """
+        if not self.engine:
+            return
         voices = self.engine.getProperty('voices')
         if voice_index < len(voices):
-            self.engine.setProperty('voice', voices[voice_index].id)
\ No newline at end of file
+            self.engine.setProperty('voice', voices[voice_index].id)
+            self._voice_changed()
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Warm-up Module
+Speculative warm-up on the first of the two activation presses, and
+keep-alive for the LLM connection while Goku sits idle
+
+A single Shift+Space press is usually the first half of an activation, so
+WarmUp opens what the command will need (microphone, LLM connection, the
+"I'm listening" audio) in the background right away. The second press
+claims it. When no second press comes, whatever was opened is released
+after a hold time. KeepAlive touches the LLM connection after every
+interval without requests, so the first command after a long pause doesn't
+pay to connect again.
+"""
+
+import threading
+import time
+
+
+class WarmUp:
+    def __init__(self, steps, hold=2.0):
+        """
+        Args:
+            steps: (warm, release) function pairs; the warm functions run
+                   side by side on their own threads, release (or None)
+                   undoes one when no activation comes
+            hold: Seconds warmed-up resources wait for the activation
+        """
+        self.steps = steps
+        self.hold = hold
+        self.lock = threading.Lock()
+        self.timer = None  # pending release, None when nothing is held
+        self.threads = []
+        self.counts = {"started": 0, "claimed": 0, "released": 0}
+
+    def start(self):
+        """
+        Warm up in the background (on a first press), or give what is
+        already warm another hold time
+
+        Returns:
+            bool: True if warming up started
+        """
+        with self.lock:
+            started = self.timer is None
+            if started:
+                self.counts["started"] += 1
+                self.threads = [threading.Thread(target=self._run, args=(warm,), name="warm-up", daemon=True)
+                                for warm, _ in self.steps]
+                for thread in self.threads:
+                    thread.start()
+            else:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.hold, self._expire)
+            self.timer.daemon = True
+            self.timer.start()
+            return started
+
+    @staticmethod
+    def _run(warm):
+        try:
+            warm()
+        except Exception as e:
+            print(f"Warm-up failed: {e}")
+
+    def claim(self):
+        """
+        Keep what was warmed up for the activation starting now (the second
+        press)
+
+        Returns:
+            bool: True if anything was warm
+        """
+        with self.lock:
+            if self.timer is None:
+                return False
+            self.timer.cancel()
+            self.timer = None
+            self.counts["claimed"] += 1
+            return True
+
+    def _expire(self):
+        with self.lock:
+            if self.timer is None or threading.current_thread() is not self.timer:
+                return  # claimed or extended meanwhile
+            self.timer = None
+            self.counts["released"] += 1
+            threads = self.threads
+        for thread in threads:
+            thread.join()
+        for _, release in self.steps:
+            if release is not None:
+                self._run(release)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Warm-ups started, claimed by an activation and released
+                  unused
+        """
+        with self.lock:
+            return dict(self.counts)
+
+
+class KeepAlive:
+    def __init__(self, ping, last_used, interval=45.0):
+        """
+        Args:
+            ping: Function that keeps the connection open (AIBrain.warm)
+            last_used: Function returning the time.monotonic() of the last
+                       request or ping
+            interval: Idle seconds after which ping is called
+        """
+        self.ping = ping
+        self.last_used = last_used
+        self.interval = interval
+        self.pings = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._loop, name="keep-alive", daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        while True:
+            idle = time.monotonic() - self.last_used()
+            if self.stopped.wait(max(0.05, self.interval - idle)):
+                return
+            if time.monotonic() - self.last_used() >= self.interval:
+                self.pings += 1
+                self.ping()
+
+    def stop(self):
+        self.stopped.set()